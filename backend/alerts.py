@@ -0,0 +1,245 @@
+"""
+Alert Engine
+Rules such as "RSI<30", "MACD>0" or "recommendation changes" are compiled once and
+evaluated against a coin's screener row only when that coin's data changes.
+
+Firing is edge-triggered: a comparison fires when it turns from false to true (RSI
+crossing below 30, the MACD histogram turning positive) and a "changes" rule fires when
+the field's value differs from the previous evaluation. Each (rule, coin, bar) fires at
+most once. Rules are indexed by coin and identical conditions are evaluated once per
+update, so the cost of an update grows with the rules watching that coin, not with
+rules x coins.
+
+Matches go to an in-memory queue (read through the API) or are POSTed to a webhook by
+a background delivery thread. Webhooks are off unless the engine is given an allowlist
+of destination hosts, so rules cannot make the server call arbitrary (internal) URLs.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+
+import metrics
+from screener import compile_filter, field_value, parse_filter
+
+SINKS = ('queue', 'webhook')
+
+# Any coin
+WILDCARD = '*'
+
+
+# Condition suffixes for "field changes" rules
+CHANGE_WORDS = ('changes', 'changed')
+
+
+def compile_condition(expression):
+    """
+    Compile a rule condition into {'kind', 'field', 'state': row -> state}
+    "field<op>value" (kind edge):    state is the comparison result, fires on false -> true
+    "field changes"  (kind changes): state is the field value, fires when it differs
+    Raises ValueError on bad syntax.
+    """
+    parts = expression.split()
+    if len(parts) == 2 and parts[1].lower() in CHANGE_WORDS:
+        field = parts[0]
+        return {'kind': 'changes', 'field': field, 'state': lambda row: field_value(row, field)}
+    field, _, _ = parse_filter(expression)
+    return {'kind': 'edge', 'field': field, 'state': compile_filter(expression)}
+
+
+def _is_edge(condition, previous, current):
+    """Whether moving from the previous to the current state fires the rule"""
+    if condition['kind'] == 'changes':
+        return previous is not None and current is not None and current != previous
+    return previous is False and current is True
+
+
+class AlertEngine:
+    """Registered rules, their last evaluated states and the delivered alerts"""
+
+    def __init__(self, max_events=1000, webhook_hosts=None):
+        """webhook_hosts: host names webhook rules may POST to (none: webhooks disabled)"""
+        self.webhook_hosts = {h.strip().lower() for h in webhook_hosts or [] if h.strip()}
+        self._rules = {}
+        self._conditions = {}            # expression -> compiled condition
+        self._index = {}                 # coin_id or WILDCARD -> {expression: set(rule ids)}
+        self._states = {}                # (expression, coin_id) -> last state
+        self._last_fired = {}            # (rule id, coin_id) -> as_of of the last alert
+        self._events = deque(maxlen=max_events)
+        self._event_ids = itertools.count(1)
+        self._rule_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._deliveries = queue.Queue()
+        self._threads = {}
+
+    def add_rule(self, coin_id, condition, sink='queue', url=None):
+        """
+        Register a rule for one coin (or WILDCARD for every coin)
+        Returns the rule dict; raises ValueError for bad conditions or sinks.
+        """
+        expression = condition.strip()
+        if sink not in SINKS:
+            raise ValueError(f"sink must be one of: {', '.join(SINKS)}")
+        if sink == 'webhook':
+            self._check_webhook_url(url)
+        condition = compile_condition(expression)
+
+        with self._lock:
+            rule = {
+                'id': f"r{next(self._rule_ids)}",
+                'coin_id': coin_id,
+                'condition': expression,
+                'field': condition['field'],
+                'sink': sink,
+                'url': url,
+                'created_at': datetime.now().isoformat()
+            }
+            self._rules[rule['id']] = rule
+            self._conditions[expression] = condition
+            self._index.setdefault(coin_id, {}).setdefault(expression, set()).add(rule['id'])
+        return dict(rule)
+
+    def _check_webhook_url(self, url):
+        """Raise ValueError unless url is http(s) on an allowed host"""
+        if not self.webhook_hosts:
+            raise ValueError('webhook alerts are disabled (set ALERT_WEBHOOK_HOSTS to allow them)')
+        parts = urlsplit(url or '')
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError('webhook rules need an http(s) url')
+        if parts.hostname.lower() not in self.webhook_hosts:
+            raise ValueError(f"webhook host {parts.hostname} is not allowed")
+
+    def remove_rule(self, rule_id):
+        """Delete a rule with its fired markers, and the condition state no other rule needs"""
+        with self._lock:
+            rule = self._rules.pop(rule_id, None)
+            if rule is None:
+                return False
+            expression = rule['condition']
+            by_condition = self._index.get(rule['coin_id'], {})
+            by_condition.get(expression, set()).discard(rule_id)
+            if not by_condition.get(expression):
+                by_condition.pop(expression, None)
+            if not by_condition:
+                self._index.pop(rule['coin_id'], None)
+            for key in [k for k in self._last_fired if k[0] == rule_id]:
+                del self._last_fired[key]
+
+            # Coins whose (expression, coin) state is still read by some rule
+            users = {c for c, conditions in self._index.items() if expression in conditions}
+            if not users:
+                self._conditions.pop(expression, None)
+            if WILDCARD not in users:
+                for key in [k for k in self._states if k[0] == expression and k[1] not in users]:
+                    del self._states[key]
+            return True
+
+    def rules(self):
+        """All registered rules"""
+        with self._lock:
+            return [dict(rule) for rule in self._rules.values()]
+
+    def watches(self, coin_id):
+        """True if any rule applies to the coin"""
+        with self._lock:
+            return bool(self._index.get(coin_id)) or bool(self._index.get(WILDCARD))
+
+    def watched_coins(self):
+        """Coin ids named by rules (wildcard rules are not expanded)"""
+        with self._lock:
+            return [c for c, by_condition in self._index.items() if c != WILDCARD and by_condition]
+
+    def evaluate(self, coin_id, row):
+        """
+        Evaluate the rules watching a coin against its fresh row
+        Each distinct condition is evaluated once; returns the alerts fired.
+        """
+        fired = []
+        with self._lock:
+            watching = {}
+            for key in (coin_id, WILDCARD):
+                for expression, rule_ids in self._index.get(key, {}).items():
+                    watching.setdefault(expression, set()).update(rule_ids)
+
+            for expression, rule_ids in watching.items():
+                condition = self._conditions[expression]
+                current = condition['state'](row)
+                previous = self._states.get((expression, coin_id))
+                self._states[(expression, coin_id)] = current
+                if not _is_edge(condition, previous, current):
+                    continue
+
+                for rule_id in sorted(rule_ids, key=lambda r: int(r[1:])):
+                    # Dedup: one alert per rule, coin and bar
+                    if self._last_fired.get((rule_id, coin_id)) == row.get('as_of'):
+                        continue
+                    self._last_fired[(rule_id, coin_id)] = row.get('as_of')
+                    rule = self._rules[rule_id]
+                    event = {
+                        'id': next(self._event_ids),
+                        'rule_id': rule_id,
+                        'coin': row.get('coin'),
+                        'coin_id': coin_id,
+                        'condition': expression,
+                        'value': field_value(row, rule['field']),
+                        'previous': previous if condition['kind'] == 'changes' else None,
+                        'as_of': row.get('as_of'),
+                        'fired_at': datetime.now().isoformat()
+                    }
+                    fired.append((rule, event))
+                    if rule['sink'] == 'queue':
+                        self._events.append(event)
+
+        metrics.increment('alerts.evaluations', len(watching))
+        for rule, event in fired:
+            metrics.increment('alerts.fired')
+            if rule['sink'] == 'webhook':
+                self._deliveries.put((rule['url'], event))
+                self._start_thread('alert-delivery', self._deliver)
+        return [event for _, event in fired]
+
+    def events(self, since=0, limit=100):
+        """Queued alerts with id > since, oldest first"""
+        with self._lock:
+            return [dict(e) for e in self._events if e['id'] > since][:limit]
+
+    def _deliver(self):
+        """Webhook delivery loop; one retry per alert"""
+        while True:
+            url, event = self._deliveries.get()
+            for attempt in range(2):
+                try:
+                    # No redirects: they could lead away from the allowed host
+                    requests.post(url, json=event, timeout=5, allow_redirects=False).raise_for_status()
+                    metrics.increment('alerts.delivered')
+                    break
+                except Exception as e:
+                    if attempt == 1:
+                        metrics.increment('alerts.delivery_errors')
+                        print(f"Alert delivery to {url} failed: {e}")
+
+    def _start_thread(self, name, target):
+        with self._lock:
+            if name in self._threads:
+                return
+            self._threads[name] = threading.Thread(target=target, name=name, daemon=True)
+        self._threads[name].start()
+
+    def start_polling(self, poll, interval):
+        """Call poll() every `interval` seconds in the background (idempotent)"""
+        def run():
+            while True:
+                try:
+                    poll()
+                except Exception as e:
+                    print(f"Alert poll failed: {e}")
+                time.sleep(interval)
+
+        if interval > 0:
+            self._start_thread('alert-poll', run)
@@ -1,26 +1,52 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
-import requests
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
+import os
+import signal
+import sys
 import time
+import metrics
+import upstream
+from upstream import BASE_URL
+from quotes import QuoteService
+from coin_index import CoinIndex, load_coin_list
+from circuit_breaker import NegativeCache
+from price_store import PriceStore
+from model_cache import ModelCache
+from portfolio import parse_holdings, value_holdings, value_curve, build_positions
+from backtest import run_backtest, summarize, METHODS as BACKTEST_METHODS
+from walk_forward import MIN_HISTORY as WALK_FORWARD_MIN_HISTORY, walk_forward_signals
+from indicator_engine import compute_indicator_matrix
+from cross_correlation import cross_correlation, matrix_to_dict
+from screener import ScreenerTable, parse_filters
+from alerts import AlertEngine, WILDCARD
+from timeframes import ResampleCache, parse_interval, INTERVAL_HOURS, BASE_INTERVAL
+from backfill import load_into_store
+from score_history import ScoreHistory
+from snapshot import WarmStart, SnapshotWriter
+from indicators import INDICATOR_REGISTRY, compute_indicators, extra_indicators
 from correlation_analysis import (
-    compute_indicator_time_series,
-    compute_correlation_matrix,
-    compute_all_methods,
+    compute_methods,
+    compute_method_scores,
+    resolve_prerequisite,
+    parse_methods,
     find_strong_correlations,
+    strongest_pairs,
     get_signal_description,
+    normalize_indicators,
     normalize_indicator_to_signal,
-    method1_simple_weighted
+    INDICATORS,
+    SCORING_METHODS,
+    COMPOSITE_METHODS,
+    SIGNAL_THRESHOLD,
+    SIMPLE_WEIGHTS
 )
 
 app = Flask(__name__)
 CORS(app)
 
-# CoinGecko API (free, no API key required)
-BASE_URL = "https://api.coingecko.com/api/v3"
-
 # Supported coins (symbol -> CoinGecko ID)
 COIN_MAP = {
     'BTC': 'bitcoin',
@@ -39,13 +65,70 @@ COIN_MAP = {
     'LINK': 'chainlink'
 }
 
+# Every listed coin, from the /coins/list snapshot written by coin_index.py; COIN_MAP
+# symbols take precedence when several coins share a symbol
+coin_index = CoinIndex(load_coin_list(), pinned=COIN_MAP)
+if coin_index.has_snapshot:
+    print(f"Loaded coin index with {len(coin_index)} coins")
+
 # Simple in-memory cache to reduce API calls
 _data_cache = {}
 _cache_duration = 60  # Cache for 60 seconds
 
+# Failed fetches are remembered briefly (unknown coin ids for longer) so they are not retried on every request
+_failed_fetches = NegativeCache(ttl=float(os.environ.get('FAILED_FETCH_TTL', 15)))
+_unknown_coin_ttl = float(os.environ.get('UNKNOWN_COIN_TTL', 600))
+
+# Warm start: the cache is snapshotted to disk every SNAPSHOT_INTERVAL seconds and at exit;
+# after a restart, series younger than SNAPSHOT_MAX_AGE are served once from the snapshot
+warm_start = WarmStart(max_age=float(os.environ.get('SNAPSHOT_MAX_AGE', 900)))
+snapshot_writer = SnapshotWriter(lambda: dict(_data_cache), interval=float(os.environ.get('SNAPSHOT_INTERVAL', 120)))
+_warm_series = warm_start.load()
+if _warm_series:
+    print(f"Warm start: {_warm_series} cached series available from the last snapshot")
+
+# Latest fetched series per coin, versioned so derived results can be reused
+price_store = PriceStore()
+
+# Long history written by backfill.py; fetched 30-day windows are merged on top of it
+_backfilled = load_into_store(price_store)
+if _backfilled:
+    print(f"Loaded backfilled history for {len(_backfilled)} coins")
+
+# Walk-forward scores of closed bars, appended as they are scored (SQLite)
+score_history = ScoreHistory()
+
+# Scoring contexts (indicator series + lazily fitted models) per (coin, data version)
+model_cache = ModelCache()
+
+# Multi-coin indicator matrices keyed by coin list, reused while every coin's data version matches
+_matrix_cache = {}
+_matrix_cache_size = 32
+
+# 4h / 1d / 1w bars resampled from the stored hourly series, extended as new bars arrive
+resample_cache = ResampleCache()
+
+# Screener rows per coin, rebuilt only when the coin's data version advances; tracked
+# coins are re-fetched in the background every SCREENER_REFRESH_INTERVAL seconds
+screener_table = ScreenerTable()
+_screener_refresh_interval = float(os.environ.get('SCREENER_REFRESH_INTERVAL', 300))
+
+# Alert rules, evaluated when a watched coin's data changes; watched coins are re-fetched
+# in the background every ALERT_POLL_INTERVAL seconds once a rule exists. Webhook rules may
+# only POST to the hosts in ALERT_WEBHOOK_HOSTS (comma-separated; unset disables webhooks)
+alert_engine = AlertEngine(webhook_hosts=os.environ.get('ALERT_WEBHOOK_HOSTS', '').split(','))
+_alert_poll_interval = float(os.environ.get('ALERT_POLL_INTERVAL', 300))
+
+# Cross-asset return correlation matrices keyed by (coins, window), checked against data versions
+_cross_corr_cache = {}
+
+# Current quotes for all of COIN_MAP, refreshed with one /simple/price call per interval
+_quote_refresh_interval = 30
+quote_service = QuoteService(COIN_MAP.values(), refresh_interval=_quote_refresh_interval)
+
 # Rate limiting: track last request time
 _last_request_time = 0
-_min_request_interval = 1.2  # Minimum 1.2 seconds between requests (50 requests/minute max)
+_min_request_interval = float(os.environ.get('COINGECKO_MIN_INTERVAL', 1.2))  # Minimum 1.2 seconds between requests (50 requests/minute max)
 
 def get_historical_data(coin_id, days=30):
     """Fetch historical price data from CoinGecko with rate limiting and caching"""
@@ -59,6 +142,30 @@ def get_historical_data(coin_id, days=30):
             print(f"Using cached data for {coin_id}")
             return cached_data
     
+    # Recent data saved by the previous process, served once. It keeps its original fetch
+    # time, so the cache treats it by its real age and later snapshots do not make it younger
+    warm = warm_start.take(cache_key)
+    if warm is not None:
+        print(f"Using snapshot data for {coin_id}")
+        _data_cache[cache_key] = warm
+        if price_store.put(coin_id, warm[0]):
+            on_data_changed(coin_id, warm[0])
+        snapshot_writer.start()
+        return warm[0]
+    
+    # Recently failed or unknown ids are not refetched until their entry expires
+    failure = _failed_fetches.get(coin_id) or _failed_fetches.get(cache_key)
+    if failure is not None:
+        print(f"Skipping fetch for {coin_id}: {failure}")
+        return get_stale_data(coin_id, days)
+    
+    url = f"{BASE_URL}/coins/{coin_id}/market_chart"
+    
+    # Upstream is backing off: answer now instead of waiting for the rate limiter
+    if upstream.circuit_open(url):
+        print(f"Not fetching data for {coin_id}: upstream circuit open")
+        return get_stale_data(coin_id, days)
+    
     # Rate limiting: ensure minimum time between requests
     current_time = time.time()
     time_since_last = current_time - _last_request_time
@@ -67,7 +174,6 @@ def get_historical_data(coin_id, days=30):
         print(f"Rate limiting: waiting {sleep_time:.2f} seconds...")
         time.sleep(sleep_time)
     
-    url = f"{BASE_URL}/coins/{coin_id}/market_chart"
     params = {
         'vs_currency': 'usd',
         'days': days
@@ -75,435 +181,447 @@ def get_historical_data(coin_id, days=30):
         # Free tier automatically returns hourly data for days 2-90
     }
     
-    max_retries = 3
-    retry_delay = 2
-    
-    for attempt in range(max_retries):
-        try:
-            _last_request_time = time.time()
-            response = requests.get(url, params=params, timeout=15)
-            
-            # Handle rate limiting (429 status code)
-            if response.status_code == 429:
-                wait_time = retry_delay * (attempt + 1)
-                print(f"Rate limit hit (429). Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                if attempt < max_retries - 1:
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise Exception("Rate limit exceeded. Please wait a minute before trying again.")
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Convert to DataFrame
-            prices = data['prices']
-            volumes = data['total_volumes']
-            
-            df = pd.DataFrame(prices, columns=['timestamp', 'price'])
-            df['volume'] = [v[1] for v in volumes]
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            
-            # Cache the result
-            _data_cache[cache_key] = (df, datetime.now())
-            
-            return df
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                wait_time = retry_delay * (attempt + 1)
-                print(f"Rate limit hit (429). Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                if attempt < max_retries - 1:
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"Rate limit exceeded after {max_retries} retries")
-                    return None
-            else:
-                print(f"HTTP Error fetching data for {coin_id}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    continue
-                return None
-        except requests.exceptions.Timeout:
-            print(f"Timeout fetching data for {coin_id} (attempt {attempt + 1}/{max_retries})")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-                continue
-            return None
-        except Exception as e:
-            print(f"Error fetching data for {coin_id}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-                continue
+    # One attempt per request: failures open the endpoint's circuit breaker instead of
+    # being retried with sleeps, and the caller gets stale data if there is any
+    try:
+        _last_request_time = time.time()
+        response = upstream.get(url, params=params, timeout=15)
+        
+        if response.status_code == 404:
+            print(f"Unknown coin id: {coin_id}")
+            _failed_fetches.put(coin_id, 'unknown coin id', ttl=_unknown_coin_ttl)
             return None
-    
-    return None
-
-def calculate_rsi(prices, period=14):
-    """Calculate Relative Strength Index using Wilder's smoothing method"""
-    deltas = np.diff(prices)
-    
-    # Separate gains and losses
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    # Initialize arrays for RSI
-    rsi = np.zeros_like(prices)
-    
-    # Calculate initial average gain and loss (simple average for first period)
-    if len(gains) < period:
-        # Not enough data, return neutral value
-        return 50.0
-    
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-    
-    # Handle edge case where avg_loss is zero
-    if avg_loss == 0:
-        return 100.0
-    
-    # Calculate initial RS and RSI
-    rs = avg_gain / avg_loss
-    rsi[period] = 100.0 - (100.0 / (1.0 + rs))
-    
-    # Apply Wilder's smoothing for remaining periods
-    for i in range(period + 1, len(prices)):
-        gain = gains[i - 1]  # i-1 because gains array is one shorter
-        loss = losses[i - 1]
+        if response.status_code == 429:
+            raise Exception("Rate limit exceeded. Please wait a minute before trying again.")
         
-        # Wilder's smoothing: new_avg = (old_avg * (period - 1) + new_value) / period
-        avg_gain = (avg_gain * (period - 1) + gain) / period
-        avg_loss = (avg_loss * (period - 1) + loss) / period
+        response.raise_for_status()
+        data = response.json()
         
-        if avg_loss == 0:
-            rsi[i] = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            rsi[i] = 100.0 - (100.0 / (1.0 + rs))
-    
-    return rsi[-1]
+        # Convert to DataFrame
+        prices = data['prices']
+        volumes = data['total_volumes']
+        
+        df = pd.DataFrame(prices, columns=['timestamp', 'price'])
+        df['volume'] = [v[1] for v in volumes]
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        
+        # Cache the result
+        _data_cache[cache_key] = (df, datetime.now())
+        snapshot_writer.start()
+        if price_store.put(coin_id, df):
+            on_data_changed(coin_id, df)
+        
+        return df
+        
+    except upstream.CircuitOpenError as e:
+        print(f"Not fetching data for {coin_id}: {e}")
+        return get_stale_data(coin_id, days)
+    except Exception as e:
+        print(f"Error fetching data for {coin_id}: {e}")
+        _failed_fetches.put(cache_key, str(e))
+        return get_stale_data(coin_id, days)
 
-def calculate_macd(prices):
-    """Calculate MACD (Moving Average Convergence Divergence)"""
-    exp1 = pd.Series(prices).ewm(span=12, adjust=False).mean()
-    exp2 = pd.Series(prices).ewm(span=26, adjust=False).mean()
-    macd = exp1 - exp2
-    signal = macd.ewm(span=9, adjust=False).mean()
-    histogram = macd - signal
-    
-    return {
-        'macd': float(macd.iloc[-1]),
-        'signal': float(signal.iloc[-1]),
-        'histogram': float(histogram.iloc[-1])
-    }
+def resolve_coin(coin):
+    """CoinGecko id for a symbol, id or name; None if the coin is not listed"""
+    coin_id = coin_index.resolve(coin)
+    if coin_id is None and not coin_index.has_snapshot:
+        # Without a coin list snapshot only COIN_MAP is known locally; let CoinGecko decide
+        return coin.strip().lower()
+    return coin_id
 
-def calculate_bollinger_bands(prices, period=20):
-    """Calculate Bollinger Bands"""
-    sma = pd.Series(prices).rolling(window=period).mean()
-    std = pd.Series(prices).rolling(window=period).std()
-    
-    upper_band = sma + (std * 2)
-    lower_band = sma - (std * 2)
-    
-    current_price = prices[-1]
-    
-    return {
-        'upper': float(upper_band.iloc[-1]),
-        'middle': float(sma.iloc[-1]),
-        'lower': float(lower_band.iloc[-1]),
-        'current': current_price
-    }
+def get_stale_data(coin_id, days=30):
+    """Last fetched series for a coin (any age), else its stored history trimmed to `days`; None if neither"""
+    cached = _data_cache.get(f"{coin_id}_{days}")
+    if cached is not None:
+        metrics.increment('upstream.stale_served')
+        print(f"Serving stale data for {coin_id} (fetched {cached[1]:%H:%M:%S})")
+        return cached[0]
+    df = price_store.get(coin_id)
+    if df is None or len(df) == 0:
+        return None
+    metrics.increment('upstream.stale_served')
+    print(f"Serving stored history for {coin_id}")
+    cutoff = df['timestamp'].iloc[-1] - pd.Timedelta(days=days)
+    return df[df['timestamp'] >= cutoff].reset_index(drop=True)
 
-def calculate_ema(prices, period=20):
-    """Calculate Exponential Moving Average"""
-    ema = pd.Series(prices).ewm(span=period, adjust=False).mean()
-    return float(ema.iloc[-1])
+def parse_lookback(value):
+    """Parse ?lookback= (days of stored history to analyse); None means the default window"""
+    if not value:
+        return None
+    try:
+        lookback = int(value)
+    except ValueError:
+        raise ValueError('lookback must be a whole number of days')
+    if lookback < 1:
+        raise ValueError('lookback must be at least 1 day')
+    return lookback
 
-def analyze_volume(volumes, prices):
-    """Analyze volume trend"""
-    recent_volume = np.mean(volumes[-5:])
-    
-    # Handle edge case: if not enough data, use all available data
-    if len(volumes) < 10:
-        avg_volume = np.mean(volumes) if len(volumes) > 0 else recent_volume
-    else:
-        avg_volume = np.mean(volumes[:-5])
-    
-    volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
-    
-    # Price trend - handle edge case for insufficient data
-    if len(prices) >= 5:
-        recent_price_change = (prices[-1] - prices[-5]) / prices[-5] * 100
+def get_interval_data(coin_id, interval=BASE_INTERVAL, days=30, lookback=None):
+    """
+    Historical data at a timeframe
+    Coarser intervals are resampled from the stored hourly series, never refetched.
+    lookback: days of stored history (including backfilled bars) instead of the fetched window
+    """
+    df = get_historical_data(coin_id, days=days)
+    if df is None or (interval == BASE_INTERVAL and lookback is None):
+        return df
+    df = resample_cache.get(coin_id, price_store.version(coin_id), price_store.get(coin_id), interval)
+    if lookback is not None:
+        df = df[df['timestamp'] >= df['timestamp'].iloc[-1] - pd.Timedelta(days=lookback)].reset_index(drop=True)
+    return df
+
+def get_scoring_context(coin_id, df, days=30, interval=BASE_INTERVAL, lookback=None):
+    """Indicator series and lazily fitted models, reused until the data changes"""
+    key = f"{coin_id}_{days}"
+    if interval != BASE_INTERVAL:
+        key += f"_{interval}"
+    if lookback is not None:
+        key += f"_lb{lookback}"
+    return model_cache.get(key, price_store.version(coin_id), df)
+
+def walk_forward_history(coin_id, interval, fit, window, lookback, indicator_df, timestamps, days):
+    """
+    Walk-forward history from the score store, scoring only bars not stored yet
+    Closed bars are appended to the store; the last bar may still be forming, so it is
+    scored for the response but not stored. Expanding fits start at the first stored bar,
+    whose raw indicator rows come back from the store, so the origin stays fixed as the
+    fetched window slides. Rolling fits only need the last `window` rows before the first
+    new bar, so their cost does not grow with the history length.
+    Returns (timestamps, normalized (n, 5), {method: (n,)}) for the last `days` days.
+    """
+    key = f"rolling{window}" if fit == 'rolling' else fit
+    if lookback is not None:
+        key += f"_lb{lookback}"
+    ts_ms = timestamps.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    values = indicator_df[INDICATORS].to_numpy(dtype=np.float64)
+    last_ms = score_history.last_timestamp(coin_id, interval, key)
+    first_new = 0 if last_ms is None else min(int(np.searchsorted(ts_ms, last_ms, side='right')), len(ts_ms) - 1)
+    
+    # Walk-forward scores: models at each bar see only rows up to that bar
+    if fit == 'expanding':
+        stored_ts, stored_raw = score_history.read_raw(coin_id, interval, key)
+        stored_raw = stored_raw[stored_ts < ts_ms[first_new]]
+        tail = pd.DataFrame(np.vstack([stored_raw, values[first_new:]]), columns=INDICATORS)
+        offset = len(stored_raw)
+        signals = walk_forward_signals(tail, min_history=max(WALK_FORWARD_MIN_HISTORY, offset))
     else:
-        recent_price_change = (prices[-1] - prices[0]) / prices[0] * 100 if len(prices) > 1 else 0
+        start = 0
+        if first_new - window + 1 >= WALK_FORWARD_MIN_HISTORY:
+            start = first_new - window + 1
+        tail = indicator_df.iloc[start:]
+        signals = walk_forward_signals(tail, min_history=WALK_FORWARD_MIN_HISTORY if start == 0 else window - 1,
+                                       window=window)
+        offset = first_new - start
+    raw = values[first_new:]
+    normalized = normalize_indicators(raw)
+    scores = {method: signals[method][offset:] for method in BACKTEST_METHODS}
+    score_history.append(coin_id, interval, key, ts_ms[first_new:-1], normalized[:-1],
+                         {method: column[:-1] for method, column in scores.items()}, raw[:-1])
+    
+    # Stored bars in range plus the live bar
+    live_ms = ts_ms[-1]
+    stored_ts, stored_normalized, stored_scores = score_history.read(
+        coin_id, interval, key, start_ms=live_ms - days * 24 * 3600 * 1000 + 1, end_ms=live_ms - 1
+    )
+    history_timestamps = pd.to_datetime(np.append(stored_ts, live_ms), unit='ms')
+    history_normalized = np.vstack([stored_normalized, normalized[-1:]])
+    history_scores = {m: np.append(stored_scores[m], scores[m][-1]) for m in BACKTEST_METHODS}
+    return history_timestamps, history_normalized, history_scores
+
+def get_indicator_matrix(coin_ids):
+    """Indicators for several stored coins at once (indicator_engine), cached per data versions"""
+    key = tuple(coin_ids)
+    versions = tuple(price_store.version(c) for c in coin_ids)
+    cached = _matrix_cache.get(key)
+    if cached is not None and cached[0] == versions:
+        metrics.increment('matrix.cache_hits')
+        return cached[1]
+    
+    metrics.increment('matrix.cache_misses')
+    start = time.time()
+    result = compute_indicator_matrix({c: price_store.get(c) for c in coin_ids})
+    metrics.observe('matrix.build', time.time() - start)
+    
+    if key not in _matrix_cache and len(_matrix_cache) >= _matrix_cache_size:
+        _matrix_cache.pop(next(iter(_matrix_cache)))
+    _matrix_cache[key] = (versions, result)
+    return result
+
+def get_cross_correlation(coin_ids, window=None):
+    """Pearson / Spearman return correlations of stored coins, recomputed only when data changes"""
+    key = (tuple(coin_ids), window)
+    versions = tuple(price_store.version(c) for c in coin_ids)
+    cached = _cross_corr_cache.get(key)
+    if cached is not None and cached[0] == versions:
+        metrics.increment('cross_corr.cache_hits')
+        return cached[1]
+    
+    metrics.increment('cross_corr.cache_misses')
+    grid, prices = price_store.aligned(coin_ids)
+    if grid is None or len(grid) < 3:
+        return None
+    result = cross_correlation(prices, coin_ids, window=window)
+    result['as_of'] = grid[-1].isoformat()
+    
+    if key not in _cross_corr_cache and len(_cross_corr_cache) >= _matrix_cache_size:
+        _cross_corr_cache.pop(next(iter(_cross_corr_cache)))
+    _cross_corr_cache[key] = (versions, result)
+    return result
+
+# Methods averaged into the advanced-analysis consensus
+CONSENSUS_METHODS = ['simple_weighted', 'correlation_adjusted', 'mahalanobis']
+
+def format_method_results(results, methods):
+    """JSON rows for compute_methods results: score and recommendation plus method details"""
+    formatted = {}
+    for name in methods:
+        if name not in COMPOSITE_METHODS:
+            formatted[name] = results[name]
+            continue
+        score = results[name]['score']
+        formatted[name] = {'score': score, 'recommendation': get_signal_description(score)}
+        formatted[name].update({k: v for k, v in results[name].items() if k != 'score'})
+    return formatted
+
+def build_screener_row(symbol, coin_id, df):
+    """Latest indicators, method scores and consensus of one coin for the screener table"""
+    if df is None or len(df) < 50:
+        return None
+    context = get_scoring_context(coin_id, df)
+    latest = context['indicator_df'][INDICATORS].to_numpy(dtype=np.float64)[-1]
+    scores = compute_method_scores(latest[None, :], context)
+    signals = normalize_indicators(latest)
+    
+    method_scores = {name: float(scores[name][0]) for name in COMPOSITE_METHODS}
+    consensus_scores = [method_scores[m] for m in CONSENSUS_METHODS]
+    consensus_score = float(np.mean(consensus_scores))
+    prices = df['price'].values
     
     return {
-        'volume_ratio': float(volume_ratio),
-        'price_change': float(recent_price_change),
-        'avg_volume': float(avg_volume)
+        'coin': symbol,
+        'coin_id': coin_id,
+        'price': float(prices[-1]),
+        'change_24h': float((prices[-1] / prices[-25] - 1) * 100) if len(prices) > 24 else None,
+        **{name: float(latest[i]) for i, name in enumerate(INDICATORS)},
+        'signals': {name: float(signals[i]) for i, name in enumerate(INDICATORS)},
+        **method_scores,
+        'recommendation': get_signal_description(method_scores['simple_weighted']),
+        'consensus': {
+            'score': consensus_score,
+            'recommendation': get_signal_description(consensus_score),
+            'agreement': len(set(get_signal_description(score) for score in consensus_scores)) == 1
+        },
+        'as_of': df['timestamp'].iloc[-1].isoformat()
     }
 
-def get_indicator_signal(indicator_name, value, current_price=None):
-    """Convert indicator value to buy/sell/hold signal (-1, 0, 1)"""
-    
-    if indicator_name == 'RSI':
-        if value < 30:
-            return 1, "BUY - Oversold"
-        elif value > 70:
-            return -1, "SELL - Overbought"
-        else:
-            return 0, "HOLD - Neutral"
-    
-    elif indicator_name == 'MACD':
-        histogram = value['histogram']
-        if histogram > 0 and value['macd'] > value['signal']:
-            return 1, "BUY - Bullish crossover"
-        elif histogram < 0 and value['macd'] < value['signal']:
-            return -1, "SELL - Bearish crossover"
-        else:
-            return 0, "HOLD - No clear signal"
-    
-    elif indicator_name == 'Bollinger':
-        band_width = value['upper'] - value['lower']
-        if band_width == 0:
-            # Bands are equal (rare edge case), consider neutral
-            position = 0.5
-        else:
-            position = (current_price - value['lower']) / band_width
-        
-        if position < 0.2:
-            return 1, "BUY - Near lower band"
-        elif position > 0.8:
-            return -1, "SELL - Near upper band"
-        else:
-            return 0, "HOLD - Middle range"
-    
-    elif indicator_name == 'EMA':
-        if current_price > value:
-            return 1, "BUY - Above EMA"
-        elif current_price < value * 0.98:
-            return -1, "SELL - Below EMA"
-        else:
-            return 0, "HOLD - Near EMA"
-    
-    elif indicator_name == 'Volume':
-        if value['volume_ratio'] > 1.5 and value['price_change'] > 0:
-            return 1, "BUY - High volume uptrend"
-        elif value['volume_ratio'] > 1.5 and value['price_change'] < 0:
-            return -1, "SELL - High volume downtrend"
-        else:
-            return 0, "HOLD - Normal volume"
-    
-    return 0, "HOLD"
-
-def calculate_composite_score(signals):
-    """Calculate weighted composite score"""
-    weights = {
-        'RSI': 0.25,
-        'MACD': 0.25,
-        'Bollinger': 0.20,
-        'EMA': 0.15,
-        'Volume': 0.15
-    }
-    
-    composite = sum(signals[key] * weights[key] for key in weights)
-    
-    if composite > 0.4:
-        return "STRONG BUY", composite
-    elif composite > 0.2:
-        return "BUY", composite
-    elif composite < -0.4:
-        return "STRONG SELL", composite
-    elif composite < -0.2:
-        return "SELL", composite
-    else:
-        return "HOLD", composite
+def refresh_screener():
+    """Fetch every tracked coin (served from the data cache when fresh) and rebuild stale rows"""
+    rebuilt = 0
+    for symbol, coin_id in COIN_MAP.items():
+        df = get_historical_data(coin_id, days=30)
+        if df is None:
+            continue
+        if screener_table.update(coin_id, price_store.version(coin_id),
+                                 lambda: build_screener_row(symbol, coin_id, df)):
+            rebuilt += 1
+    metrics.increment('screener.rows_rebuilt', rebuilt)
+    return rebuilt
+
+def on_data_changed(coin_id, df):
+    """Rebuild a tracked or watched coin's screener row after its data changed and evaluate its alert rules"""
+    watched = alert_engine.watches(coin_id)
+    symbol = next((s for s, c in COIN_MAP.items() if c == coin_id), None)
+    if symbol is None and not watched:
+        return
+    symbol = symbol or coin_id.upper()
+    if screener_table.update(coin_id, price_store.version(coin_id), lambda: build_screener_row(symbol, coin_id, df)):
+        metrics.increment('screener.rows_rebuilt')
+    row = screener_table.get(coin_id)
+    if watched and row is not None:
+        alert_engine.evaluate(coin_id, row)
+
+def poll_alerts():
+    """Fetch the coins watched by alert rules (all tracked coins if a rule uses '*')"""
+    coin_ids = list(COIN_MAP.values()) if alert_engine.watches(WILDCARD) else alert_engine.watched_coins()
+    for coin_id in coin_ids:
+        get_historical_data(coin_id, days=30)
+
+def parse_indicators(value):
+    """Parse ?indicators= into extra registry indicator names (None if empty)"""
+    if not value:
+        return None
+    names = [n.strip() for n in value.split(',') if n.strip()]
+    available = extra_indicators()
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        raise ValueError(f"Unknown indicators: {', '.join(unknown)}. Available: {', '.join(available)}")
+    return names
+
+def latest_indicators(df, names=None, interval=BASE_INTERVAL):
+    """Latest value (and signal, for directional indicators) of registry indicators (default: core)"""
+    names = names or INDICATORS
+    series = compute_indicators(df['price'].values, df['volume'].values, names=names,
+                                bars_per_year=365 * 24 / INTERVAL_HOURS[interval])
+    latest = {}
+    for name in names:
+        value = series[name][-1]
+        entry = {'value': float(value) if np.isfinite(value) else None}
+        if INDICATOR_REGISTRY[name]['normalize'] is not None and np.isfinite(value):
+            signal = normalize_indicator_to_signal(value, name)
+            entry['signal'] = signal
+            entry['recommendation'] = get_signal_description(signal)
+        latest[name] = entry
+    return latest
 
 @app.route('/api/analyze/<coin>', methods=['GET'])
 def analyze_coin(coin):
     """Analyze a cryptocurrency and return all indicators"""
     
-    # Map common symbols to CoinGecko IDs
-    coin_id = COIN_MAP.get(coin.upper(), coin.lower())
+    # Map symbols to CoinGecko IDs; unknown coins are rejected without an upstream call
+    coin_id = resolve_coin(coin)
+    if coin_id is None:
+        return jsonify({'error': f'Unknown coin: {coin}'}), 404
+    
+    # Optional extra scoring methods (?methods=mahalanobis,pca_composite), extra registry
+    # indicators (?indicators=ATR,Stochastic) and timeframe (?interval=4h)
+    try:
+        methods = parse_methods(request.args.get('methods'), list(SCORING_METHODS))
+        extras = parse_indicators(request.args.get('indicators'))
+        interval = parse_interval(request.args.get('interval'))
+        lookback = parse_lookback(request.args.get('lookback'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     # Fetch historical data
-    df = get_historical_data(coin_id, days=30)
+    df = get_interval_data(coin_id, interval, lookback=lookback)
     
     if df is None or len(df) < 50:
         error_msg = 'Unable to fetch data from CoinGecko API. '
         if df is None:
             error_msg += 'This may be due to rate limiting. Please wait a moment and try again.'
         else:
-            error_msg += 'Insufficient data received.'
+            error_msg += f'Insufficient data received ({len(df)} {interval} bars, need 50).'
         return jsonify({'error': error_msg}), 500
     
     prices = df['price'].values
-    volumes = df['volume'].values
     current_price = prices[-1]
     
-    # Calculate all indicators
-    rsi_value = calculate_rsi(prices)
-    macd_value = calculate_macd(prices)
-    bb_value = calculate_bollinger_bands(prices)
-    ema_value = calculate_ema(prices, period=20)
-    volume_analysis = analyze_volume(volumes, prices)
-    
-    # Get signals for each indicator (for display purposes)
-    signals = {}
-    signal_descriptions = {}
-    
-    rsi_signal, rsi_desc = get_indicator_signal('RSI', rsi_value)
-    signals['RSI'] = rsi_signal
-    signal_descriptions['RSI'] = rsi_desc
-    
-    macd_signal, macd_desc = get_indicator_signal('MACD', macd_value)
-    signals['MACD'] = macd_signal
-    signal_descriptions['MACD'] = macd_desc
-    
-    bb_signal, bb_desc = get_indicator_signal('Bollinger', bb_value, current_price)
-    signals['Bollinger'] = bb_signal
-    signal_descriptions['Bollinger'] = bb_desc
-    
-    ema_signal, ema_desc = get_indicator_signal('EMA', ema_value, current_price)
-    signals['EMA'] = ema_signal
-    signal_descriptions['EMA'] = ema_desc
-    
-    vol_signal, vol_desc = get_indicator_signal('Volume', volume_analysis)
-    signals['Volume'] = vol_signal
-    signal_descriptions['Volume'] = vol_desc
-    
-    # Calculate composite score using Simple Weighted method (same as Advanced Analysis)
-    # Prepare indicator values in the format expected by method1_simple_weighted
-    bb_position = (current_price - bb_value['lower']) / (bb_value['upper'] - bb_value['lower']) if (bb_value['upper'] - bb_value['lower']) != 0 else 0.5
-    
-    indicator_values = {
-        'RSI': rsi_value,
-        'MACD': macd_value['histogram'],
-        'Bollinger': bb_position,
-        'EMA': current_price / ema_value,  # EMA ratio
-        'Volume': volume_analysis['volume_ratio']
-    }
+    # Latest value and signal of every core indicator (plus ?indicators= extras) from the registry
+    latest = latest_indicators(df, INDICATORS + (extras or []), interval)
+    indicators = {}
+    for name, entry in latest.items():
+        signal = entry.get('signal', 0.0)
+        indicators[name] = {
+            'value': entry['value'],
+            'score': signal,
+            'signal': int(np.sign(signal)) if abs(signal) >= SIGNAL_THRESHOLD else 0,
+            'description': entry.get('recommendation', 'N/A - Non-directional')
+        }
+    indicator_values = {name: latest[name]['value'] for name in INDICATORS}
     
-    # Use Simple Weighted method to get composite score
-    composite_score, normalized_signals = method1_simple_weighted(indicator_values)
+    # Composite score from the Simple Weighted method; other methods only when requested,
+    # which is when the indicator history and fitted models are needed
+    requested = ['simple_weighted'] + [m for m in methods or [] if m != 'simple_weighted']
+    context = get_scoring_context(coin_id, df, interval=interval, lookback=lookback) if methods else {}
+    price_change = (prices[-1] - prices[-5]) / prices[-5] * 100 if len(prices) >= 5 else 0
+    method_results = compute_methods(context, indicator_values, requested, price_change)
+    composite_score = method_results['simple_weighted']['score']
     recommendation = get_signal_description(composite_score)
     
     # Prepare response
     result = {
         'coin': coin.upper(),
         'coin_id': coin_id,
+        'interval': interval,
         'timestamp': datetime.now().isoformat(),
         'current_price': float(current_price),
-        'indicators': {
-            'RSI': {
-                'value': float(rsi_value),
-                'signal': rsi_signal,
-                'description': rsi_desc
-            },
-            'MACD': {
-                'value': macd_value,
-                'signal': macd_signal,
-                'description': macd_desc
-            },
-            'Bollinger': {
-                'value': bb_value,
-                'signal': bb_signal,
-                'description': bb_desc
-            },
-            'EMA': {
-                'value': float(ema_value),
-                'signal': ema_signal,
-                'description': ema_desc
-            },
-            'Volume': {
-                'value': volume_analysis,
-                'signal': vol_signal,
-                'description': vol_desc
-            }
-        },
+        'indicators': indicators,
         'composite': {
             'score': float(composite_score),
             'recommendation': recommendation,
             'confidence': abs(composite_score) * 100
         }
     }
+    if methods:
+        result['methods'] = format_method_results(method_results, methods)
     
     return jsonify(result)
 
+@app.route('/api/price', methods=['GET'])
 @app.route('/api/price/<coin>', methods=['GET'])
-def get_current_price(coin):
-    """Get current price for a coin"""
-    coin_map = {
-        'BTC': 'bitcoin',
-        'XRP': 'ripple',
-        'SOL': 'solana',
-        'ETH': 'ethereum'
-    }
+def get_current_price(coin=None):
+    """Get current price for one coin, or several with ?coins=BTC,ETH"""
+    if coin is not None:
+        symbols = [coin]
+    else:
+        symbols = [c.strip() for c in request.args.get('coins', '').split(',') if c.strip()]
+    if not symbols:
+        return jsonify({'error': 'Specify a coin, e.g. /api/price/BTC or /api/price?coins=BTC,ETH'}), 400
     
-    coin_id = coin_map.get(coin.upper(), coin.lower())
+    coin_ids = [resolve_coin(symbol) for symbol in symbols]
+    unknown = [symbol for symbol, coin_id in zip(symbols, coin_ids) if coin_id is None]
+    if unknown:
+        return jsonify({'error': f"Unknown coin: {', '.join(unknown)}"}), 404
     
-    url = f"{BASE_URL}/simple/price"
-    params = {
-        'ids': coin_id,
-        'vs_currencies': 'usd',
-        'include_24hr_change': 'true'
-    }
+    # Quotes are served from memory; the service refreshes all tracked coins in one call
+    quote_service.start()
+    quotes = quote_service.get_quotes(coin_ids)
     
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
-        return jsonify(data)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if not quotes:
+        if quote_service.status()['last_error']:
+            return jsonify({'error': 'Unable to fetch prices from CoinGecko API. Please wait a moment and try again.'}), 500
+        return jsonify({'error': f"No price available for: {', '.join(symbols)}"}), 404
+    
+    return jsonify(quotes)
 
 @app.route('/api/advanced-analysis/<coin>', methods=['GET'])
 def advanced_analysis(coin):
     """Advanced analysis with correlation matrix and multiple scoring methods"""
     
-    coin_id = COIN_MAP.get(coin.upper(), coin.lower())
+    coin_id = resolve_coin(coin)
+    if coin_id is None:
+        return jsonify({'error': f'Unknown coin: {coin}'}), 404
+    
+    # Optional subset of scoring methods (?methods=simple_weighted,mahalanobis)
+    # and extra registry indicators to report (?indicators=ATR,Stochastic)
+    try:
+        methods = parse_methods(request.args.get('methods'), COMPOSITE_METHODS) or COMPOSITE_METHODS
+        extras = parse_indicators(request.args.get('indicators'))
+        interval = parse_interval(request.args.get('interval'))
+        lookback = parse_lookback(request.args.get('lookback'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     # Fetch historical data
-    df = get_historical_data(coin_id, days=30)
+    df = get_interval_data(coin_id, interval, lookback=lookback)
     
     if df is None or len(df) < 50:
         error_msg = 'Unable to fetch data from CoinGecko API. '
         if df is None:
             error_msg += 'This may be due to rate limiting. Please wait a moment and try again.'
         else:
-            error_msg += 'Insufficient data received.'
+            error_msg += f'Insufficient data received ({len(df)} {interval} bars, need 50).'
         return jsonify({'error': error_msg}), 500
     
     prices = df['price'].values
-    volumes = df['volume'].values
     current_price = prices[-1]
     
     # Calculate price change for volume analysis
     price_change = (prices[-1] - prices[-5]) / prices[-5] * 100 if len(prices) >= 5 else 0
     
-    # Compute indicator time series for correlation analysis
-    indicator_df = compute_indicator_time_series(df)
-    
-    # Compute correlation matrix
-    correlation_matrix = compute_correlation_matrix(indicator_df)
-    
-    # Get current indicator values
-    macd_full = calculate_macd(prices)
-    bb_full = calculate_bollinger_bands(prices)
-    volume_analysis = analyze_volume(volumes, prices)
-    ema_value = calculate_ema(prices, period=20)
-    
-    current_values = {
-        'RSI': calculate_rsi(prices),
-        'MACD': macd_full['histogram'],
-        'MACD_Signal': macd_full['signal'],
-        'Bollinger': (current_price - bb_full['lower']) / (bb_full['upper'] - bb_full['lower']) if (bb_full['upper'] - bb_full['lower']) != 0 else 0.5,
-        'EMA': current_price / ema_value,  # EMA ratio (price/EMA), not EMA value
-        'Volume': volume_analysis['volume_ratio']
-    }
+    # Indicator time series and lazily fitted models (cached per data version)
+    context = get_scoring_context(coin_id, df, interval=interval, lookback=lookback)
+    correlation_matrix = resolve_prerequisite(context, 'correlation_matrix')
+    
+    # Current indicator values from the registry's batch kernels
+    latest = latest_indicators(df, interval=interval)
+    current_values = {name: latest[name]['value'] for name in INDICATORS}
+    
+    # Normalized signal of every current indicator in one call
+    current_signals = normalize_indicators(np.array([current_values[name] for name in INDICATORS]))
     
-    # Compute all scoring methods
-    all_results = compute_all_methods(indicator_df, current_values, correlation_matrix, price_change)
+    # Compute the requested scoring methods (only their prerequisites are fitted)
+    all_results = compute_methods(context, current_values, methods, price_change)
     
     # Find strong correlations
     strong_corrs = find_strong_correlations(correlation_matrix, threshold=0.3)
@@ -511,154 +629,126 @@ def advanced_analysis(coin):
     # Prepare correlation matrix for JSON
     corr_dict = correlation_matrix.to_dict()
     
-    # Get individual signals
-    individual_signals = all_results['individual_signals']
+    # Consensus over the requested methods among simple, correlation-adjusted and Mahalanobis
+    consensus_scores = [all_results[m]['score'] for m in CONSENSUS_METHODS if m in all_results]
     
     # Prepare result
     result = {
         'coin': coin.upper(),
         'coin_id': coin_id,
+        'interval': interval,
         'timestamp': datetime.now().isoformat(),
         'current_price': float(current_price),
-        'current_indicators': {
-            'RSI': float(current_values['RSI']),
-            'MACD': float(current_values['MACD']),
-            'Bollinger': float(current_values['Bollinger']),
-            'EMA': float(current_values['EMA']),
-            'Volume': float(current_values['Volume'])
-        },
+        'current_indicators': {name: float(current_values[name]) for name in INDICATORS},
         'correlation_matrix': corr_dict,
         'strong_correlations': strong_corrs,
         'methods': {
-            'simple_weighted': {
-                'score': all_results['simple_weighted']['score'],
-                'recommendation': get_signal_description(all_results['simple_weighted']['score']),
-                'normalized_signals': all_results['simple_weighted']['normalized_signals']
-            },
-            'correlation_adjusted': {
-                'score': all_results['correlation_adjusted']['score'],
-                'recommendation': get_signal_description(all_results['correlation_adjusted']['score']),
-                'weights': all_results['correlation_adjusted']['weights']
-            },
-            'mahalanobis': {
-                'score': all_results['mahalanobis']['score'],
-                'recommendation': get_signal_description(all_results['mahalanobis']['score']),
-                'distances': all_results['mahalanobis']['distances']
-            },
-            'pca_composite': {
-                'score': all_results['pca_composite']['score'],
-                'recommendation': get_signal_description(all_results['pca_composite']['score']),
-                'factors': all_results['pca_composite']['factors']
-            },
+            **format_method_results(all_results, methods),
             'individual_signals': {
-                'RSI': {
-                    'signal': float(normalize_indicator_to_signal(current_values['RSI'], 'RSI')),
-                    'recommendation': get_signal_description(float(normalize_indicator_to_signal(current_values['RSI'], 'RSI')))
-                },
-                'MACD': {
-                    'signal': float(normalize_indicator_to_signal(current_values['MACD'], 'MACD')),
-                    'recommendation': get_signal_description(float(normalize_indicator_to_signal(current_values['MACD'], 'MACD')))
-                },
-                'Bollinger': {
-                    'signal': float(normalize_indicator_to_signal(current_values['Bollinger'], 'Bollinger')),
-                    'recommendation': get_signal_description(float(normalize_indicator_to_signal(current_values['Bollinger'], 'Bollinger')))
-                },
-                'EMA': {
-                    'signal': float(normalize_indicator_to_signal(current_values['EMA'], 'EMA')),
-                    'recommendation': get_signal_description(float(normalize_indicator_to_signal(current_values['EMA'], 'EMA')))
-                },
-                'Volume': {
-                    'signal': float(normalize_indicator_to_signal(current_values['Volume'], 'Volume')),
-                    'recommendation': get_signal_description(float(normalize_indicator_to_signal(current_values['Volume'], 'Volume')))
+                name: {
+                    'signal': float(signal),
+                    'recommendation': get_signal_description(float(signal))
                 }
+                for name, signal in zip(INDICATORS, current_signals)
             }
         },
         'consensus': {
-            'scores': [
-                all_results['simple_weighted']['score'],
-                all_results['correlation_adjusted']['score'],
-                all_results['mahalanobis']['score']
-            ],
-            'average_score': float(np.mean([
-                all_results['simple_weighted']['score'],
-                all_results['correlation_adjusted']['score'],
-                all_results['mahalanobis']['score']
-            ])),
-            'agreement': len(set([
-                get_signal_description(all_results['simple_weighted']['score']),
-                get_signal_description(all_results['correlation_adjusted']['score']),
-                get_signal_description(all_results['mahalanobis']['score'])
-            ])) == 1
+            'scores': consensus_scores,
+            'average_score': float(np.mean(consensus_scores)) if consensus_scores else None,
+            'agreement': len(set(get_signal_description(score) for score in consensus_scores)) == 1
         }
     }
     
+    if extras:
+        result['extra_indicators'] = latest_indicators(df, extras, interval)
+    
     return jsonify(result)
 
 
 @app.route('/api/indicator-history/<coin>', methods=['GET'])
 def indicator_history(coin):
-    """Return 10-day history of normalized indicators and composite methods"""
-    
-    coin_id = COIN_MAP.get(coin.upper(), coin.lower())
-    
-    df = get_historical_data(coin_id, days=30)
+    """
+    Return a history (default 10 days, ?days=N) of normalized indicators and composite methods
+    ?methods= limits the scored methods (default: all four).
+    ?fit=full (default) scores every bar with models fitted on the whole series;
+    ?fit=expanding or ?fit=rolling&window=N fits only on data up to each bar. These
+    walk-forward scores are kept in the score history store, so ?days= can reach back
+    past the fetched window.
+    ?interval=4h|1d|1w scores bars resampled from the hourly series.
+    """
+    
+    coin_id = resolve_coin(coin)
+    if coin_id is None:
+        return jsonify({'error': f'Unknown coin: {coin}'}), 404
+    fit = request.args.get('fit', 'full').lower()
+    if fit not in ('full', 'expanding', 'rolling'):
+        return jsonify({'error': "fit must be one of: full, expanding, rolling"}), 400
+    try:
+        window = int(request.args.get('window', 240)) if fit == 'rolling' else None
+    except ValueError:
+        return jsonify({'error': 'window must be an integer'}), 400
+    if window is not None and window < 10:
+        return jsonify({'error': 'window must be at least 10'}), 400
+    try:
+        methods = parse_methods(request.args.get('methods'), COMPOSITE_METHODS) or COMPOSITE_METHODS
+        interval = parse_interval(request.args.get('interval'))
+        lookback = parse_lookback(request.args.get('lookback'))
+        days = int(request.args.get('days', 10))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if days < 1:
+        return jsonify({'error': 'days must be at least 1'}), 400
+    
+    df = get_interval_data(coin_id, interval, lookback=lookback)
     if df is None or len(df) < 50:
         error_msg = 'Unable to fetch data from CoinGecko API for indicator history.'
+        if df is not None:
+            error_msg = f'Insufficient data for indicator history ({len(df)} {interval} bars, need 50).'
         return jsonify({'error': error_msg}), 500
     
-    indicator_df = compute_indicator_time_series(df)
+    context = get_scoring_context(coin_id, df, interval=interval, lookback=lookback)
+    indicator_df = context['indicator_df']
     if indicator_df.empty:
         return jsonify({'error': 'Not enough data to compute indicators'}), 500
     
-    correlation_matrix = compute_correlation_matrix(indicator_df)
-    
     # Align timestamps with indicator_df (drop rows removed by rolling calculations)
     aligned_prices = df.iloc[-len(indicator_df):].reset_index(drop=True)
     
-    hours_10_days = 10 * 24
-    history_len = min(len(indicator_df), hours_10_days)
-    start_idx = len(indicator_df) - history_len
-    
-    history = []
-    price_series = aligned_prices['price'].values
-    
-    for idx in range(start_idx, len(indicator_df)):
-        row = indicator_df.iloc[idx]
-        timestamp = aligned_prices.iloc[idx]['timestamp']
-        
-        current_values = row.to_dict()
+    if fit == 'full':
+        history_bars = max(1, days * 24 // INTERVAL_HOURS[interval])
+        history_len = min(len(indicator_df), history_bars)
+        start_idx = len(indicator_df) - history_len
         
-        # Approximate 5-period price change for volume signal context
-        if idx >= 5:
-            prev_price = price_series[idx - 5]
-            price_change = ((price_series[idx] - prev_price) / prev_price) * 100 if prev_price != 0 else 0
-        else:
-            price_change = 0
-        
-        methods = compute_all_methods(indicator_df, current_values, correlation_matrix, price_change)
-        
-        normalized_indicators = {
-            'RSI': float(normalize_indicator_to_signal(row['RSI'], 'RSI')),
-            'MACD': float(normalize_indicator_to_signal(row['MACD'], 'MACD')),
-            'Bollinger': float(normalize_indicator_to_signal(row['Bollinger'], 'Bollinger')),
-            'EMA': float(normalize_indicator_to_signal(row['EMA'], 'EMA')),
-            'Volume': float(normalize_indicator_to_signal(row['Volume'], 'Volume'))
-        }
+        values = indicator_df[INDICATORS].to_numpy(dtype=np.float64)
+        live = slice(start_idx, len(indicator_df))
         
+        # Normalized indicators and method scores for the whole window as array operations
+        normalized = normalize_indicators(values[live])
+        scores = compute_method_scores(values[live], context, methods)
+        timestamps = aligned_prices['timestamp'].iloc[live]
+    else:
+        timestamps, normalized, scores = walk_forward_history(
+            coin_id, interval, fit, window, lookback, indicator_df, aligned_prices['timestamp'], days
+        )
+    
+    history = []
+    for i, timestamp in enumerate(timestamps):
         history.append({
             'timestamp': timestamp.isoformat() if hasattr(timestamp, 'isoformat') else str(timestamp),
-            'indicators': normalized_indicators,
+            'indicators': {name: float(normalized[i, j]) for j, name in enumerate(INDICATORS)},
             'methods': {
-                'simple_weighted': methods['simple_weighted']['score'],
-                'correlation_adjusted': methods['correlation_adjusted']['score'],
-                'mahalanobis': methods['mahalanobis']['score'],
-                'pca_composite': methods['pca_composite']['score']
+                method: float(scores[method][i]) if np.isfinite(scores[method][i]) else None
+                for method in methods
             }
         })
     
     return jsonify({
         'coin': coin.upper(),
         'coin_id': coin_id,
+        'interval': interval,
+        'fit': fit,
+        'window': window,
+        'days': days,
         'history': history
     })
 
@@ -666,18 +756,25 @@ def indicator_history(coin):
 def get_price_history(coin):
     """Get historical price data for charting"""
     
-    coin_id = COIN_MAP.get(coin.upper(), coin.lower())
+    coin_id = resolve_coin(coin)
+    if coin_id is None:
+        return jsonify({'error': f'Unknown coin: {coin}'}), 404
+    try:
+        interval = parse_interval(request.args.get('interval'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Fetch historical data
-    df = get_historical_data(coin_id, days=30)
+    # Fetch historical data (hourly) and the bars at the requested interval
+    hourly = get_historical_data(coin_id, days=30)
     
-    if df is None or len(df) < 50:
+    if hourly is None or len(hourly) < 50:
         error_msg = 'Unable to fetch price history from CoinGecko API. '
-        if df is None:
+        if hourly is None:
             error_msg += 'This may be due to rate limiting. Please wait a moment and try again.'
         else:
             error_msg += 'Insufficient data received.'
         return jsonify({'error': error_msg}), 500
+    df = get_interval_data(coin_id, interval)
     
     # Prepare data for frontend
     price_data = []
@@ -692,32 +789,349 @@ def get_price_history(coin):
         else:
             timestamp_str = str(timestamp)
         
-        price_data.append({
+        point = {
             'timestamp': timestamp_str,
             'price': float(row['price']),
             'volume': float(row['volume'])
-        })
+        }
+        if interval != BASE_INTERVAL:
+            point.update({'open': float(row['open']), 'high': float(row['high']), 'low': float(row['low'])})
+        price_data.append(point)
     
     result = {
         'coin': coin.upper(),
         'coin_id': coin_id,
+        'interval': interval,
         'data_points': len(price_data),
         'period_days': 30,
         'price_history': price_data,
         'current_price': float(df['price'].iloc[-1]),
         'min_price': float(df['price'].min()),
         'max_price': float(df['price'].max()),
-        'price_change_24h': float(((df['price'].iloc[-1] - df['price'].iloc[-24]) / df['price'].iloc[-24] * 100) if len(df) >= 24 else 0)
+        'price_change_24h': float(((hourly['price'].iloc[-1] - hourly['price'].iloc[-24]) / hourly['price'].iloc[-24] * 100) if len(hourly) >= 24 else 0)
+    }
+    
+    return jsonify(result)
+
+@app.route('/api/portfolio/value', methods=['POST'])
+def portfolio_value():
+    """Value a portfolio of holdings from cached quotes and the price store"""
+    
+    body = request.get_json(silent=True) or {}
+    try:
+        symbols, quantities, cost_basis = parse_holdings(body.get('holdings'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    coin_ids = [resolve_coin(symbol) for symbol in symbols]
+    unknown = [symbol for symbol, coin_id in zip(symbols, coin_ids) if coin_id is None]
+    if unknown:
+        return jsonify({'error': f"Unknown coin: {', '.join(unknown)}"}), 400
+    
+    # Current prices from the batched quote cache, falling back to the last stored bar
+    quote_service.start()
+    quotes = quote_service.get_quotes(coin_ids)
+    prices = np.array([
+        quotes[c]['usd'] if c in quotes and 'usd' in quotes[c] else (price_store.last_price(c) or np.nan)
+        for c in coin_ids
+    ], dtype=np.float64)
+    
+    valuation = value_holdings(quantities, prices, cost_basis)
+    
+    result = {
+        'timestamp': datetime.now().isoformat(),
+        'total_value': valuation['total_value'],
+        'total_cost': valuation['total_cost'],
+        'total_pnl': valuation['total_pnl'],
+        'total_pnl_pct': valuation['total_pnl_pct'],
+        'positions': build_positions(symbols, coin_ids, quantities, cost_basis, prices, valuation),
+        'missing_prices': [s for s, p in zip(symbols, prices) if np.isnan(p)]
     }
     
+    # Historical value curve: one matrix-vector product over aligned price arrays
+    if body.get('history', True):
+        unique_ids, inverse = np.unique(coin_ids, return_inverse=True)
+        unique_quantities = np.bincount(inverse, weights=quantities)
+        for coin_id in unique_ids:
+            if price_store.get(coin_id) is None:
+                get_historical_data(coin_id, days=30)
+        
+        # Coins without stored history are left out of the curve and reported
+        has_history = np.array([price_store.get(c) is not None for c in unique_ids], dtype=bool)
+        curve_ids = [str(c) for c in unique_ids[has_history]]
+        grid, matrix = price_store.aligned(curve_ids) if curve_ids else (None, None)
+        if grid is None:
+            result['history'] = None
+        else:
+            curve, per_coin = value_curve(unique_quantities[has_history], matrix)
+            result['history'] = {
+                'timestamps': [ts.isoformat() for ts in grid],
+                'total_value': curve.tolist(),
+                'by_coin': {coin_id: per_coin[i].tolist() for i, coin_id in enumerate(curve_ids)},
+                'missing': [str(c) for c in unique_ids[~has_history]]
+            }
+    
     return jsonify(result)
 
+@app.route('/api/backtest', methods=['GET'])
+def backtest_methods():
+    """Walk-forward backtest of the composite scoring methods across coins"""
+    
+    symbols = [c.strip() for c in request.args.get('coins', 'BTC,ETH,SOL').split(',') if c.strip()]
+    methods = [m.strip() for m in request.args.get('methods', ','.join(BACKTEST_METHODS)).split(',') if m.strip()]
+    unknown = [m for m in methods if m not in BACKTEST_METHODS]
+    if unknown:
+        return jsonify({'error': f"Unknown methods: {', '.join(unknown)}"}), 400
+    
+    try:
+        fee_bps = float(request.args.get('fee_bps', 10))
+        min_history = int(request.args.get('min_history', 100))
+        window = int(request.args['window']) if request.args.get('window') else None
+    except ValueError:
+        return jsonify({'error': 'fee_bps, min_history and window must be numeric'}), 400
+    if min_history < WALK_FORWARD_MIN_HISTORY:
+        return jsonify({'error': f'min_history must be at least {WALK_FORWARD_MIN_HISTORY}'}), 400
+    if window is not None and window < 10:
+        return jsonify({'error': 'window must be at least 10'}), 400
+    long_only = request.args.get('long_only', 'false').lower() == 'true'
+    include_curves = request.args.get('curves', 'false').lower() == 'true'
+    
+    frames = {}
+    failed = []
+    for symbol in symbols:
+        coin_id = resolve_coin(symbol)
+        df = None if coin_id is None else get_historical_data(coin_id, days=30)
+        if df is None or len(df) <= min_history:
+            failed.append(symbol.upper())
+        else:
+            frames[symbol.upper()] = df
+    
+    if not frames:
+        return jsonify({'error': 'Unable to fetch enough data from CoinGecko API for a backtest.'}), 500
+    
+    result = run_backtest(frames, methods=methods, fee_bps=fee_bps,
+                          min_history=min_history, long_only=long_only, window=window)
+    summary = summarize(result, include_curves=include_curves)
+    summary['failed'] = failed
+    summary['timestamp'] = datetime.now().isoformat()
+    
+    return jsonify(summary)
+
+@app.route('/api/indicators', methods=['GET'])
+def batch_indicators():
+    """Latest indicators, signals and weighted score for several coins in one call"""
+    
+    symbols = [c.strip().upper() for c in request.args.get('coins', 'BTC,ETH,SOL').split(',') if c.strip()]
+    if not symbols:
+        return jsonify({'error': 'coins must list at least one coin'}), 400
+    
+    coin_ids = []
+    failed = []
+    for symbol in symbols:
+        coin_id = resolve_coin(symbol)
+        df = None if coin_id is None else get_historical_data(coin_id, days=30)
+        if df is None or len(df) < 50:
+            failed.append(symbol)
+        elif coin_id not in coin_ids:
+            coin_ids.append(coin_id)
+    
+    if not coin_ids:
+        return jsonify({'error': 'Unable to fetch data from CoinGecko API for any of the requested coins.'}), 500
+    
+    matrix = get_indicator_matrix(coin_ids)
+    latest = matrix['values'][:, -1, :]
+    signals = normalize_indicators(latest)
+    scores = signals @ np.array([SIMPLE_WEIGHTS[name] for name in INDICATORS])
+    
+    coins = {}
+    for i, coin_id in enumerate(coin_ids):
+        coins[coin_id] = {
+            'price': float(matrix['prices'][i, -1]),
+            'indicators': {name: float(latest[i, j]) for j, name in enumerate(INDICATORS)},
+            'signals': {name: float(signals[i, j]) for j, name in enumerate(INDICATORS)},
+            'score': float(scores[i]),
+            'recommendation': get_signal_description(float(scores[i])),
+            'filled_bars': int(matrix['filled'][i].sum())
+        }
+    
+    return jsonify({
+        'coins': coins,
+        'as_of': matrix['timestamps'][-1].isoformat(),
+        'failed': failed,
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/screener', methods=['GET'])
+def market_screener():
+    """
+    All tracked coins ranked by a method's score
+    ?method= simple_weighted (default), correlation_adjusted, mahalanobis, pca_composite or consensus
+    ?filter=RSI<30&filter=consensus.agreement==true, ?order=desc|asc, ?page=1&per_page=20
+    """
+    
+    method = request.args.get('method', 'simple_weighted')
+    if method not in COMPOSITE_METHODS + ['consensus']:
+        return jsonify({'error': f"Unknown method: {method}. Available: {', '.join(COMPOSITE_METHODS + ['consensus'])}"}), 400
+    order = request.args.get('order', 'desc').lower()
+    if order not in ('asc', 'desc'):
+        return jsonify({'error': 'order must be asc or desc'}), 400
+    try:
+        filters = parse_filters(request.args.getlist('filter'))
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 20))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if page < 1 or not 1 <= per_page <= 100:
+        return jsonify({'error': 'page must be >= 1 and per_page between 1 and 100'}), 400
+    
+    # Rows come from the background refresh and fetches elsewhere; this request never fetches
+    screener_table.start_refresh(refresh_screener, _screener_refresh_interval)
+    sort_by = 'consensus.score' if method == 'consensus' else method
+    total, rows = screener_table.query(filters, sort_by=sort_by, descending=(order == 'desc'),
+                                       offset=(page - 1) * per_page, limit=per_page)
+    
+    return jsonify({
+        'method': method,
+        'order': order,
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'pages': (total + per_page - 1) // per_page,
+        'results': rows,
+        'pending': sum(1 for coin_id in COIN_MAP.values() if screener_table.get(coin_id) is None),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/alerts', methods=['GET'])
+def list_alert_rules():
+    """Registered alert rules"""
+    return jsonify({'rules': alert_engine.rules()})
+
+@app.route('/api/alerts', methods=['POST'])
+def create_alert_rule():
+    """
+    Register an alert rule
+    Body: {"coin": "BTC" or "*", "condition": "RSI<30" | "MACD>0" | "recommendation changes",
+           "sink": "queue" (default) or "webhook", "url": webhook URL}
+    """
+    payload = request.get_json(silent=True) or {}
+    coin = str(payload.get('coin', '')).strip()
+    condition = str(payload.get('condition', '')).strip()
+    if not coin or not condition:
+        return jsonify({'error': 'coin and condition are required'}), 400
+    coin_id = WILDCARD if coin == WILDCARD else resolve_coin(coin)
+    if coin_id is None:
+        return jsonify({'error': f'Unknown coin: {coin}'}), 404
+    
+    try:
+        rule = alert_engine.add_rule(coin_id, condition, sink=payload.get('sink', 'queue'), url=payload.get('url'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    alert_engine.start_polling(poll_alerts, _alert_poll_interval)
+    return jsonify(rule), 201
+
+@app.route('/api/alerts/<rule_id>', methods=['DELETE'])
+def delete_alert_rule(rule_id):
+    """Remove an alert rule"""
+    if not alert_engine.remove_rule(rule_id):
+        return jsonify({'error': f"Unknown rule: {rule_id}"}), 404
+    return jsonify({'deleted': rule_id})
+
+@app.route('/api/alerts/events', methods=['GET'])
+def alert_events():
+    """Alerts delivered to the queue sink; ?since=<last seen id>&limit=100"""
+    try:
+        since = int(request.args.get('since', 0))
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'error': 'since and limit must be integers'}), 400
+    return jsonify({'events': alert_engine.events(since, limit)})
+
+@app.route('/api/cross-correlation', methods=['GET'])
+def cross_asset_correlation():
+    """Pearson and Spearman correlation of hourly log returns across coins"""
+    
+    # Default: every coin already held in the price store
+    default_coins = ','.join(price_store.coins()) if len(price_store.coins()) >= 2 else 'BTC,ETH,SOL'
+    symbols = [c.strip() for c in request.args.get('coins', default_coins).split(',') if c.strip()]
+    try:
+        window = int(request.args['window']) if request.args.get('window') else None
+        top_k = int(request.args.get('top', 10))
+        threshold = float(request.args.get('threshold', 0))
+    except ValueError:
+        return jsonify({'error': 'window, top and threshold must be numeric'}), 400
+    if window is not None and window < 10:
+        return jsonify({'error': 'window must be at least 10'}), 400
+    
+    coin_ids = []
+    failed = []
+    for symbol in symbols:
+        coin_id = resolve_coin(symbol)
+        if coin_id is None or get_historical_data(coin_id, days=30) is None:
+            failed.append(symbol.upper())
+        elif coin_id not in coin_ids:
+            coin_ids.append(coin_id)
+    
+    if len(coin_ids) < 2:
+        return jsonify({'error': 'Need price data for at least two coins to correlate.', 'failed': failed}), 400
+    
+    result = get_cross_correlation(coin_ids, window)
+    if result is None:
+        return jsonify({'error': 'The requested coins have no overlapping price history.'}), 500
+    
+    return jsonify({
+        'coins': coin_ids,
+        'window': window,
+        'observations': result['observations'],
+        'as_of': result['as_of'],
+        'pearson': matrix_to_dict(result['pearson'], coin_ids),
+        'spearman': matrix_to_dict(result['spearman'], coin_ids),
+        'strongest_pairs': {
+            'pearson': strongest_pairs(result['pearson'], coin_ids, threshold, top_k, keys=('coin1', 'coin2')),
+            'spearman': strongest_pairs(result['spearman'], coin_ids, threshold, top_k, keys=('coin1', 'coin2'))
+        },
+        'failed': failed,
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/coins/search', methods=['GET'])
+def search_coins():
+    """
+    Coin autocomplete from the local coin index (no upstream call)
+    Query: q (symbol or name prefix), limit (default 10, max 50)
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    return jsonify({
+        'query': query,
+        'results': coin_index.search(query, limit=limit),
+        'indexed': len(coin_index)
+    })
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'ok', 'timestamp': datetime.now().isoformat()})
+    return jsonify({
+        'status': 'ok',
+        'timestamp': datetime.now().isoformat(),
+        'upstream': upstream.breaker_status()
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Process metrics (upstream calls, connection reuse, cache hits)"""
+    return jsonify(metrics.snapshot())
 
 if __name__ == '__main__':
+    # Turn SIGTERM into a normal exit so the shutdown snapshot is written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     print("Starting Crypto Analysis API Server...")
     print("Available at: http://localhost:8000")
     app.run(debug=True, port=8000)
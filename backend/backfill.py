@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Long-History Backfill
+Pulls multi-year hourly history per coin from CoinGecko's market_chart/range endpoint
+in 90-day chunks (the longest span served at hourly granularity), respecting the rate
+limit, and stores it compactly on disk for the API's price store.
+
+Storage: one .npz file per coin with the first timestamp, int32 millisecond deltas
+(delta-encoded timestamps) and float32 prices and volumes, about 12 bytes per bar.
+The file is rewritten after every chunk, so an interrupted run resumes where it
+stopped. Only the missing tail, internal gaps and head of the history are requested
+(the head newest-first, so the stored span stays contiguous) and overlapping bars are
+deduplicated, so re-running is idempotent.
+
+Usage:
+    python backfill.py --coins bitcoin,ethereum --days 730
+    COINGECKO_BASE_URL=http://localhost:8900/api/v3 COINGECKO_MIN_INTERVAL=0 python backfill.py
+
+app.py loads every file in PRICE_HISTORY_DIR (default backend/data/history) into its
+price store at startup.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import upstream
+from upstream import BASE_URL
+
+HISTORY_DIR = os.environ.get(
+    'PRICE_HISTORY_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'history')
+)
+
+# market_chart/range is hourly for spans of up to 90 days
+CHUNK_DAYS = 90
+DAY_MS = 24 * 3600 * 1000
+HOUR_MS = 3600 * 1000
+# Holes in stored history longer than this are refetched (upstream skips the odd hour)
+MAX_GAP_MS = 6 * HOUR_MS
+# market_chart/range returns 5-minute bars for spans within a day, so every chunk spans
+# at least this much (starting earlier; the overlap is deduplicated on merge)
+MIN_CHUNK_MS = DAY_MS + HOUR_MS
+
+
+def history_path(coin_id, directory=HISTORY_DIR):
+    """File holding a coin's backfilled history"""
+    return os.path.join(directory, f"{coin_id}.npz")
+
+
+def save_history(path, df):
+    """Write a price DataFrame as delta-encoded timestamps and float32 columns (atomic)"""
+    ms = df['timestamp'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    deltas = np.diff(ms)
+    # Gaps longer than ~24 days do not fit int32 milliseconds
+    delta_dtype = np.int32 if len(deltas) == 0 or deltas.max() < 2 ** 31 else np.int64
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp.npz'
+    np.savez(
+        tmp_path,
+        t0=np.int64(ms[0]),
+        deltas=deltas.astype(delta_dtype),
+        price=df['price'].to_numpy(dtype=np.float32),
+        volume=df['volume'].to_numpy(dtype=np.float32)
+    )
+    os.replace(tmp_path, path)
+
+
+def load_history(path):
+    """Read a file written by save_history back into a timestamp/price/volume DataFrame"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        ms = np.concatenate([[data['t0']], data['t0'] + np.cumsum(data['deltas'], dtype=np.int64)])
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(ms, unit='ms'),
+            'price': data['price'].astype(np.float64),
+            'volume': data['volume'].astype(np.float64)
+        })
+
+
+def merge_history(existing, new):
+    """Union of two series by timestamp (new rows win), sorted"""
+    if existing is None or len(existing) == 0:
+        return new.reset_index(drop=True)
+    merged = pd.concat([existing, new], ignore_index=True)
+    merged = merged.drop_duplicates('timestamp', keep='last')
+    return merged.sort_values('timestamp').reset_index(drop=True)
+
+
+def fetch_range(coin_id, start_ms, end_ms, max_retries=5, retry_delay=2.0):
+    """One market_chart/range request; retries 429s with linear backoff. Returns a DataFrame."""
+    url = f"{BASE_URL}/coins/{coin_id}/market_chart/range"
+    params = {'vs_currency': 'usd', 'from': start_ms // 1000, 'to': end_ms // 1000}
+
+    for attempt in range(max_retries):
+        try:
+            response = upstream.get(url, params=params, timeout=30)
+        except upstream.CircuitOpenError as e:
+            # The CLI can afford to wait out the breaker instead of failing the chunk
+            if attempt == max_retries - 1:
+                raise
+            print(f"Upstream backing off. Waiting {e.retry_in:.0f} seconds before retry {attempt + 1}/{max_retries}...")
+            time.sleep(max(e.retry_in, retry_delay))
+            continue
+        if response.status_code == 429 and attempt < max_retries - 1:
+            wait_time = retry_delay * (attempt + 1)
+            print(f"Rate limit hit (429). Waiting {wait_time:.0f} seconds before retry {attempt + 1}/{max_retries}...")
+            time.sleep(wait_time)
+            continue
+        response.raise_for_status()
+        data = response.json()
+        df = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
+        df['volume'] = [v[1] for v in data['total_volumes']]
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+
+
+def plan_chunks(start_ms, end_ms, existing=None, chunk_days=CHUNK_DAYS):
+    """
+    (start, end) chunks still to fetch: the tail, then internal gaps, then the head
+    With history on disk only the missing tail (after its last bar), gaps longer than
+    MAX_GAP_MS and head (before its first bar) are fetched, so a rerun costs one request
+    per coin when up to date. Head chunks go newest-first, so an interrupted run leaves
+    a shorter but contiguous history, and a hole left by any other interruption is
+    planned as a gap on the next run. Chunks shorter than MIN_CHUNK_MS (the tail of an
+    up-to-date rerun, short gaps) start earlier so upstream still serves hourly bars.
+    """
+    def split(span_start, span_end):
+        chunks = []
+        while span_start < span_end:
+            chunk_end = min(span_start + chunk_days * DAY_MS, span_end)
+            chunks.append((min(span_start, chunk_end - MIN_CHUNK_MS), chunk_end))
+            span_start = chunk_end
+        return chunks
+
+    if existing is None or len(existing) == 0:
+        return split(start_ms, end_ms)[::-1]
+
+    ms = existing['timestamp'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    chunks = split(max(int(ms[-1]), start_ms), end_ms)
+    gaps = np.flatnonzero(np.diff(ms) > MAX_GAP_MS)
+    for i in gaps:
+        if ms[i + 1] > start_ms:
+            chunks += split(max(int(ms[i]), start_ms), int(ms[i + 1]))
+    if start_ms < ms[0] - HOUR_MS:
+        chunks += split(start_ms, int(ms[0]))[::-1]
+    return chunks
+
+
+def backfill_coin(coin_id, days, directory=HISTORY_DIR, chunk_days=CHUNK_DAYS, min_interval=1.2):
+    """
+    Fetch up to `days` of hourly history for one coin, resuming from what is on disk
+    Returns stats: requests, new bars, total bars, bytes on disk and seconds.
+    """
+    path = history_path(coin_id, directory)
+    existing = load_history(path)
+    bars_before = 0 if existing is None else len(existing)
+
+    end_ms = int(time.time() * 1000)
+    start_ms = end_ms - int(days * DAY_MS)
+    chunks = plan_chunks(start_ms, end_ms, existing, chunk_days)
+
+    start = time.time()
+    last_request = 0.0
+    requests_made = 0
+    for chunk_start, chunk_end in chunks:
+        wait = min_interval - (time.time() - last_request)
+        if wait > 0:
+            time.sleep(wait)
+        last_request = time.time()
+        df = fetch_range(coin_id, chunk_start, chunk_end)
+        requests_made += 1
+        if df is None or df.empty:
+            continue
+        # Persist after every chunk so an interrupted run resumes here
+        existing = merge_history(existing, df)
+        save_history(path, existing)
+
+    total = 0 if existing is None else len(existing)
+    return {
+        'coin': coin_id,
+        'requests': requests_made,
+        'new_bars': total - bars_before,
+        'bars': total,
+        'bytes': os.path.getsize(path) if os.path.exists(path) else 0,
+        'seconds': time.time() - start
+    }
+
+
+def load_into_store(store, directory=HISTORY_DIR):
+    """Put every backfilled series into a PriceStore; returns the coin ids loaded"""
+    if not os.path.isdir(directory):
+        return []
+    loaded = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.npz') or filename.endswith('.tmp.npz'):
+            continue
+        coin_id = filename[:-len('.npz')]
+        df = load_history(os.path.join(directory, filename))
+        if df is not None and len(df):
+            store.put(coin_id, df)
+            loaded.append(coin_id)
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill long hourly price history from CoinGecko')
+    parser.add_argument('--coins', default='bitcoin,ethereum,solana', help='Comma-separated CoinGecko ids')
+    parser.add_argument('--days', type=float, default=365, help='History to keep, in days back from now')
+    parser.add_argument('--chunk-days', type=int, default=CHUNK_DAYS, help='Days per request (hourly up to 90)')
+    parser.add_argument('--out', default=HISTORY_DIR, help='Directory for the .npz files')
+    parser.add_argument('--min-interval', type=float,
+                        default=float(os.environ.get('COINGECKO_MIN_INTERVAL', 1.2)),
+                        help='Minimum seconds between requests')
+    args = parser.parse_args()
+
+    coins = [c.strip() for c in args.coins.split(',') if c.strip()]
+    print(f"Backfilling {args.days:g} days for {len(coins)} coins into {args.out}")
+
+    start = time.time()
+    totals = {'requests': 0, 'new_bars': 0, 'bytes': 0}
+    for coin_id in coins:
+        try:
+            stats = backfill_coin(coin_id, args.days, args.out, args.chunk_days, args.min_interval)
+        except Exception as e:
+            print(f"❌ {coin_id}: {e} (rerun to resume)")
+            continue
+        rate = stats['new_bars'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        print(f"✅ {coin_id}: {stats['new_bars']} new bars ({stats['bars']} total) in {stats['requests']} requests, "
+              f"{stats['seconds']:.1f}s, {rate:.0f} bars/s, {stats['bytes'] / 1024:.0f} KiB")
+        for key in totals:
+            totals[key] += stats[key]
+
+    elapsed = time.time() - start
+    print(f"⏱️  {totals['new_bars']} new bars in {totals['requests']} requests, {elapsed:.1f}s "
+          f"({totals['new_bars'] / elapsed if elapsed > 0 else 0:.0f} bars/s, "
+          f"{totals['requests'] / elapsed if elapsed > 0 else 0:.2f} requests/s), "
+          f"{totals['bytes'] / 1024:.0f} KiB on disk")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Backtester for the Composite Scoring Methods
+Evaluates simple_weighted, correlation_adjusted, mahalanobis and pca_composite as
+trading signals without recomputing compute_all_methods bar by bar.
+
+For every bar t the models (correlation matrix, covariance, scaler, PCA) are fitted on
+indicator rows 0..t only (expanding window, no lookahead), or on the last `window` rows
+with --window. See walk_forward.py for the fitting kernels.
+
+Signals become positions through the get_signal_description bands, the position held
+after bar t earns the return from t to t+1, and returns, drawdown and turnover are
+computed for all coins and methods at once on a methods x coins x time array.
+
+Usage:
+    python backtest.py --coins bitcoin,ethereum,solana --days 30 --fee-bps 10
+    python backtest.py --coins bitcoin --window 240 --check 10   # compare with fresh fits
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from correlation_analysis import (
+    compute_indicator_time_series,
+    SIGNAL_THRESHOLD,
+    STRONG_SIGNAL_THRESHOLD
+)
+from walk_forward import METHODS, MIN_HISTORY, check_against_live, walk_forward_signals
+
+# Position size for each get_signal_description band
+POSITION_SIZES = {
+    'STRONG BUY': 1.0,
+    'BUY': 0.5,
+    'HOLD': 0.0,
+    'SELL': -0.5,
+    'STRONG SELL': -1.0
+}
+
+
+def signals_to_positions(scores, long_only=False, thresholds=None):
+    """
+    Map scores to position sizes through the get_signal_description bands
+    thresholds: optional (signal, strong) cutoffs, defaults to (0.2, 0.6)
+    """
+    weak, strong = thresholds or (SIGNAL_THRESHOLD, STRONG_SIGNAL_THRESHOLD)
+    scores = np.nan_to_num(scores, nan=0.0)
+    positions = np.select(
+        [scores >= strong,
+         scores >= weak,
+         scores <= -strong,
+         scores <= -weak],
+        [POSITION_SIZES['STRONG BUY'],
+         POSITION_SIZES['BUY'],
+         POSITION_SIZES['STRONG SELL'],
+         POSITION_SIZES['SELL']],
+        default=POSITION_SIZES['HOLD']
+    )
+    if long_only:
+        positions = np.maximum(positions, 0.0)
+    return positions
+
+
+def prepare_coin(df, min_history=100, window=None):
+    """Indicators, aligned prices and walk-forward signals for one coin"""
+    indicator_df = compute_indicator_time_series(df)
+    aligned = df.iloc[-len(indicator_df):].reset_index(drop=True)
+    return {
+        'timestamps': aligned['timestamp'].values,
+        'prices': aligned['price'].to_numpy(dtype=np.float64),
+        'signals': walk_forward_signals(indicator_df, min_history=min_history, window=window)
+    }
+
+
+def infer_bars_per_year(timestamps):
+    """Infer bar frequency from the median timestamp spacing"""
+    if len(timestamps) < 2:
+        return 365 * 24
+    step = np.median(np.diff(timestamps).astype('timedelta64[s]').astype(np.float64))
+    return 365 * 24 * 3600 / step if step > 0 else 365 * 24
+
+
+def compute_performance(prices, positions, fee_bps=10.0, bars_per_year=365 * 24):
+    """
+    Performance of positions on a (methods, coins, T) grid against prices (coins, T)
+    NaN-padded bars (coins with shorter history) are treated as flat with zero return.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.zeros_like(prices)
+        returns[:, :-1] = prices[:, 1:] / prices[:, :-1] - 1.0
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+    valid = ~np.isnan(prices)
+
+    positions = np.where(valid[None], positions, 0.0)
+    trades = np.abs(np.diff(positions, axis=-1, prepend=0.0))
+    strategy = positions * returns[None] - trades * fee_bps / 10000.0
+
+    equity = np.cumprod(1.0 + strategy, axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1.0
+
+    n_bars = valid.sum(axis=-1)[None]
+    mean = strategy.sum(axis=-1) / np.maximum(n_bars, 1)
+    var = ((strategy - mean[..., None]) ** 2 * valid[None]).sum(axis=-1) / np.maximum(n_bars - 1, 1)
+    std = np.sqrt(var)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(bars_per_year), 0.0)
+
+    return {
+        'total_return': equity[..., -1] - 1.0,
+        'max_drawdown': drawdown.min(axis=-1),
+        'sharpe': sharpe,
+        'turnover': trades.sum(axis=-1),
+        'trades': (trades > 0).sum(axis=-1),
+        'exposure': (np.abs(positions) > 0).sum(axis=-1) / np.maximum(n_bars, 1),
+        'equity': equity,
+        'drawdown': drawdown
+    }
+
+
+def run_backtest(frames, methods=None, fee_bps=10.0, min_history=100, long_only=False, window=None,
+                 max_workers=None):
+    """
+    Backtest the composite methods on several coins
+    frames: {coin: DataFrame with timestamp, price, volume}
+    Returns a dict with coins, methods, timestamps, positions and performance arrays.
+    """
+    methods = methods or METHODS
+    coins = list(frames.keys())
+
+    # Per-coin signal generation is NumPy-bound, so threads run it in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        prepared = list(pool.map(lambda c: prepare_coin(frames[c], min_history, window), coins))
+
+    T = max(len(p['prices']) for p in prepared)
+    prices = np.full((len(coins), T), np.nan)
+    positions = np.zeros((len(methods), len(coins), T))
+    timestamps = []
+    for c, p in enumerate(prepared):
+        length = len(p['prices'])
+        prices[c, :length] = p['prices']
+        timestamps.append(p['timestamps'])
+        for m, method in enumerate(methods):
+            positions[m, c, :length] = signals_to_positions(p['signals'][method], long_only=long_only)
+
+    bars_per_year = infer_bars_per_year(max(timestamps, key=len))
+    performance = compute_performance(prices, positions, fee_bps=fee_bps, bars_per_year=bars_per_year)
+
+    # Buy-and-hold benchmark over the same live window
+    hold = np.zeros((1, len(coins), T))
+    hold[:, :, min_history:] = 1.0
+    benchmark = compute_performance(prices, hold, fee_bps=0.0, bars_per_year=bars_per_year)
+
+    return {
+        'coins': coins,
+        'methods': methods,
+        'timestamps': timestamps,
+        'positions': positions,
+        'signals': {coin: p['signals'] for coin, p in zip(coins, prepared)},
+        'performance': performance,
+        'benchmark': benchmark,
+        'settings': {'fee_bps': fee_bps, 'min_history': min_history, 'long_only': long_only,
+                     'fit': 'rolling' if window else 'expanding', 'window': window}
+    }
+
+
+def summarize(result, include_curves=False):
+    """JSON-ready summary: metrics per method and coin plus cross-coin averages"""
+    perf = result['performance']
+    bench = result['benchmark']
+    metric_names = ['total_return', 'max_drawdown', 'sharpe', 'turnover', 'trades', 'exposure']
+
+    summary = {'settings': result['settings'], 'methods': {}, 'buy_and_hold': {}}
+    for m, method in enumerate(result['methods']):
+        per_coin = {}
+        for c, coin in enumerate(result['coins']):
+            per_coin[coin] = {name: float(perf[name][m, c]) for name in metric_names}
+            if include_curves:
+                length = len(result['timestamps'][c])
+                per_coin[coin]['equity'] = perf['equity'][m, c, :length].tolist()
+        summary['methods'][method] = {
+            'average': {name: float(np.mean(perf[name][m])) for name in metric_names},
+            'coins': per_coin
+        }
+    for c, coin in enumerate(result['coins']):
+        summary['buy_and_hold'][coin] = {
+            'total_return': float(bench['total_return'][0, c]),
+            'max_drawdown': float(bench['max_drawdown'][0, c])
+        }
+    return summary
+
+
+def print_summary(summary):
+    """Print a method x coin table"""
+    print("\n" + "="*78)
+    print("WALK-FORWARD BACKTEST")
+    print("="*78)
+    print(f"{'method':<22}{'coin':<16}{'return':>10}{'max DD':>10}{'sharpe':>9}{'turnover':>10}")
+    print("-"*78)
+    for method, data in summary['methods'].items():
+        for coin, m in data['coins'].items():
+            print(f"{method:<22}{coin:<16}{m['total_return']:>+10.2%}{m['max_drawdown']:>10.2%}"
+                  f"{m['sharpe']:>9.2f}{m['turnover']:>10.1f}")
+        a = data['average']
+        print(f"{method:<22}{'(average)':<16}{a['total_return']:>+10.2%}{a['max_drawdown']:>10.2%}"
+              f"{a['sharpe']:>9.2f}{a['turnover']:>10.1f}")
+        print("-"*78)
+    for coin, b in summary['buy_and_hold'].items():
+        print(f"{'buy_and_hold':<22}{coin:<16}{b['total_return']:>+10.2%}{b['max_drawdown']:>10.2%}")
+    print("="*78)
+
+
+def main():
+    # Imported here so the API can use this module without the CLI's chart dependencies
+    from crypto_correlation_analysis import get_historical_data
+
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of the composite scoring methods')
+    parser.add_argument('--coins', default='bitcoin,ethereum,solana', help='Comma-separated CoinGecko ids')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--methods', default=','.join(METHODS))
+    parser.add_argument('--fee-bps', type=float, default=10.0, help='Cost per unit of turnover in basis points')
+    parser.add_argument('--min-history', type=int, default=100, help='Bars before the first model fit')
+    parser.add_argument('--long-only', action='store_true', help='Clamp short positions to flat')
+    parser.add_argument('--window', type=int, default=None,
+                        help='Fit models on a rolling window of this many bars (default: expanding)')
+    parser.add_argument('--json', dest='json_out', default=None, help='Write the summary to this JSON file')
+    parser.add_argument('--check', type=int, default=0, metavar='N',
+                        help='Also compare N bars per coin with compute_all_methods refitted on each bar')
+    args = parser.parse_args()
+
+    if args.min_history < MIN_HISTORY:
+        parser.error(f"--min-history must be at least {MIN_HISTORY}")
+    methods = [m.strip() for m in args.methods.split(',') if m.strip()]
+    unknown = [m for m in methods if m not in METHODS]
+    if unknown:
+        parser.error(f"Unknown methods: {', '.join(unknown)}")
+
+    frames = {}
+    for coin_id in [c.strip() for c in args.coins.split(',') if c.strip()]:
+        df = get_historical_data(coin_id, days=args.days)
+        if df is not None:
+            frames[coin_id] = df
+    if not frames:
+        print("❌ No data fetched. Exiting.")
+        return
+
+    if args.check:
+        for coin_id, df in frames.items():
+            indicator_df = compute_indicator_time_series(df)
+            bars = np.unique(np.linspace(args.min_history, len(indicator_df) - 1, args.check).astype(int))
+            worst = check_against_live(indicator_df, bars, min_history=args.min_history, window=args.window)
+            status = '✅' if max(worst.values()) < 1e-9 else '❌'
+            print(f"{status} {coin_id}: largest difference vs compute_all_methods over {len(bars)} bars: "
+                  + ', '.join(f"{method} {diff:.1e}" for method, diff in worst.items()))
+
+    start = time.time()
+    result = run_backtest(frames, methods=methods, fee_bps=args.fee_bps,
+                          min_history=args.min_history, long_only=args.long_only, window=args.window)
+    summary = summarize(result)
+    print(f"⏱️  Backtest: {time.time() - start:.3f}s for {len(frames)} coins x {len(methods)} methods")
+    print_summary(summary)
+
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Summary written to {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Signal Chart Rendering
+Headless rendering of the per-coin signal bar chart drawn by the analysis CLI.
+
+matplotlib is imported only when a chart is actually rendered, and only through its
+object API (Figure + the Agg canvas), so no GUI backend or pyplot state is involved.
+Every chart has the same rows, so each process builds one figure template (axes, tick
+labels, legend, grid) and a chart only updates bar widths, colours, value labels and
+the title. Many coins are rendered in a process pool. A manifest in the output
+directory records the data version each chart was drawn from, so charts of unchanged
+coins are skipped.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from correlation_analysis import INDICATORS, get_signal_description
+
+MANIFEST_FILE = 'charts.json'
+
+# (results key, label) of the composite methods, in chart order
+CHART_METHODS = [
+    ('simple_weighted', 'Simple Weighted'),
+    ('correlation_adjusted', 'Correlation-Adjusted'),
+    ('mahalanobis', 'Mahalanobis'),
+    ('pca_composite', 'PCA Composite')
+]
+
+CHART_FACTORS = [
+    ('PC1', 'PCA Factor 1 (Momentum)'),
+    ('PC2', 'PCA Factor 2 (Volatility)'),
+    ('PC3', 'PCA Factor 3 (Trend)')
+]
+
+DEFAULT_TITLE = 'Crypto Trading Signals - All Methods Comparison'
+
+# Figure template of this process, built on first use
+_template = None
+
+
+def _color(value):
+    return 'green' if value > 0 else 'red' if value < 0 else 'gray'
+
+
+def chart_rows(all_results):
+    """(label, value, recommendation, colour) per bar from compute_all_methods output"""
+    rows = []
+    individual = all_results['individual_signals']
+    for indicator in INDICATORS:
+        signal = individual.get(indicator, 0)
+        rows.append((indicator, float(signal), get_signal_description(signal), _color(signal)))
+
+    for key, label in CHART_METHODS:
+        score = all_results[key]['score']
+        rows.append((label, float(score), get_signal_description(score), _color(score)))
+
+    # PCA factors, scaled down for display
+    factors = all_results['pca_composite']['factors']
+    for key, label in CHART_FACTORS:
+        value = factors[key]
+        rows.append((label, float(value) / 10, 'POSITIVE' if value > 0 else 'NEGATIVE',
+                     'green' if value > 0 else 'red'))
+    return rows
+
+
+def data_version(df):
+    """Short digest of a price DataFrame; charts are redrawn only when it changes"""
+    digest = hashlib.sha1()
+    digest.update(df['timestamp'].to_numpy(dtype='datetime64[ms]').tobytes())
+    digest.update(df['price'].to_numpy(dtype='float64').tobytes())
+    digest.update(df['volume'].to_numpy(dtype='float64').tobytes())
+    return digest.hexdigest()[:16]
+
+
+class _ChartTemplate:
+    """Figure with the fixed parts of the signal chart; render() fills in one coin"""
+
+    def __init__(self, labels):
+        # Lazy import: the Agg canvas and Figure need no GUI backend
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Patch
+
+        self.labels = tuple(labels)
+        self.fig = Figure(figsize=(12, 10))
+        FigureCanvasAgg(self.fig)
+        ax = self.fig.add_subplot()
+
+        y_pos = range(len(labels))
+        self.bars = ax.barh(y_pos, [0.0] * len(labels), color='gray', alpha=0.7,
+                            edgecolor='black', linewidth=0.5)
+        self.texts = [
+            ax.text(0, bar.get_y() + bar.get_height() / 2, '', va='center', fontsize=9,
+                    fontweight='bold', visible=False)
+            for bar in self.bars
+        ]
+
+        ax.axvline(x=0, color='black', linestyle='--', linewidth=1, alpha=0.5)
+        ax.set_yticks(list(y_pos))
+        ax.set_yticklabels(labels)
+        ax.set_xlabel('Signal Strength (BUY ← → SELL)', fontsize=12, fontweight='bold')
+        self.title = ax.set_title(DEFAULT_TITLE, fontsize=14, fontweight='bold', pad=20)
+        ax.set_xlim(-1.1, 1.1)
+        ax.grid(axis='x', alpha=0.3, linestyle='--')
+        ax.legend(handles=[
+            Patch(color='green', label='BUY Signal', alpha=0.7),
+            Patch(color='red', label='SELL Signal', alpha=0.7),
+            Patch(color='gray', label='HOLD Signal', alpha=0.7)
+        ], loc='upper right')
+        self.fig.tight_layout()
+
+    def render(self, rows, output_file, title=DEFAULT_TITLE, dpi=300):
+        for bar, text, (_, value, recommendation, color) in zip(self.bars, self.texts, rows):
+            bar.set_width(value)
+            bar.set_facecolor(color)
+            # Only label bars that are visible
+            text.set_visible(abs(value) > 0.05)
+            text.set_x(value + (0.05 if value > 0 else -0.05))
+            text.set_horizontalalignment('left' if value > 0 else 'right')
+            text.set_text(f'{value:.3f} ({recommendation})')
+        self.title.set_text(title)
+        self.fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
+
+
+def render_signal_chart(rows, output_file, title=DEFAULT_TITLE, dpi=300):
+    """Draw one signal chart (rows from chart_rows) to a PNG with this process's template"""
+    global _template
+    labels = tuple(label for label, _, _, _ in rows)
+    if _template is None or _template.labels != labels:
+        _template = _ChartTemplate(labels)
+    _template.render(rows, output_file, title=title, dpi=dpi)
+    return output_file
+
+
+def _render_job(job):
+    """Process pool worker: render one job, return (coin, seconds)"""
+    start = time.perf_counter()
+    render_signal_chart(job['rows'], job['path'], title=job['title'], dpi=job['dpi'])
+    return job['coin'], time.perf_counter() - start
+
+
+def load_manifest(output_dir):
+    """{coin: {'version', 'file'}} of the charts already in output_dir"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def render_charts(jobs, output_dir, workers=None, dpi=150):
+    """
+    Render signal charts for many coins, skipping coins whose data version is unchanged
+    jobs: [{'coin', 'version', 'rows', 'title' (optional)}]
+    workers: process count (default: CPU count); 1 renders in this process
+    Returns {'files': {coin: path}, 'rendered': [coins], 'skipped': [coins], 'seconds'}.
+    """
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+
+    todo = []
+    files = {}
+    skipped = []
+    for job in jobs:
+        path = os.path.join(output_dir, f"{job['coin']}_signals.png")
+        files[job['coin']] = path
+        entry = manifest.get(job['coin'], {})
+        if entry.get('version') == job['version'] and os.path.exists(path):
+            skipped.append(job['coin'])
+            continue
+        todo.append({
+            'coin': job['coin'],
+            'rows': job['rows'],
+            'title': job.get('title', DEFAULT_TITLE),
+            'path': path,
+            'dpi': dpi
+        })
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = [coin for coin, _ in pool.map(_render_job, todo)]
+    else:
+        rendered = [_render_job(job)[0] for job in todo]
+
+    versions = {job['coin']: job['version'] for job in jobs}
+    for coin in rendered:
+        manifest[coin] = {'version': versions[coin], 'file': os.path.basename(files[coin])}
+    tmp_path = os.path.join(output_dir, MANIFEST_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(output_dir, MANIFEST_FILE))
+
+    return {'files': files, 'rendered': rendered, 'skipped': skipped, 'seconds': time.perf_counter() - start}
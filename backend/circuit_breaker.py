@@ -0,0 +1,137 @@
+"""
+Circuit Breaker and Negative Cache
+Keeps request threads from hammering an upstream endpoint that is rate limiting or down.
+
+A breaker counts consecutive failures (timeouts, connection errors, 5xx). After
+`failure_threshold` of them, or on any 429, it opens: calls fail immediately with
+CircuitOpenError for `reset_timeout` seconds (or the server's Retry-After). After that
+one caller is let through as a half-open probe. If the probe succeeds the breaker
+closes; if it fails the breaker opens again, with the open period doubling up to
+`max_reset_timeout`.
+
+NegativeCache remembers failed or unknown keys for a short TTL so they are not refetched
+on every request.
+"""
+
+import threading
+import time
+
+import requests
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"circuit open for {name}, retry in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one upstream endpoint"""
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0, max_reset_timeout=300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go out now (claims the half-open probe)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            now = time.time()
+            if self._state == OPEN and now >= self._opened_until:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            retry_in = max(self._opened_until - now, 0.0)
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self):
+        """A call completed normally: close the breaker"""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trips = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, retry_after=None, trip=False):
+        """
+        A call failed; opens the breaker at the threshold, on a failed probe or when trip is set
+        retry_after (seconds, e.g. from a 429) overrides the computed open period.
+        Returns True if the breaker opened.
+        """
+        with self._lock:
+            self._failures += 1
+            if not (trip or self._state == HALF_OPEN or self._failures >= self.failure_threshold):
+                return False
+            self._trips += 1
+            timeout = min(self.reset_timeout * 2 ** (self._trips - 1), self.max_reset_timeout)
+            if retry_after is not None:
+                timeout = max(retry_after, 0.0)
+            self._state = OPEN
+            self._opened_until = time.time() + timeout
+            self._probe_in_flight = False
+            return True
+
+    def status(self):
+        """State, consecutive failures and seconds until the next probe"""
+        with self._lock:
+            state = self._state
+            if state == OPEN and time.time() >= self._opened_until:
+                state = HALF_OPEN
+            return {
+                'state': state,
+                'failures': self._failures,
+                'retry_in': max(self._opened_until - time.time(), 0.0) if state == OPEN else 0.0
+            }
+
+
+class NegativeCache:
+    """Keys that recently failed, each with a reason and an expiry"""
+
+    def __init__(self, ttl=30.0):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def put(self, key, reason, ttl=None):
+        """Remember a failure for ttl seconds (default self.ttl)"""
+        with self._lock:
+            self._entries[key] = (time.time() + (self.ttl if ttl is None else ttl), reason)
+
+    def get(self, key):
+        """Reason for a still-remembered failure, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry[0]:
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def discard(self, key):
+        """Forget a key (e.g. after a successful fetch)"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        with self._lock:
+            now = time.time()
+            return sum(1 for expires, _ in self._entries.values() if expires > now)
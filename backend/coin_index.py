@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Coin Universe Index
+Resolves symbols, ids and names to CoinGecko ids locally from a saved /coins/list
+snapshot, so typos and unknown symbols are rejected without an upstream call and
+coin search (autocomplete) works offline.
+
+Many tokens share a symbol (bridged copies, forks, scams). A symbol resolves to the
+pinned coin (COIN_MAP) if there is one, else to the coin whose id is its slugged name,
+else to the shortest id. Every other coin with that symbol stays reachable by its id.
+
+The index keeps coins in parallel id/symbol/name lists with dicts for exact lookups
+and one sorted list of lowercase symbol and name keys for prefix search with bisect.
+
+Usage (refresh the snapshot, one upstream call):
+    python coin_index.py
+    COINGECKO_BASE_URL=http://localhost:8900/api/v3 python coin_index.py
+"""
+
+import json
+import os
+import re
+from bisect import bisect_left
+
+import upstream
+from upstream import BASE_URL
+
+COIN_LIST_PATH = os.environ.get(
+    'COIN_LIST_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'coins_list.json')
+)
+
+# Matches scanned per prefix search before ranking
+MAX_PREFIX_MATCHES = 500
+
+
+def fetch_coin_list():
+    """Download /coins/list: [{'id', 'symbol', 'name'}, ...]"""
+    response = upstream.get(f"{BASE_URL}/coins/list", timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def save_coin_list(coins, path=COIN_LIST_PATH):
+    """Write a /coins/list payload to disk (atomic)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump([{'id': c['id'], 'symbol': c['symbol'], 'name': c['name']} for c in coins], f)
+    os.replace(tmp_path, path)
+
+
+def load_coin_list(path=COIN_LIST_PATH):
+    """Saved /coins/list payload, or None if there is no readable snapshot"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+class CoinIndex:
+    """Immutable symbol / id / name lookup over a coin list"""
+
+    def __init__(self, coins=None, pinned=None):
+        """
+        coins: /coins/list entries (None or empty: only the pinned coins are known)
+        pinned: {SYMBOL: coin id} preferred when a symbol is shared
+        """
+        pinned = {symbol.lower(): coin_id for symbol, coin_id in (pinned or {}).items()}
+        self.has_snapshot = bool(coins)
+
+        self.ids, self.symbols, self.names = [], [], []
+        self._by_id = {}
+        for coin in coins or []:
+            coin_id = coin['id'].lower()
+            if coin_id in self._by_id or not coin_id:
+                continue
+            self._by_id[coin_id] = len(self.ids)
+            self.ids.append(coin_id)
+            self.symbols.append(coin['symbol'].lower())
+            self.names.append(coin['name'])
+        # Pinned coins are always known, even without a snapshot
+        for symbol, coin_id in pinned.items():
+            if coin_id not in self._by_id:
+                self._by_id[coin_id] = len(self.ids)
+                self.ids.append(coin_id)
+                self.symbols.append(symbol)
+                self.names.append(coin_id.replace('-', ' ').title())
+
+        # Symbol -> preferred coin; shared symbols also keep all their coins
+        groups = {}
+        for i, symbol in enumerate(self.symbols):
+            groups.setdefault(symbol, []).append(i)
+        self._by_symbol = {}
+        self._shared = {}
+        for symbol, members in groups.items():
+            if len(members) > 1:
+                members.sort(key=lambda i: (self.ids[i] != _slug(self.names[i]), len(self.ids[i]), self.ids[i]))
+                self._shared[symbol] = tuple(members)
+            self._by_symbol[symbol] = members[0]
+        self._by_pinned_symbol = {symbol: self._by_id[coin_id] for symbol, coin_id in pinned.items()}
+        self._by_symbol.update(self._by_pinned_symbol)
+        self._pinned = set(self._by_pinned_symbol.values())
+
+        self._by_name = {}
+        for i, name in enumerate(self.names):
+            self._by_name.setdefault(name.lower(), i)
+
+        # Sorted (key, coin) pairs for prefix search over symbols and names
+        keys = sorted({(key, i) for i in range(len(self.ids)) for key in (self.symbols[i], self.names[i].lower())})
+        self._keys = [key for key, _ in keys]
+        self._key_coins = [i for _, i in keys]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resolve(self, query):
+        """
+        CoinGecko id for a symbol, id or exact name (case-insensitive); None if unknown
+        Pinned symbols win, then exact ids, since some tokens use another coin's id as their
+        symbol (a token with symbol "bitcoin" must not shadow the id bitcoin), then the
+        remaining symbols and names.
+        """
+        q = (query or '').strip().lower()
+        i = self._by_pinned_symbol.get(q)
+        if i is None:
+            i = self._by_id.get(q)
+        if i is None:
+            i = self._by_symbol.get(q)
+        if i is None:
+            i = self._by_name.get(q)
+        return None if i is None else self.ids[i]
+
+    def candidates(self, symbol):
+        """Every coin id sharing a symbol, preferred first"""
+        q = symbol.strip().lower()
+        if q in self._shared:
+            members = sorted(self._shared[q], key=lambda i: i != self._by_symbol[q])
+            return [self.ids[i] for i in members]
+        i = self._by_symbol.get(q)
+        return [] if i is None else [self.ids[i]]
+
+    def shared_symbols(self):
+        """Symbols used by more than one coin"""
+        return list(self._shared)
+
+    def coin(self, i):
+        """Public record of the coin at position i"""
+        return {'id': self.ids[i], 'symbol': self.symbols[i].upper(), 'name': self.names[i]}
+
+    def search(self, prefix, limit=10):
+        """
+        Coins whose symbol or name starts with prefix (case-insensitive)
+        Exact symbol matches come first, then pinned coins, then the preferred coin of
+        each symbol, then shorter symbols.
+        """
+        q = prefix.strip().lower()
+        if not q:
+            return []
+        matches = set()
+        pos = bisect_left(self._keys, q)
+        while pos < len(self._keys) and self._keys[pos].startswith(q) and len(matches) < MAX_PREFIX_MATCHES:
+            matches.add(self._key_coins[pos])
+            pos += 1
+
+        ranked = sorted(matches, key=lambda i: (
+            self.symbols[i] != q,
+            i not in self._pinned,
+            self._by_symbol.get(self.symbols[i]) != i,
+            len(self.symbols[i]),
+            self.names[i].lower()
+        ))
+        return [self.coin(i) for i in ranked[:limit]]
+
+
+def main():
+    coins = fetch_coin_list()
+    save_coin_list(coins)
+    index = CoinIndex(coins)
+    print(f"✅ Saved {len(coins)} coins ({len(index.shared_symbols())} shared symbols) to {COIN_LIST_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -16,13 +16,27 @@ All calculations follow industry-standard formulas (Wilder's RSI, Bollinger's me
 
 import numpy as np
 import pandas as pd
-from scipy.spatial.distance import mahalanobis
-from scipy.linalg import inv
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+from indicators import (
+    INDICATOR_REGISTRY,
+    register_indicator,
+    core_indicators,
+    compute_indicators
+)
+from fast_linalg import (
+    standardize_fit,
+    standardize,
+    pca_fit,
+    pca_transform,
+    robust_cholesky,
+    mahalanobis_to_references
+)
 import warnings
 warnings.filterwarnings('ignore')
 
+# Recommendation cutoffs shared by get_signal_description and the backtester
+SIGNAL_THRESHOLD = 0.2
+STRONG_SIGNAL_THRESHOLD = 0.6
+
 
 def calculate_rsi_series(prices, period=14):
     """Calculate RSI for entire time series"""
@@ -60,12 +74,12 @@ def calculate_rsi_series(prices, period=14):
     return rsi
 
 
-def calculate_macd_series(prices):
+def calculate_macd_series(prices, fast=12, slow=26, signal_span=9):
     """Calculate MACD histogram for entire time series"""
-    exp1 = pd.Series(prices).ewm(span=12, adjust=False).mean()
-    exp2 = pd.Series(prices).ewm(span=26, adjust=False).mean()
+    exp1 = pd.Series(prices).ewm(span=fast, adjust=False).mean()
+    exp2 = pd.Series(prices).ewm(span=slow, adjust=False).mean()
     macd = exp1 - exp2
-    signal = macd.ewm(span=9, adjust=False).mean()
+    signal = macd.ewm(span=signal_span, adjust=False).mean()
     histogram = macd - signal
     return histogram.values
 
@@ -103,32 +117,28 @@ def calculate_volume_ratio_series(volumes, period=20):
     return ratios
 
 
-def compute_indicator_time_series(df):
+def compute_indicator_time_series(df, rsi_period=14, macd_spans=(12, 26, 9), bb_period=20,
+                                  ema_period=20, volume_period=20, indicators=None):
     """
     Compute all indicators for entire time series
     Returns DataFrame with columns: RSI, MACD, Bollinger, EMA, Volume
+    Periods default to the standard settings; param_sweep.py searches over them.
+    indicators: optional registry names to compute instead (e.g. INDICATORS + ['ATR'])
     """
-    prices = df['price'].values
-    volumes = df['volume'].values
-    
-    # Calculate all indicator series
-    rsi_series = calculate_rsi_series(prices)
-    macd_series = calculate_macd_series(prices)
-    bb_series = calculate_bollinger_position_series(prices)
-    ema_series = calculate_ema_ratio_series(prices)
-    volume_series = calculate_volume_ratio_series(volumes)
-    
-    # Create DataFrame
-    indicator_df = pd.DataFrame({
-        'RSI': rsi_series,
-        'MACD': macd_series,
-        'Bollinger': bb_series,
-        'EMA': ema_series,
-        'Volume': volume_series
-    })
+    params = {
+        'RSI': {'period': rsi_period},
+        'MACD': dict(zip(('fast', 'slow', 'signal_span'), macd_spans)),
+        'Bollinger': {'period': bb_period},
+        'EMA': {'period': ema_period},
+        'Volume': {'period': volume_period}
+    }
+    
+    # Calculate all indicator series through the registry's batch kernels
+    series = compute_indicators(df['price'].values, df['volume'].values,
+                                names=indicators or INDICATORS, params=params)
     
     # Remove rows with NaN (from rolling windows)
-    indicator_df = indicator_df.dropna().reset_index(drop=True)
+    indicator_df = pd.DataFrame(series).dropna().reset_index(drop=True)
     
     return indicator_df
 
@@ -138,6 +148,122 @@ def compute_correlation_matrix(indicator_df):
     return indicator_df.corr()
 
 
+def _normalize_rsi(value):
+    # RSI: 0-100 scale
+    # Literature: RSI < 30 = oversold (BUY signal), RSI > 70 = overbought (SELL signal)
+    # Normalize: <30 -> positive (BUY), >70 -> negative (SELL), 30-70 -> neutral
+    normalized = np.where(
+        value < 30,
+        1.0 - (value / 30.0),                      # RSI 0 -> +1.0, RSI 30 -> 0.0
+        np.where(value > 70,
+                 -1.0 + ((100 - value) / 30.0),    # RSI 70 -> 0.0, RSI 100 -> -1.0
+                 (50 - value) / 50.0)              # RSI 30 -> +0.4, RSI 50 -> 0, RSI 70 -> -0.4
+    )
+    return np.clip(normalized, -1, 1)
+
+
+def _normalize_macd(value):
+    # MACD: Histogram value (can be positive or negative)
+    # Literature: Positive histogram = bullish momentum, negative = bearish
+    # Use tanh for smooth normalization
+    return np.tanh(value / 100.0)
+
+
+def _normalize_bollinger(value):
+    # Bollinger: Position value 0-1 (0 = lower band, 1 = upper band)
+    # Literature: Price near lower band (<0.2) = oversold (BUY), near upper (>0.8) = overbought (SELL)
+    # Map: 0 -> +1 (BUY), 0.5 -> 0 (HOLD), 1 -> -1 (SELL)
+    return np.clip((0.5 - value) * 2.0, -1, 1)
+
+
+def _normalize_ema(value):
+    # EMA: Ratio of price/EMA (typically 0.8-1.2 range)
+    # Literature: Price > EMA = bullish, Price < EMA = bearish
+    # Normalize: >1.0 -> positive, <1.0 -> negative
+    return np.tanh((value - 1.0) * 2.0)
+
+
+def _normalize_volume(value):
+    # Volume: Ratio of recent/average volume (typically 0.5-2.0)
+    # Literature: High volume (>1.5) with price increase = bullish confirmation
+    # Normalize: >1.0 -> positive, <1.0 -> negative
+    return np.tanh(value - 1.0)
+
+
+# Core indicators: batch kernel, normalizer, Method 1 weight and
+# Method 3 reference coordinates (neutral, bullish, bearish)
+register_indicator(
+    'RSI', lambda prices, volumes, period: calculate_rsi_series(prices, period),
+    normalize=_normalize_rsi, params={'period': 14},
+    core=True, weight=0.25, references=(50.0, 30.0, 70.0)    # Oversold bullish, overbought bearish
+)
+register_indicator(
+    'MACD', lambda prices, volumes, fast, slow, signal_span: calculate_macd_series(prices, fast, slow, signal_span),
+    normalize=_normalize_macd, params={'fast': 12, 'slow': 26, 'signal_span': 9},
+    core=True, weight=0.25, references=(0.0, 10.0, -10.0)    # Positive / negative histogram
+)
+register_indicator(
+    'Bollinger', lambda prices, volumes, period: calculate_bollinger_position_series(prices, period),
+    normalize=_normalize_bollinger, params={'period': 20},
+    core=True, weight=0.20, references=(0.5, 0.2, 0.8)       # Near lower / upper band
+)
+register_indicator(
+    'EMA', lambda prices, volumes, period: calculate_ema_ratio_series(prices, period),
+    normalize=_normalize_ema, params={'period': 20},
+    core=True, weight=0.15, references=(1.0, 1.02, 0.98)     # Above / below trend
+)
+register_indicator(
+    'Volume', lambda prices, volumes, period: calculate_volume_ratio_series(volumes, period),
+    normalize=_normalize_volume, params={'period': 20},
+    core=True, weight=0.15, references=(1.0, 1.5, 0.5)       # Heavy / light volume
+)
+
+# Indicator columns of compute_indicator_time_series, in the order used by array-based code
+INDICATORS = core_indicators()
+
+# Method 3 reference points (rows: neutral, bullish, bearish) in INDICATORS order
+MAHALANOBIS_REFERENCES = np.array([INDICATOR_REGISTRY[name]['references'] for name in INDICATORS]).T
+
+
+def _normalizer(name):
+    """Registered normalizer of an indicator; None if unknown or non-directional"""
+    spec = INDICATOR_REGISTRY.get(name)
+    return spec['normalize'] if spec is not None else None
+
+
+def normalize_indicators(values, indicators=None):
+    """
+    Normalize many indicator values to the -1 to +1 scale in one call
+    values: DataFrame with indicator columns (returns a DataFrame), or an array whose
+    last axis follows `indicators` (default INDICATORS), e.g. (T, 5) for one coin or
+    (coins, T, 5) for several. Same rules as normalize_indicator_to_signal.
+    """
+    if isinstance(values, pd.DataFrame):
+        columns = [c for c in values.columns if _normalizer(c) is not None]
+        return pd.DataFrame(
+            normalize_indicators(values[columns].to_numpy(dtype=np.float64), columns),
+            index=values.index, columns=columns
+        )
+    
+    indicators = indicators or INDICATORS
+    values = np.asarray(values, dtype=np.float64)
+    signals = np.zeros_like(values)
+    for i, name in enumerate(indicators):
+        normalizer = _normalizer(name)
+        if normalizer is not None:
+            signals[..., i] = normalizer(values[..., i])
+    return signals
+
+
+def _to_scalar(value):
+    """Latest value as a float if given a Series or array"""
+    if hasattr(value, 'iloc'):
+        return float(value.iloc[-1]) if len(value) > 0 else float(value)
+    elif hasattr(value, '__len__') and not isinstance(value, str):
+        return float(value[-1]) if len(value) > 0 else float(value)
+    return float(value)
+
+
 def normalize_indicator_to_signal(value, indicator_name):
     """
     Normalize individual indicator values to -1 to +1 scale
@@ -147,188 +273,157 @@ def normalize_indicator_to_signal(value, indicator_name):
     - Bollinger: Bollinger (2001) - near lower band = oversold (BUY), near upper = overbought (SELL)
     - EMA: Price above EMA = bullish, below = bearish
     - Volume: High volume with price increase = bullish confirmation
+    Scalar form of normalize_indicators.
     """
-    # Convert to float if it's a Series or array
-    if hasattr(value, 'iloc'):
-        value = float(value.iloc[-1]) if len(value) > 0 else float(value)
-    elif hasattr(value, '__len__') and not isinstance(value, str):
-        value = float(value[-1]) if len(value) > 0 else float(value)
-    else:
-        value = float(value)
-    
-    if indicator_name == 'RSI':
-        # RSI: 0-100 scale
-        # Literature: RSI < 30 = oversold (BUY signal), RSI > 70 = overbought (SELL signal)
-        # Normalize: <30 -> positive (BUY), >70 -> negative (SELL), 30-70 -> neutral
-        if value < 30:
-            # Oversold: map to positive (stronger oversold = higher positive)
-            normalized = 1.0 - (value / 30.0)  # RSI 0 -> +1.0, RSI 30 -> 0.0
-        elif value > 70:
-            # Overbought: map to negative (stronger overbought = lower negative)
-            normalized = -1.0 + ((100 - value) / 30.0)  # RSI 70 -> 0.0, RSI 100 -> -1.0
-        else:
-            # Neutral zone: linear interpolation
-            normalized = (50 - value) / 50.0  # RSI 30 -> +0.4, RSI 50 -> 0, RSI 70 -> -0.4
-        return float(np.clip(normalized, -1, 1))
-    
-    elif indicator_name == 'MACD':
-        # MACD: Histogram value (can be positive or negative)
-        # Literature: Positive histogram = bullish momentum, negative = bearish
-        # Use tanh for smooth normalization
-        return float(np.tanh(value / 100.0)) if value != 0 else 0.0
-    
-    elif indicator_name == 'Bollinger':
-        # Bollinger: Position value 0-1 (0 = lower band, 1 = upper band)
-        # Literature: Price near lower band (<0.2) = oversold (BUY), near upper (>0.8) = overbought (SELL)
-        # Map: 0 -> +1 (BUY), 0.5 -> 0 (HOLD), 1 -> -1 (SELL)
-        normalized = (0.5 - value) * 2.0
-        return float(np.clip(normalized, -1, 1))
-    
-    elif indicator_name == 'EMA':
-        # EMA: Ratio of price/EMA (typically 0.8-1.2 range)
-        # Literature: Price > EMA = bullish, Price < EMA = bearish
-        # Normalize: >1.0 -> positive, <1.0 -> negative
-        return float(np.tanh((value - 1.0) * 2.0))
-    
-    elif indicator_name == 'Volume':
-        # Volume: Ratio of recent/average volume (typically 0.5-2.0)
-        # Literature: High volume (>1.5) with price increase = bullish confirmation
-        # Normalize: >1.0 -> positive, <1.0 -> negative
-        return float(np.tanh((value - 1.0)))
-    
-    return 0.0
-
-
-def method1_simple_weighted(indicator_values):
-    """Method 1: Simple Weighted Average"""
-    weights = {
-        'RSI': 0.25,
-        'MACD': 0.25,
-        'Bollinger': 0.20,
-        'EMA': 0.15,
-        'Volume': 0.15
-    }
-    
-    normalized_signals = {}
-    weighted_sum = 0
-    
+    normalizer = _normalizer(indicator_name)
+    return float(normalizer(_to_scalar(value))) if normalizer is not None else 0.0
+
+
+# Default weights for Method 1 (Simple Weighted), from the registry
+SIMPLE_WEIGHTS = {name: INDICATOR_REGISTRY[name]['weight'] for name in INDICATORS}
+
+
+def _indicator_vector(indicator_values):
+    """Main indicators present in a values dict and their normalized signals"""
     # Only process main indicators (exclude helper values like MACD_Signal)
-    main_indicators = ['RSI', 'MACD', 'Bollinger', 'EMA', 'Volume']
+    present = [name for name in INDICATORS if name in indicator_values]
+    values = [_to_scalar(indicator_values[name]) for name in present]
+    return present, normalize_indicators(np.array(values, dtype=np.float64), present)
+
+
+def method1_simple_weighted(indicator_values, weights=None):
+    """Method 1: Simple Weighted Average"""
+    weights = weights or SIMPLE_WEIGHTS
     
-    for indicator in main_indicators:
-        if indicator in indicator_values:
-            value = indicator_values[indicator]
-            normalized = normalize_indicator_to_signal(value, indicator)
-            normalized_signals[indicator] = normalized
-            weighted_sum += normalized * weights[indicator]
+    present, signals = _indicator_vector(indicator_values)
+    normalized_signals = {name: float(signal) for name, signal in zip(present, signals)}
+    weighted_sum = float(np.dot(signals, [weights[name] for name in present]))
     
     return weighted_sum, normalized_signals
 
 
+def correlation_adjusted_weights(correlation_matrix):
+    """
+    Method 2 weights in INDICATORS order
+    For each indicator: weight = 1 / (1 + sum of absolute correlations with the others),
+    normalized to sum to 1.
+    """
+    abs_corr = np.abs(correlation_matrix.loc[INDICATORS, INDICATORS].to_numpy(dtype=np.float64))
+    corr_sum = abs_corr.sum(axis=1) - np.diagonal(abs_corr)
+    weights = 1 / (1 + corr_sum)  # Add 1 to avoid division by zero
+    return weights / weights.sum()
+
+
 def method2_correlation_adjusted(indicator_values, correlation_matrix):
     """Method 2: Correlation-Adjusted Weights"""
-    # For each indicator: weight = 1 / (sum of absolute correlations with others)
-    indicators = ['RSI', 'MACD', 'Bollinger', 'EMA', 'Volume']
-    weights = {}
-    
-    for indicator in indicators:
-        corr_sum = 0
-        for other in indicators:
-            if indicator != other:
-                corr_sum += abs(correlation_matrix.loc[indicator, other])
-        weights[indicator] = 1 / (1 + corr_sum)  # Add 1 to avoid division by zero
-    
-    # Normalize weights to sum to 1
-    total_weight = sum(weights.values())
-    weights = {k: v / total_weight for k, v in weights.items()}
+    weight_vector = correlation_adjusted_weights(correlation_matrix)
+    weights = dict(zip(INDICATORS, weight_vector))
     
     # Compute weighted sum - only use main indicators
-    weighted_sum = 0
-    for indicator in indicators:
-        if indicator in indicator_values:
-            value = indicator_values[indicator]
-            normalized = normalize_indicator_to_signal(value, indicator)
-            weighted_sum += normalized * weights[indicator]
+    present, signals = _indicator_vector(indicator_values)
+    weighted_sum = float(np.dot(signals, [weights[name] for name in present]))
     
     return weighted_sum, weights
 
 
-def method3_mahalanobis_distance(indicator_df, current_values):
-    """Method 3: Mahalanobis Distance"""
-    # Neutral point: [RSI=50, MACD=0, BB=0.5, EMA=1.0, Volume=1.0]
-    neutral = np.array([50.0, 0.0, 0.5, 1.0, 1.0])
-    
-    # Bullish reference: [RSI=30, MACD=positive, BB=0.2, EMA=1.02, Volume=1.5]
-    bullish = np.array([30.0, 10.0, 0.2, 1.02, 1.5])
-    
-    # Bearish reference: [RSI=70, MACD=negative, BB=0.8, EMA=0.98, Volume=0.5]
-    bearish = np.array([70.0, -10.0, 0.8, 0.98, 0.5])
-    
-    # Get current indicator values as array
-    current = np.array([
-        current_values['RSI'],
-        current_values['MACD'],
-        current_values['Bollinger'],
-        current_values['EMA'],
-        current_values['Volume']
-    ])
-    
-    # Compute covariance matrix from historical data
-    indicator_array = indicator_df[['RSI', 'MACD', 'Bollinger', 'EMA', 'Volume']].values
+def fit_mahalanobis_model(indicator_df):
+    """Cholesky factor of the indicator covariance used by Method 3 (None if not finite)"""
+    indicator_array = indicator_df[INDICATORS].values
     cov_matrix = np.cov(indicator_array.T)
     
-    # Add small value to diagonal for numerical stability
-    cov_matrix += np.eye(cov_matrix.shape[0]) * 1e-6
+    # Small diagonal jitter for numerical stability, escalated if still not positive definite
+    chol, jitter = robust_cholesky(cov_matrix, jitter=1e-6)
+    if not np.isfinite(jitter):
+        return {'chol': None, 'jitter': None}
+    return {'chol': chol, 'jitter': float(jitter)}
+
+
+def mahalanobis_scores(points, chol):
+    """
+    Method 3 signal for many points at once
+    points (..., m, 5) in [RSI, MACD, Bollinger, EMA, Volume] order, chol (..., 5, 5).
+    Returns (signal (..., m), distances (..., m, 3) to neutral, bullish, bearish).
+    """
+    distances = mahalanobis_to_references(points, MAHALANOBIS_REFERENCES, chol)
+    dist_to_neutral, dist_to_bullish, dist_to_bearish = np.moveaxis(distances, -1, 0)
+    
+    # Signal based on distance difference, normalized to -1 to +1 scale
+    max_possible_dist = np.maximum(np.maximum(dist_to_bullish, dist_to_bearish), dist_to_neutral)
+    signal = np.tanh((dist_to_bearish - dist_to_bullish) / (max_possible_dist + 1e-6))
+    return signal, distances
+
+
+def fit_pca_model(indicator_df):
+    """Standardization, 3-component PCA and historical score spreads used by Method 4"""
+    indicator_array = indicator_df[INDICATORS].values
+    mean, scale = standardize_fit(indicator_array)
+    standardized = standardize(indicator_array, mean, scale)
+    
+    pca = pca_fit(standardized, n_components=3)
+    pca_scores = pca['scores']
+    explained_variance = pca['explained_variance_ratio']
+    
+    # Spread of the historical variance-weighted PC score, one matrix product for all rows
+    historical_weighted = pca_scores[:, :len(explained_variance)] @ explained_variance
+    
+    return {
+        'mean': mean,
+        'scale': scale,
+        'pca': pca,
+        'std_weighted': np.std(historical_weighted),
+        'pc_std': np.std(pca_scores, axis=0)
+    }
+
+
+def fit_models(indicator_df):
+    """Fit every model Methods 3 and 4 need, so they can be reused across calls"""
+    return {
+        'mahalanobis': fit_mahalanobis_model(indicator_df),
+        'pca': fit_pca_model(indicator_df)
+    }
+
+
+def method3_mahalanobis_distance(indicator_df, current_values, model=None):
+    """
+    Method 3: Mahalanobis Distance
+    model: optional result of fit_mahalanobis_model(indicator_df) to skip the refit
+    """
+    # Get current indicator values as array
+    current = np.array([current_values[name] for name in INDICATORS], dtype=np.float64)
     
-    try:
-        inv_cov = inv(cov_matrix)
-        
-        # Compute distances
-        dist_to_neutral = mahalanobis(current, neutral, inv_cov)
-        dist_to_bullish = mahalanobis(current, bullish, inv_cov)
-        dist_to_bearish = mahalanobis(current, bearish, inv_cov)
-        
-        # Signal based on distance difference
-        distance_diff = dist_to_bearish - dist_to_bullish
-        
-        # Normalize to -1 to +1 scale
-        max_possible_dist = max(dist_to_bullish, dist_to_bearish, dist_to_neutral)
-        signal = np.tanh(distance_diff / (max_possible_dist + 1e-6))
-        
-        return signal, {
-            'dist_to_neutral': float(dist_to_neutral),
-            'dist_to_bullish': float(dist_to_bullish),
-            'dist_to_bearish': float(dist_to_bearish)
-        }
-    except:
-        # Fallback if covariance matrix is singular
+    # Covariance of the historical data, as its Cholesky factor
+    if model is None:
+        model = fit_mahalanobis_model(indicator_df)
+    if model['chol'] is None or not np.all(np.isfinite(current)):
         return 0.0, {'error': 'Cannot compute Mahalanobis distance'}
+    
+    signal, distances = mahalanobis_scores(current[None, :], model['chol'])
+    dist_to_neutral, dist_to_bullish, dist_to_bearish = distances[0]
+    
+    return float(signal[0]), {
+        'dist_to_neutral': float(dist_to_neutral),
+        'dist_to_bullish': float(dist_to_bullish),
+        'dist_to_bearish': float(dist_to_bearish)
+    }
 
 
-def method4_pca_based(indicator_df, current_values):
-    """Method 4: PCA-Based Score"""
-    # Standardize the data
-    scaler = StandardScaler()
-    indicator_array = indicator_df[['RSI', 'MACD', 'Bollinger', 'EMA', 'Volume']].values
-    standardized = scaler.fit_transform(indicator_array)
-    
-    # Fit PCA
-    pca = PCA(n_components=3)
-    pca_scores = pca.fit_transform(standardized)
+def method4_pca_based(indicator_df, current_values, model=None):
+    """
+    Method 4: PCA-Based Score
+    model: optional result of fit_pca_model(indicator_df) to skip the refit
+    """
+    # Standardize the data and fit PCA
+    if model is None:
+        model = fit_pca_model(indicator_df)
+    pca = model['pca']
     
     # Transform current values
-    current_array = np.array([[
-        current_values['RSI'],
-        current_values['MACD'],
-        current_values['Bollinger'],
-        current_values['EMA'],
-        current_values['Volume']
-    ]])
-    current_standardized = scaler.transform(current_array)
-    current_pc = pca.transform(current_standardized)[0]
+    current_array = np.array([[current_values[name] for name in INDICATORS]])
+    current_standardized = standardize(current_array, model['mean'], model['scale'])
+    current_pc = pca_transform(current_standardized, pca)[0]
     
     # Composite score from top PCs
-    explained_variance = pca.explained_variance_ratio_
+    explained_variance = pca['explained_variance_ratio']
     
     # Literature (e.g., Jolliffe 2002; OECD Handbook on Constructing Composite Indicators) 
     # typically recommends aggregating standardized indicators using PCA loadings / scores 
@@ -338,9 +433,7 @@ def method4_pca_based(indicator_df, current_values):
     
     # Normalize the weighted PC score to (-1, 1) using historical distribution
     # Use the standard deviation of historical weighted PC scores for proper scaling
-    historical_weighted = np.array([np.dot(pca_scores[i, :len(explained_variance)], explained_variance) 
-                                     for i in range(len(pca_scores))])
-    std_weighted = np.std(historical_weighted)
+    std_weighted = model['std_weighted']
     
     # Normalize using tanh with proper scaling to avoid saturation
     if std_weighted > 1e-6:
@@ -350,9 +443,10 @@ def method4_pca_based(indicator_df, current_values):
     
     # Normalize individual factor scores to -1 to +1 range using tanh
     # This makes them comparable to other normalized indicators
-    pc1_normalized = np.tanh(current_pc[0] / (np.std(pca_scores[:, 0]) + 1e-6))
-    pc2_normalized = np.tanh(current_pc[1] / (np.std(pca_scores[:, 1]) + 1e-6))
-    pc3_normalized = np.tanh(current_pc[2] / (np.std(pca_scores[:, 2]) + 1e-6))
+    pc_std = model['pc_std']
+    pc1_normalized = np.tanh(current_pc[0] / (pc_std[0] + 1e-6))
+    pc2_normalized = np.tanh(current_pc[1] / (pc_std[1] + 1e-6))
+    pc3_normalized = np.tanh(current_pc[2] / (pc_std[2] + 1e-6))
     
     # Individual factor scores (both raw and normalized)
     factor_scores = {
@@ -432,75 +526,220 @@ def method5_individual_signals(indicator_values, price_change=None):
     return signals
 
 
-def get_signal_description(signal_value):
-    """Convert signal value to recommendation text"""
-    if signal_value >= 0.6:
+def get_signal_description(signal_value, thresholds=None):
+    """
+    Convert signal value to recommendation text
+    thresholds: optional (signal, strong) cutoffs, defaults to (0.2, 0.6)
+    """
+    weak, strong = thresholds or (SIGNAL_THRESHOLD, STRONG_SIGNAL_THRESHOLD)
+    if signal_value >= strong:
         return "STRONG BUY"
-    elif signal_value >= 0.2:
+    elif signal_value >= weak:
         return "BUY"
-    elif signal_value <= -0.6:
+    elif signal_value <= -strong:
         return "STRONG SELL"
-    elif signal_value <= -0.2:
+    elif signal_value <= -weak:
         return "SELL"
     else:
         return "HOLD"
 
 
-def compute_all_methods(indicator_df, current_values, correlation_matrix, price_change=None):
+# Shared prerequisites of the scoring methods, computed at most once per scoring context.
+# A context is a dict holding 'indicator_df' plus every prerequisite resolved so far, so
+# a cached context keeps fitted models across requests.
+PREREQUISITES = {
+    'correlation_matrix': {
+        'requires': [],
+        'compute': lambda ctx: compute_correlation_matrix(ctx['indicator_df'])
+    },
+    'mahalanobis_model': {
+        'requires': [],
+        'compute': lambda ctx: fit_mahalanobis_model(ctx['indicator_df'])
+    },
+    'pca_model': {
+        'requires': [],
+        'compute': lambda ctx: fit_pca_model(ctx['indicator_df'])
+    }
+}
+
+
+def resolve_prerequisite(context, name):
+    """Return a prerequisite from the context, computing it (and its own requirements) once"""
+    if name not in context:
+        spec = PREREQUISITES[name]
+        for dependency in spec['requires']:
+            resolve_prerequisite(context, dependency)
+        context[name] = spec['compute'](context)
+    return context[name]
+
+
+def _score_simple_weighted(ctx, current_values, price_change):
+    score, normalized = method1_simple_weighted(current_values)
+    return {'score': float(score), 'normalized_signals': {k: float(v) for k, v in normalized.items()}}
+
+
+def _score_correlation_adjusted(ctx, current_values, price_change):
+    score, weights = method2_correlation_adjusted(current_values, ctx['correlation_matrix'])
+    return {'score': float(score), 'weights': {k: float(v) for k, v in weights.items()}}
+
+
+def _score_mahalanobis(ctx, current_values, price_change):
+    score, distances = method3_mahalanobis_distance(ctx['indicator_df'], current_values,
+                                                    ctx['mahalanobis_model'])
+    return {'score': float(score), 'distances': distances}
+
+
+def _score_pca_composite(ctx, current_values, price_change):
+    score, factors = method4_pca_based(ctx['indicator_df'], current_values, ctx['pca_model'])
+    return {'score': float(score), 'factors': factors}
+
+
+def _score_individual_signals(ctx, current_values, price_change):
+    individual = method5_individual_signals(current_values, price_change)
+    return {k: float(v) for k, v in individual.items()}
+
+
+def _rows_simple_weighted(ctx, values, signals):
+    return signals @ np.array([SIMPLE_WEIGHTS[name] for name in INDICATORS])
+
+
+def _rows_correlation_adjusted(ctx, values, signals):
+    return signals @ correlation_adjusted_weights(ctx['correlation_matrix'])
+
+
+def _rows_mahalanobis(ctx, values, signals):
+    chol = ctx['mahalanobis_model']['chol']
+    if chol is None:
+        return np.zeros(len(values))
+    mahalanobis_signal, _ = mahalanobis_scores(values, chol)
+    return np.where(np.all(np.isfinite(values), axis=1), mahalanobis_signal, 0.0)
+
+
+def _rows_pca_composite(ctx, values, signals):
+    model = ctx['pca_model']
+    pca = model['pca']
+    pcs = pca_transform(standardize(values, model['mean'], model['scale']), pca)
+    weighted_pc = pcs @ pca['explained_variance_ratio']
+    if model['std_weighted'] > 1e-6:
+        return np.tanh(weighted_pc / (model['std_weighted'] * 2.0))
+    return np.zeros(len(values))
+
+
+# Scoring-method registry: prerequisites, single-point scorer and (optional) batch row scorer
+SCORING_METHODS = {
+    'simple_weighted': {
+        'requires': [],
+        'compute': _score_simple_weighted,
+        'compute_rows': _rows_simple_weighted
+    },
+    'correlation_adjusted': {
+        'requires': ['correlation_matrix'],
+        'compute': _score_correlation_adjusted,
+        'compute_rows': _rows_correlation_adjusted
+    },
+    'mahalanobis': {
+        'requires': ['mahalanobis_model'],
+        'compute': _score_mahalanobis,
+        'compute_rows': _rows_mahalanobis
+    },
+    'pca_composite': {
+        'requires': ['pca_model'],
+        'compute': _score_pca_composite,
+        'compute_rows': _rows_pca_composite
+    },
+    'individual_signals': {
+        'requires': [],
+        'compute': _score_individual_signals,
+        'compute_rows': None
+    }
+}
+
+# Methods that produce a composite score (everything except the raw individual signals)
+COMPOSITE_METHODS = [name for name, spec in SCORING_METHODS.items() if spec['compute_rows'] is not None]
+
+
+def parse_methods(value, available=None):
     """
-    Compute all 5 scoring methods and return results
+    Parse a comma-separated ?methods= value into registry names
+    Returns None for an empty value (meaning all); raises ValueError on unknown names.
+    """
+    available = available or list(SCORING_METHODS)
+    if not value:
+        return None
+    methods = [m.strip() for m in value.split(',') if m.strip()]
+    unknown = [m for m in methods if m not in available]
+    if unknown:
+        raise ValueError(f"Unknown methods: {', '.join(unknown)}. Available: {', '.join(available)}")
+    return methods
+
+
+def compute_methods(context, current_values, methods=None, price_change=None):
+    """
+    Compute only the requested scoring methods (default: all) for one point
+    context: {'indicator_df': ...} plus any prerequisites already resolved; the ones the
+    requested methods need are added to it lazily.
     """
     results = {}
-    
-    # Method 1: Simple Weighted
-    score1, normalized = method1_simple_weighted(current_values)
-    results['simple_weighted'] = {
-        'score': float(score1),
-        'normalized_signals': {k: float(v) for k, v in normalized.items()}
-    }
-    
-    # Method 2: Correlation-Adjusted
-    score2, weights = method2_correlation_adjusted(current_values, correlation_matrix)
-    results['correlation_adjusted'] = {
-        'score': float(score2),
-        'weights': {k: float(v) for k, v in weights.items()}
-    }
-    
-    # Method 3: Mahalanobis
-    score3, distances = method3_mahalanobis_distance(indicator_df, current_values)
-    results['mahalanobis'] = {
-        'score': float(score3),
-        'distances': distances
-    }
-    
-    # Method 4: PCA-Based
-    score4, factors = method4_pca_based(indicator_df, current_values)
-    results['pca_composite'] = {
-        'score': float(score4),
-        'factors': factors
-    }
-    
-    # Method 5: Individual Signals
-    individual = method5_individual_signals(current_values, price_change)
-    results['individual_signals'] = {k: float(v) for k, v in individual.items()}
-    
+    for name in methods or SCORING_METHODS:
+        spec = SCORING_METHODS[name]
+        for prerequisite in spec['requires']:
+            resolve_prerequisite(context, prerequisite)
+        results[name] = spec['compute'](context, current_values, price_change)
     return results
 
 
-def find_strong_correlations(correlation_matrix, threshold=0.5):
-    """Find indicator pairs with strong correlations"""
-    strong_corrs = []
-    indicators = correlation_matrix.index.tolist()
-    
-    for i, ind1 in enumerate(indicators):
-        for j, ind2 in enumerate(indicators[i+1:], i+1):
-            corr_value = correlation_matrix.loc[ind1, ind2]
-            if abs(corr_value) >= threshold:
-                strong_corrs.append({
-                    'indicator1': ind1,
-                    'indicator2': ind2,
-                    'correlation': float(corr_value)
-                })
+def compute_all_methods(indicator_df, current_values, correlation_matrix, price_change=None, models=None):
+    """
+    Compute all 5 scoring methods and return results
+    models: optional result of fit_models(indicator_df), reused instead of refitting
+    """
+    context = {'indicator_df': indicator_df, 'correlation_matrix': correlation_matrix}
+    if models:
+        context['mahalanobis_model'] = models['mahalanobis']
+        context['pca_model'] = models['pca']
+    return compute_methods(context, current_values, price_change=price_change)
+
+
+def compute_method_scores(values, context, methods=None):
+    """
+    Composite method scores for many indicator rows at once
+    values: (m, 5) raw indicator rows in INDICATORS order; context as in compute_methods.
+    Returns {method: (m,) array}, equal row by row to compute_methods.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    signals = normalize_indicators(values)
     
-    return strong_corrs
+    scores = {}
+    for name in methods or COMPOSITE_METHODS:
+        spec = SCORING_METHODS[name]
+        for prerequisite in spec['requires']:
+            resolve_prerequisite(context, prerequisite)
+        scores[name] = spec['compute_rows'](context, values, signals)
+    return scores
+
+
+def strongest_pairs(matrix, labels, threshold=0.0, top_k=None, keys=('indicator1', 'indicator2')):
+    """
+    Pairs (upper triangle) of a correlation matrix with |correlation| >= threshold
+    top_k: keep only the k strongest pairs, ordered by |correlation|; otherwise pairs
+    are listed in matrix order. keys names the two label fields of each pair.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    rows, cols = np.triu_indices(len(labels), k=1)
+    values = matrix[rows, cols]
+    with np.errstate(invalid='ignore'):
+        keep = np.flatnonzero(np.abs(values) >= threshold)
+    if top_k is not None:
+        keep = keep[np.argsort(-np.abs(values[keep]), kind='stable')][:top_k]
+    
+    return [
+        {keys[0]: labels[rows[i]], keys[1]: labels[cols[i]], 'correlation': float(values[i])}
+        for i in keep
+    ]
+
+
+def find_strong_correlations(correlation_matrix, threshold=0.5, top_k=None):
+    """Find indicator pairs with strong correlations (optionally only the top_k strongest)"""
+    return strongest_pairs(correlation_matrix.to_numpy(), correlation_matrix.index.tolist(),
+                           threshold=threshold, top_k=top_k)
 
@@ -0,0 +1,65 @@
+"""
+Cross-Asset Return Correlation
+Pearson and Spearman correlation matrices of hourly log returns across coins, from the
+aligned price matrix of the price store.
+
+A windowed request only needs the matrix at the latest bar, so it is computed directly
+from the last `window` returns.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def log_returns(prices):
+    """Log returns along the time axis of a (coins, T) price matrix -> (coins, T-1)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.diff(np.log(prices), axis=-1)
+
+
+def covariance_to_correlation(cov):
+    """Correlation matrices from (stacked) covariance matrices; zero-variance coins give NaN"""
+    std = np.sqrt(np.diagonal(cov, axis1=-2, axis2=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / (std[..., :, None] * std[..., None, :])
+    return np.clip(corr, -1.0, 1.0)
+
+
+def pearson_matrix(returns):
+    """Pearson correlation between the rows of a (coins, T) return matrix"""
+    centered = returns - returns.mean(axis=1, keepdims=True)
+    cov = centered @ centered.T / (returns.shape[1] - 1)
+    return covariance_to_correlation(cov)
+
+
+def spearman_matrix(returns):
+    """Spearman rank correlation between rows (average ranks for ties)"""
+    ranks = pd.DataFrame(returns.T).rank().to_numpy().T
+    return pearson_matrix(ranks)
+
+
+def cross_correlation(prices, labels, window=None):
+    """
+    Pearson and Spearman matrices of log returns for a (coins, T) aligned price matrix
+    window: only use the last `window` returns (the rolling matrix at the latest bar)
+    Returns a dict with labels, observations, pearson and spearman (coins x coins arrays).
+    """
+    returns = log_returns(prices)
+    if window is not None:
+        returns = returns[:, -window:]
+    pearson = pearson_matrix(returns)
+
+    return {
+        'labels': list(labels),
+        'observations': int(returns.shape[1]),
+        'pearson': pearson,
+        'spearman': spearman_matrix(returns)
+    }
+
+
+def matrix_to_dict(matrix, labels):
+    """{label: {label: value}} like DataFrame.to_dict(), with NaN as None"""
+    return {
+        a: {b: (float(matrix[i, j]) if np.isfinite(matrix[i, j]) else None) for j, b in enumerate(labels)}
+        for i, a in enumerate(labels)
+    }
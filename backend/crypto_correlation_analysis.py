@@ -2,17 +2,26 @@
 """
 Advanced Crypto Correlation Analysis
 Combines multiple basic indicators using 5 different scoring methods
+
+Batch mode analyses many coins in one run. Coins are fetched concurrently by a few
+threads that share one rate limiter. Each coin's indicator series are computed once and
+its current values are read from their last rows, all methods are scored, and one
+consolidated report is written (format from the extension: .csv, .json or .parquet).
+
+Usage:
+    python crypto_correlation_analysis.py                               # bitcoin, full printout + chart
+    python crypto_correlation_analysis.py --coins bitcoin,ethereum,solana --output report.csv
+    python crypto_correlation_analysis.py --universe coins.txt --output report.json --chart-dir charts
 """
 
-import requests
+import argparse
+import json
+import os
+import threading
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from scipy.spatial.distance import mahalanobis
-from scipy.linalg import inv
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 import warnings
@@ -23,16 +32,23 @@ from correlation_analysis import (
     compute_indicator_time_series,
     compute_correlation_matrix,
     compute_all_methods,
+    fit_models,
     find_strong_correlations,
     get_signal_description,
-    normalize_indicator_to_signal
+    INDICATORS
 )
 
-# CoinGecko API
-BASE_URL = "https://api.coingecko.com/api/v3"
+# Headless chart rendering (matplotlib is imported only when a chart is drawn)
+from charts import CHART_METHODS, chart_rows, render_signal_chart, render_charts, data_version
+from coin_index import CoinIndex, load_coin_list
 
-def get_historical_data(coin_id='bitcoin', days=30):
-    """Fetch historical crypto data from CoinGecko API"""
+# Shared pooled client for CoinGecko (BASE_URL honours COINGECKO_BASE_URL)
+import upstream
+from upstream import BASE_URL
+
+
+def fetch_market_chart(coin_id='bitcoin', days=30):
+    """Fetch historical crypto data from CoinGecko API; raises on failure"""
     url = f"{BASE_URL}/coins/{coin_id}/market_chart"
     params = {
         'vs_currency': 'usd',
@@ -41,123 +57,37 @@ def get_historical_data(coin_id='bitcoin', days=30):
         # Free tier automatically returns hourly data for days 2-90
     }
     
+    print(f"Fetching data for {coin_id}...")
+    response = upstream.get(url, params=params, timeout=15)
+    response.raise_for_status()
+    data = response.json()
+    
+    # Convert to DataFrame
+    prices = data['prices']
+    volumes = data['total_volumes']
+    
+    df = pd.DataFrame(prices, columns=['timestamp', 'price'])
+    df['volume'] = [v[1] for v in volumes]
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    
+    print(f"✅ Fetched {len(df)} data points")
+    return df
+
+
+def get_historical_data(coin_id='bitcoin', days=30):
+    """Fetch historical crypto data from CoinGecko API; None on failure"""
     try:
-        print(f"Fetching data for {coin_id}...")
-        response = requests.get(url, params=params, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Convert to DataFrame
-        prices = data['prices']
-        volumes = data['total_volumes']
-        
-        df = pd.DataFrame(prices, columns=['timestamp', 'price'])
-        df['volume'] = [v[1] for v in volumes]
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        
-        print(f"✅ Fetched {len(df)} data points")
-        return df
+        return fetch_market_chart(coin_id, days)
     except Exception as e:
         print(f"❌ Error fetching data: {e}")
         return None
 
 
 def create_bar_chart(all_results, current_values, output_file='crypto_signals_comparison.png'):
-    """Create horizontal bar chart showing all signals"""
-    
-    # Prepare data for chart
-    labels = []
-    values = []
-    recommendations = []
-    colors = []
-    
-    # Individual indicators
-    individual = all_results['individual_signals']
-    for indicator in ['RSI', 'MACD', 'Bollinger', 'EMA', 'Volume']:
-        signal = individual.get(indicator, 0)
-        labels.append(indicator)
-        values.append(signal)
-        recommendations.append(get_signal_description(signal))
-        colors.append('green' if signal > 0 else 'red' if signal < 0 else 'gray')
-    
-    # Composite methods
-    labels.append('Simple Weighted')
-    values.append(all_results['simple_weighted']['score'])
-    recommendations.append(all_results['simple_weighted']['recommendation'])
-    colors.append('green' if all_results['simple_weighted']['score'] > 0 else 'red' if all_results['simple_weighted']['score'] < 0 else 'gray')
-    
-    labels.append('Correlation-Adjusted')
-    values.append(all_results['correlation_adjusted']['score'])
-    recommendations.append(all_results['correlation_adjusted']['recommendation'])
-    colors.append('green' if all_results['correlation_adjusted']['score'] > 0 else 'red' if all_results['correlation_adjusted']['score'] < 0 else 'gray')
-    
-    labels.append('Mahalanobis')
-    values.append(all_results['mahalanobis']['score'])
-    recommendations.append(all_results['mahalanobis']['recommendation'])
-    colors.append('green' if all_results['mahalanobis']['score'] > 0 else 'red' if all_results['mahalanobis']['score'] < 0 else 'gray')
-    
-    labels.append('PCA Composite')
-    values.append(all_results['pca_composite']['score'])
-    recommendations.append(all_results['pca_composite']['recommendation'])
-    colors.append('green' if all_results['pca_composite']['score'] > 0 else 'red' if all_results['pca_composite']['score'] < 0 else 'gray')
-    
-    # PCA Factors (normalized for display)
-    pca_factors = all_results['pca_composite']['factors']
-    labels.append('PCA Factor 1 (Momentum)')
-    values.append(pca_factors['PC1'] / 10)
-    recommendations.append('POSITIVE' if pca_factors['PC1'] > 0 else 'NEGATIVE')
-    colors.append('green' if pca_factors['PC1'] > 0 else 'red')
-    
-    labels.append('PCA Factor 2 (Volatility)')
-    values.append(pca_factors['PC2'] / 10)
-    recommendations.append('POSITIVE' if pca_factors['PC2'] > 0 else 'NEGATIVE')
-    colors.append('green' if pca_factors['PC2'] > 0 else 'red')
-    
-    labels.append('PCA Factor 3 (Trend)')
-    values.append(pca_factors['PC3'] / 10)
-    recommendations.append('POSITIVE' if pca_factors['PC3'] > 0 else 'NEGATIVE')
-    colors.append('green' if pca_factors['PC3'] > 0 else 'red')
-    
-    # Create figure
-    fig, ax = plt.subplots(figsize=(12, 10))
-    
-    # Create bars
-    y_pos = np.arange(len(labels))
-    bars = ax.barh(y_pos, values, color=colors, alpha=0.7, edgecolor='black', linewidth=0.5)
-    
-    # Add zero line
-    ax.axvline(x=0, color='black', linestyle='--', linewidth=1, alpha=0.5)
-    
-    # Add value labels on bars
-    for i, (bar, value, rec) in enumerate(zip(bars, values, recommendations)):
-        width = bar.get_width()
-        if abs(width) > 0.05:  # Only show label if bar is visible
-            label_x = width + (0.05 if width > 0 else -0.05)
-            ax.text(label_x, bar.get_y() + bar.get_height()/2,
-                   f'{value:.3f} ({rec})',
-                   ha='left' if width > 0 else 'right',
-                   va='center', fontsize=9, fontweight='bold')
-    
-    # Customize plot
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(labels)
-    ax.set_xlabel('Signal Strength (BUY ← → SELL)', fontsize=12, fontweight='bold')
-    ax.set_title('Crypto Trading Signals - All Methods Comparison', fontsize=14, fontweight='bold', pad=20)
-    ax.set_xlim(-1.1, 1.1)
-    ax.grid(axis='x', alpha=0.3, linestyle='--')
-    
-    # Add legend
-    buy_patch = mpatches.Patch(color='green', label='BUY Signal', alpha=0.7)
-    sell_patch = mpatches.Patch(color='red', label='SELL Signal', alpha=0.7)
-    hold_patch = mpatches.Patch(color='gray', label='HOLD Signal', alpha=0.7)
-    ax.legend(handles=[buy_patch, sell_patch, hold_patch], loc='upper right')
-    
-    plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    """Create horizontal bar chart showing all signals (Agg, written to output_file)"""
+    render_signal_chart(chart_rows(all_results), output_file, dpi=300)
     print(f"\n✅ Chart saved as: {output_file}")
-    plt.show()
-    
-    return fig
+    return output_file
 
 
 def print_correlation_matrix(correlation_matrix):
@@ -183,11 +113,8 @@ def print_current_indicators(current_values):
     print("\n" + "="*70)
     print("INDICATOR VALUES (Current)")
     print("="*70)
-    print(f"RSI: {current_values['RSI']:.2f}")
-    print(f"MACD: {current_values['MACD']:.2f}")
-    print(f"Bollinger: {current_values['Bollinger']:.2f}")
-    print(f"EMA: {current_values['EMA']:.2f}")
-    print(f"Volume: {current_values['Volume']:.2f}")
+    for indicator in INDICATORS:
+        print(f"{indicator}: {current_values[indicator]:.2f}")
     print("="*70)
 
 
@@ -199,17 +126,16 @@ def print_all_signals(all_results):
     
     print("\n📊 Individual Indicators:")
     individual = all_results['individual_signals']
-    for indicator in ['RSI', 'MACD', 'Bollinger', 'EMA', 'Volume']:
+    for indicator in INDICATORS:
         signal = individual.get(indicator, 0)
         rec = get_signal_description(signal)
         symbol = '+' if signal > 0 else '' if signal < 0 else ' '
         print(f"   - {indicator}: {symbol}{signal:.3f} ({rec})")
     
     print("\n🔬 Composite Methods:")
-    print(f"   - Simple Weighted: {all_results['simple_weighted']['score']:+.3f} ({all_results['simple_weighted']['recommendation']})")
-    print(f"   - Correlation-Adjusted: {all_results['correlation_adjusted']['score']:+.3f} ({all_results['correlation_adjusted']['recommendation']})")
-    print(f"   - Mahalanobis: {all_results['mahalanobis']['score']:+.3f} ({all_results['mahalanobis']['recommendation']})")
-    print(f"   - PCA Composite: {all_results['pca_composite']['score']:+.3f} ({all_results['pca_composite']['recommendation']})")
+    for key, label in CHART_METHODS:
+        score = all_results[key]['score']
+        print(f"   - {label}: {score:+.3f} ({get_signal_description(score)})")
     
     print("\n🔍 PCA Factors:")
     factors = all_results['pca_composite']['factors']
@@ -229,12 +155,7 @@ def compute_consensus(all_results):
     ]
     
     avg_score = np.mean(scores)
-    recommendations = [
-        all_results['simple_weighted']['recommendation'],
-        all_results['correlation_adjusted']['recommendation'],
-        all_results['mahalanobis']['recommendation'],
-        all_results['pca_composite']['recommendation']
-    ]
+    recommendations = [get_signal_description(score) for score in scores]
     
     unique_recs = set(recommendations)
     agreement = len(unique_recs) == 1
@@ -254,85 +175,192 @@ def compute_consensus(all_results):
     }
 
 
-def main():
-    """Main execution function"""
-    start_time = time.time()
-    
-    print("="*70)
-    print("CRYPTO CORRELATION ANALYSIS")
-    print("="*70)
-    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
-    
-    # Step 1: Fetch historical data
-    step_time = time.time()
-    coin_id = 'bitcoin'  # Can be changed
-    df = get_historical_data(coin_id, days=30)
-    if df is None:
-        print("❌ Failed to fetch data. Exiting.")
-        return
-    
-    print(f"⏱️  Data fetching: {time.time() - step_time:.2f}s")
-    
-    # Step 2: Compute indicator time series
-    step_time = time.time()
-    indicator_df = compute_indicator_time_series(df)
-    print(f"✅ Computed {len(indicator_df)} indicator data points")
-    print(f"⏱️  Indicator computation: {time.time() - step_time:.2f}s")
-    
-    # Step 3: Compute correlation matrix
-    step_time = time.time()
-    correlation_matrix = compute_correlation_matrix(indicator_df)
-    print(f"⏱️  Correlation matrix: {time.time() - step_time:.2f}s")
-    
-    # Step 4: Get current values
+def current_indicator_values(indicator_df):
+    """Current indicator values from the last row of the indicator series (no recomputation)"""
+    latest = indicator_df.iloc[-1]
+    values = {name: float(latest[name]) for name in INDICATORS}
+    # Signal line: mean of the last 9 MACD histogram values
+    values['MACD_Signal'] = float(indicator_df['MACD'].iloc[-9:].mean())
+    return values
+
+
+def analyze_coin(df, timings=None):
+    """
+    Indicators, correlation matrix, models and all method scores for one price series
+    timings: optional dict; seconds per stage are added to it
+    """
+    timings = timings if timings is not None else {}
+
+    def timed(stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+        return result
+
+    indicator_df = timed('indicators', compute_indicator_time_series, df)
+    correlation_matrix = timed('correlation', compute_correlation_matrix, indicator_df)
+    models = timed('models', fit_models, indicator_df)
+
     prices = df['price'].values
-    volumes = df['volume'].values
     price_change = (prices[-1] - prices[-5]) / prices[-5] * 100 if len(prices) >= 5 else 0
-    
-    # Calculate current indicator values using correlation_analysis functions
-    from correlation_analysis import calculate_rsi_series, calculate_macd_series, calculate_bollinger_position_series, calculate_ema_ratio_series, calculate_volume_ratio_series
-    
-    rsi_series = calculate_rsi_series(prices)
-    macd_series = calculate_macd_series(prices)
-    bb_series = calculate_bollinger_position_series(prices)
-    ema_series = calculate_ema_ratio_series(prices)
-    vol_series = calculate_volume_ratio_series(volumes)
-    
-    current_rsi = rsi_series[-1]
-    current_macd_hist = macd_series[-1]
-    # For MACD, we need signal line - use simple approach
-    macd_signal = np.mean(macd_series[-9:]) if len(macd_series) >= 9 else macd_series[-1]
-    current_bb = bb_series[-1]
-    current_ema = ema_series[-1]
-    current_vol = vol_series[-1]
-    
-    current_values = {
-        'RSI': current_rsi,
-        'MACD': current_macd_hist,
-        'MACD_Signal': macd_signal,
-        'Bollinger': current_bb,
-        'EMA': current_ema,
-        'Volume': current_vol
+    current_values = current_indicator_values(indicator_df)
+    all_results = timed('scoring', compute_all_methods, indicator_df, current_values, correlation_matrix,
+                        price_change, models=models)
+    return {
+        'indicator_df': indicator_df,
+        'correlation_matrix': correlation_matrix,
+        'current_values': current_values,
+        'all_results': all_results,
+        'consensus': compute_consensus(all_results),
+        'price': float(prices[-1]),
+        'price_change': float(price_change),
+        'as_of': df['timestamp'].iloc[-1].isoformat()
     }
-    
-    # Step 5: Compute all methods
-    step_time = time.time()
-    all_results = compute_all_methods(indicator_df, current_values, correlation_matrix, price_change)
-    print(f"⏱️  All methods computation: {time.time() - step_time:.2f}s")
-    
-    # Step 6: Print results
-    print_correlation_matrix(correlation_matrix)
-    
-    strong_corrs = find_strong_correlations(correlation_matrix, threshold=0.3)
+
+
+def report_row(coin_id, analysis):
+    """Flat report record of one coin's analysis"""
+    all_results = analysis['all_results']
+    consensus = analysis['consensus']
+    row = {
+        'coin': coin_id,
+        'as_of': analysis['as_of'],
+        'price': analysis['price'],
+        'price_change_pct': analysis['price_change']
+    }
+    for name in INDICATORS:
+        row[name] = analysis['current_values'][name]
+        row[f'{name}_signal'] = float(all_results['individual_signals'].get(name, 0))
+    for key, _ in CHART_METHODS:
+        row[key] = float(all_results[key]['score'])
+        row[f'{key}_recommendation'] = get_signal_description(all_results[key]['score'])
+    for factor in ('PC1', 'PC2', 'PC3'):
+        row[f'pca_{factor}'] = float(all_results['pca_composite']['factors'][factor])
+    row['consensus_score'] = float(consensus['average_score'])
+    row['consensus_recommendation'] = consensus['recommendation']
+    row['methods_agree'] = bool(consensus['agreement'])
+    return row
+
+
+def write_report(rows, path):
+    """Write report rows as CSV, JSON or Parquet, chosen by the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    df = pd.DataFrame(rows)
+    if ext == '.csv':
+        df.to_csv(path, index=False)
+    elif ext == '.json':
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+    elif ext == '.parquet':
+        # Needs pyarrow or fastparquet
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Unsupported report format '{ext}' (use .csv, .json or .parquet)")
+    return path
+
+
+class RateLimiter:
+    """Spaces request starts at least min_interval apart across threads"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        # Reserve the next slot under the lock, sleep outside it
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next)
+            self._next = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def fetch_coin(coin_id, days, limiter, attempts=3, deadline=None):
+    """
+    Fetch one coin under the rate limiter, retrying after rate limiting or outages
+    Waiting out an open upstream breaker does not use up an attempt, but stops at the
+    deadline (time.time() value). Returns None on failure.
+    """
+    attempt = 0
+    error = None
+    while attempt < attempts:
+        if deadline is not None and time.time() >= deadline:
+            print(f"❌ {coin_id}: gave up waiting for the upstream to recover")
+            return None
+        limiter.wait()
+        try:
+            return fetch_market_chart(coin_id, days)
+        except upstream.CircuitOpenError as e:
+            # No request was made; wait for the breaker's probe
+            time.sleep(max(min(e.retry_in, (deadline or float('inf')) - time.time()), limiter.min_interval))
+            continue
+        except requests.exceptions.HTTPError as e:
+            attempt += 1
+            status = e.response.status_code
+            if status != 429 and status < 500:
+                print(f"❌ {coin_id}: {e}")
+                return None
+            error = e
+        except Exception as e:
+            attempt += 1
+            error = e
+    print(f"❌ {coin_id}: giving up after {attempts} attempts ({error})")
+    return None
+
+
+def fetch_all(coin_ids, days, workers, min_interval, max_wait=600):
+    """
+    Fetch many coins concurrently; returns ({coin_id: DataFrame}, [failed coin ids])
+    max_wait bounds the seconds spent waiting out upstream back-offs.
+    """
+    limiter = RateLimiter(min_interval)
+    deadline = time.time() + max_wait
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(coin_ids)))) as pool:
+        frames = dict(zip(coin_ids, pool.map(lambda c: fetch_coin(c, days, limiter, deadline=deadline), coin_ids)))
+    failed = [c for c, df in frames.items() if df is None]
+    return {c: df for c, df in frames.items() if df is not None}, failed
+
+
+def read_universe(path):
+    """Coins listed in a universe file: a JSON list, or one or more per line (commas, # comments)"""
+    with open(path) as f:
+        text = f.read()
+    if path.lower().endswith('.json'):
+        return [str(c) for c in json.loads(text)]
+    coins = []
+    for line in text.splitlines():
+        line = line.split('#', 1)[0]
+        coins.extend(c.strip() for c in line.split(',') if c.strip())
+    return coins
+
+
+def resolve_coins(names):
+    """CoinGecko ids for symbols/ids/names via the saved coin list (ids pass through without one)"""
+    index = CoinIndex(load_coin_list())
+    coin_ids, unknown = [], []
+    for name in names:
+        coin_id = index.resolve(name) if index.has_snapshot else name.strip().lower()
+        if coin_id is None:
+            unknown.append(name)
+        elif coin_id not in coin_ids:
+            coin_ids.append(coin_id)
+    return coin_ids, unknown
+
+
+def print_details(analysis):
+    """Full printout of one coin's analysis"""
+    print_correlation_matrix(analysis['correlation_matrix'])
+
+    strong_corrs = find_strong_correlations(analysis['correlation_matrix'], threshold=0.3)
     print_strong_correlations(strong_corrs)
-    
-    print_current_indicators(current_values)
-    
-    print_all_signals(all_results)
-    
-    # Step 7: Compute consensus
-    consensus = compute_consensus(all_results)
+
+    print_current_indicators(analysis['current_values'])
+
+    print_all_signals(analysis['all_results'])
+
+    consensus = analysis['consensus']
     print("\n" + "="*70)
     print("CONSENSUS")
     print("="*70)
@@ -343,14 +371,118 @@ def main():
     print(f"   - Negative signals: {consensus['negative_count']}/4")
     print(f"   - Neutral signals: {consensus['neutral_count']}/4")
     print("="*70)
+
+
+def print_timings(timings, n_coins, total_time):
+    """Per-stage timings of the run"""
+    print("\n" + "="*70)
+    print("TIMINGS")
+    print("="*70)
+    for stage, seconds in timings.items():
+        per_coin = f"  ({seconds / n_coins * 1000:.1f} ms/coin)" if n_coins and stage != 'fetch' else ''
+        print(f"⏱️  {stage:<12} {seconds:8.2f}s{per_coin}")
+    print(f"⏱️  {'total':<12} {total_time:8.2f}s")
+    print("="*70)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Score coins with every correlation-aware method')
+    parser.add_argument('--coins', default='bitcoin', help='Comma-separated CoinGecko ids (or symbols with a coin list)')
+    parser.add_argument('--universe', help='File listing coins (JSON list, or one per line)')
+    parser.add_argument('--days', type=int, default=30, help='Days of hourly history per coin')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent fetch threads')
+    parser.add_argument('--min-interval', type=float,
+                        default=float(os.environ.get('COINGECKO_MIN_INTERVAL', 1.2)),
+                        help='Minimum seconds between upstream requests (shared by all threads)')
+    parser.add_argument('--output', help='Report file (.csv, .json or .parquet); default: none for one coin, '
+                                         'crypto_signals_report.csv for several')
+    parser.add_argument('--chart-dir', help='Render one signal chart per coin into this directory')
+    parser.add_argument('--chart-workers', type=int, default=None, help='Chart rendering processes')
+    parser.add_argument('--no-chart', action='store_true', help='Skip the single-coin chart')
+    args = parser.parse_args()
+
+    start_time = time.time()
+    
+    print("="*70)
+    print("CRYPTO CORRELATION ANALYSIS")
+    print("="*70)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+    
+    names = [c.strip() for c in args.coins.split(',') if c.strip()]
+    if args.universe:
+        names = read_universe(args.universe)
+    coin_ids, unknown = resolve_coins(names)
+    if unknown:
+        print(f"⚠️  Unknown coins skipped: {', '.join(unknown)}")
+    if not coin_ids:
+        print("❌ No coins to analyse. Exiting.")
+        return
     
-    # Step 8: Create visualization
+    # Step 1: Fetch historical data (concurrently, under one rate limiter)
+    timings = {}
     step_time = time.time()
-    create_bar_chart(all_results, current_values)
-    print(f"⏱️  Visualization: {time.time() - step_time:.2f}s")
+    frames, failed = fetch_all(coin_ids, args.days, args.workers, args.min_interval)
+    timings['fetch'] = time.time() - step_time
+    if failed:
+        print(f"❌ Failed to fetch: {', '.join(failed)}")
+    if not frames:
+        print("❌ Failed to fetch data. Exiting.")
+        return
+    print(f"⏱️  Data fetching: {timings['fetch']:.2f}s for {len(frames)} coins")
+    
+    # Steps 2-5: Indicators (computed once per coin), correlation matrix, models, all methods
+    analyses = {}
+    for coin_id in coin_ids:
+        if coin_id not in frames:
+            continue
+        try:
+            analyses[coin_id] = analyze_coin(frames[coin_id], timings)
+        except Exception as e:
+            print(f"❌ Analysis failed for {coin_id}: {e}")
+    
+    # Step 6: Print results (in full for a single coin, one line per coin otherwise)
+    if len(coin_ids) == 1 and analyses:
+        print_details(analyses[coin_ids[0]])
+    else:
+        print("\n" + "="*70)
+        print(f"{'COIN':<20} {'PRICE':>14} {'SCORE':>8}  RECOMMENDATION")
+        print("="*70)
+        for coin_id, analysis in sorted(analyses.items(), key=lambda kv: -kv[1]['consensus']['average_score']):
+            consensus = analysis['consensus']
+            print(f"{coin_id:<20} {analysis['price']:>14.6g} {consensus['average_score']:>+8.3f}  "
+                  f"{consensus['recommendation']}{'' if consensus['agreement'] else ' (mixed)'}")
+    
+    # Step 7: Consolidated report
+    output = args.output or (None if len(coin_ids) == 1 else 'crypto_signals_report.csv')
+    if output and analyses:
+        step_time = time.time()
+        try:
+            write_report([report_row(c, a) for c, a in analyses.items()], output)
+            print(f"\n✅ Report saved as: {output} ({len(analyses)} coins)")
+        except (ImportError, ValueError) as e:
+            print(f"❌ Report not written: {e}")
+        timings['report'] = time.time() - step_time
+    
+    # Step 8: Visualization (charts of unchanged coins are skipped)
+    step_time = time.time()
+    if args.chart_dir:
+        charts = render_charts([
+            {'coin': c, 'version': data_version(frames[c]), 'rows': chart_rows(a['all_results']),
+             'title': f"{c} - All Methods Comparison"}
+            for c, a in analyses.items()
+        ], args.chart_dir, workers=args.chart_workers)
+        print(f"✅ Charts in {args.chart_dir}: {len(charts['rendered'])} rendered, {len(charts['skipped'])} unchanged")
+        timings['charts'] = time.time() - step_time
+    elif len(coin_ids) == 1 and analyses and not args.no_chart:
+        analysis = analyses[coin_ids[0]]
+        create_bar_chart(analysis['all_results'], analysis['current_values'])
+        timings['charts'] = time.time() - step_time
     
     # Final summary
     total_time = time.time() - start_time
+    print_timings(timings, len(analyses), total_time)
     print(f"\n✅ Analysis complete in {total_time:.2f} seconds")
     print(f"Ended at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
@@ -358,4 +490,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
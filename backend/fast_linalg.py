@@ -0,0 +1,165 @@
+"""
+Lightweight Linear Algebra for the Scoring Methods
+Standardization, PCA and Mahalanobis distance for small indicator matrices with NumPy
+(and scipy's triangular solve), without scikit-learn's import cost and per-call input
+validation.
+
+Every function works on a single (n_samples, n_features) matrix or on a stack of them
+(..., n_samples, n_features), e.g. one matrix per coin, and matches the outputs of
+StandardScaler, PCA and scipy's mahalanobis within floating-point tolerance.
+"""
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
+
+def standardize_fit(X):
+    """
+    Per-column mean and population std (ddof=0), as StandardScaler.fit
+    Constant columns get scale 1 so they standardize to 0 instead of NaN.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    mean = X.mean(axis=-2)
+    scale = X.std(axis=-2)
+    scale = np.where(scale < 10 * np.finfo(np.float64).eps, 1.0, scale)
+    return mean, scale
+
+
+def standardize(X, mean, scale):
+    """Apply a fitted standardization; X is (..., n_features) or (..., m, n_features)"""
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == mean.ndim:
+        # One row per stacked model
+        return (X - mean) / scale
+    return (X - mean[..., None, :]) / scale[..., None, :]
+
+
+def _orient_by_scores(components, scores):
+    """
+    Flip each component so the sample with the largest |score| has a positive score
+    This is the sign convention of sklearn's PCA (svd_flip on U), so scores match it.
+    """
+    idx = np.argmax(np.abs(scores), axis=-2)
+    picked = np.take_along_axis(scores, idx[..., None, :], axis=-2)
+    signs = np.where(picked < 0, -1.0, 1.0)
+    return components * np.swapaxes(signs, -1, -2), scores * signs
+
+
+def pca_fit(X, n_components):
+    """
+    PCA by eigendecomposition of the sample covariance
+    Returns a dict with mean, components (k, n_features), explained_variance,
+    explained_variance_ratio and the training scores (n_samples, k), stacked if X is.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n = X.shape[-2]
+    mean = X.mean(axis=-2)
+    centered = X - mean[..., None, :]
+    cov = np.swapaxes(centered, -1, -2) @ centered / (n - 1)
+
+    # eigh returns ascending eigenvalues; keep the top n_components in descending order
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    eigvals = np.clip(eigvals[..., ::-1], 0.0, None)
+    eigvecs = eigvecs[..., ::-1]
+
+    components = np.swapaxes(eigvecs[..., :n_components], -1, -2)
+    scores = centered @ np.swapaxes(components, -1, -2)
+    components, scores = _orient_by_scores(components, scores)
+
+    explained_variance = eigvals[..., :n_components]
+    total_variance = eigvals.sum(axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        explained_variance_ratio = np.where(total_variance > 0, explained_variance / total_variance, 0.0)
+
+    return {
+        'mean': mean,
+        'components': components,
+        'explained_variance': explained_variance,
+        'explained_variance_ratio': explained_variance_ratio,
+        'scores': scores
+    }
+
+
+def pca_transform(X, model):
+    """Project rows onto fitted components; X is (..., n_features) or (..., m, n_features)"""
+    X = np.asarray(X, dtype=np.float64)
+    components = model['components']
+    if X.ndim == components.ndim - 1:
+        # One row per stacked model
+        return np.einsum('...kd,...d->...k', components, X - model['mean'])
+    return (X - model['mean'][..., None, :]) @ np.swapaxes(components, -1, -2)
+
+
+def robust_cholesky(cov, jitter=1e-6, max_tries=8):
+    """
+    Cholesky factor with jitter escalation for (stacked) covariance matrices
+    The first attempt adds `jitter` to the diagonal; matrices that are still not positive
+    definite are retried with 10x more each time, relative to their mean variance.
+    Returns (chol, jitter_used); matrices with non-finite entries or that never factor
+    get NaN factors and NaN jitter, so downstream distances come out NaN.
+    """
+    cov = np.asarray(cov, dtype=np.float64)
+    d = cov.shape[-1]
+    flat = cov.reshape(-1, d, d)
+    chol = np.full_like(flat, np.nan)
+    used = np.full(len(flat), np.nan)
+    eye = np.eye(d)
+
+    scale = np.maximum(np.abs(np.trace(flat, axis1=1, axis2=2)) / d, 1.0)
+    pending = np.flatnonzero(np.all(np.isfinite(flat), axis=(1, 2)))
+    for attempt in range(max_tries):
+        if len(pending) == 0:
+            break
+        amount = jitter if attempt == 0 else jitter * 10 ** attempt * scale[pending]
+        amount = np.broadcast_to(amount, pending.shape)
+        try:
+            # Common case: the whole stack factors in one call
+            chol[pending] = np.linalg.cholesky(flat[pending] + amount[:, None, None] * eye)
+            used[pending] = amount
+            pending = pending[:0]
+        except np.linalg.LinAlgError:
+            failed = []
+            for i, a in zip(pending, amount):
+                try:
+                    chol[i] = np.linalg.cholesky(flat[i] + a * eye)
+                    used[i] = a
+                except np.linalg.LinAlgError:
+                    failed.append(i)
+            pending = np.array(failed, dtype=int)
+
+    return chol.reshape(cov.shape), used.reshape(cov.shape[:-2])
+
+
+def solve_lower(chol, b):
+    """
+    Solve L z = b for lower-triangular L (..., d, d) and b (..., d, k)
+    A single factor goes to LAPACK's triangular solve. scipy's solve_triangular does not
+    broadcast over stacks, so stacked factors use forward substitution, one vectorized
+    step per row.
+    """
+    if chol.ndim == 2 and b.ndim == 2:
+        if not np.all(np.isfinite(chol)):
+            return np.full(b.shape, np.nan)
+        return solve_triangular(chol, b, lower=True, check_finite=False)
+    shape = np.broadcast_shapes(chol.shape[:-2], b.shape[:-2]) + b.shape[-2:]
+    z = np.empty(shape)
+    for i in range(chol.shape[-1]):
+        partial = np.einsum('...j,...jk->...k', chol[..., i, :i], z[..., :i, :])
+        z[..., i, :] = (b[..., i, :] - partial) / chol[..., i, i:i + 1]
+    return z
+
+
+def mahalanobis_to_references(points, references, chol):
+    """
+    Mahalanobis distances from many points to several reference points in one solve
+    points (..., m, d), references (r, d), chol (..., d, d) the Cholesky factor of the
+    covariance. Each difference is whitened with one triangular system L z = x - ref.
+    Returns distances of shape (..., m, r).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    references = np.asarray(references, dtype=np.float64)
+    diff = points[..., :, None, :] - references                     # (..., m, r, d)
+    m, r, d = diff.shape[-3:]
+    stacked = np.swapaxes(diff.reshape(diff.shape[:-3] + (m * r, d)), -1, -2)
+    z = solve_lower(chol, stacked)                                  # (..., d, m*r)
+    return np.sqrt(np.sum(z ** 2, axis=-2)).reshape(diff.shape[:-1])
@@ -0,0 +1,185 @@
+"""
+Multi-Coin Indicator Engine
+Computes RSI, MACD, Bollinger position, EMA ratio and volume ratio for many coins at
+once on a coins x time matrix, instead of one pandas pipeline per coin.
+
+Coins are aligned onto a common timestamp grid; gaps inside a series are forward-filled
+and flagged, and coins that start later are left-aligned while their indicators run so
+every kernel sees exactly the bars it would see for that coin alone. The recursive
+smoothers (EMA, MACD, Wilder's RSI) run as IIR filters along the time axis
+(scipy.signal.lfilter) and the rolling statistics as column-wise pandas windows.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from correlation_analysis import INDICATORS
+
+
+def align_frames(frames, coin_ids=None, freq='1h'):
+    """
+    Align per-coin DataFrames (timestamp, price, volume) onto one timestamp grid
+    Timestamps are floored to `freq` (last observation wins). The grid runs from the
+    earliest to the latest bar of any coin.
+    Returns a dict with coins, timestamps, prices and volumes (coins x T, NaN before a
+    coin's first bar) and filled (True where a missing bar was forward-filled).
+    """
+    coin_ids = list(coin_ids or frames.keys())
+    price_cols = {}
+    volume_cols = {}
+    for coin_id in coin_ids:
+        df = frames[coin_id]
+        index = df['timestamp'].dt.floor(freq)
+        keep = ~index.duplicated(keep='last').values
+        price_cols[coin_id] = pd.Series(df['price'].values[keep], index=index[keep])
+        volume_cols[coin_id] = pd.Series(df['volume'].values[keep], index=index[keep])
+
+    raw_prices = pd.DataFrame(price_cols)
+    grid = pd.date_range(raw_prices.index.min(), raw_prices.index.max(), freq=freq)
+    raw_prices = raw_prices.reindex(grid)
+    raw_volumes = pd.DataFrame(volume_cols).reindex(grid)
+
+    prices = raw_prices.ffill()
+    volumes = raw_volumes.ffill()
+    filled = raw_prices.isna() & prices.notna()
+
+    return {
+        'coins': coin_ids,
+        'timestamps': grid,
+        'prices': prices[coin_ids].to_numpy(dtype=np.float64).T,
+        'volumes': volumes[coin_ids].to_numpy(dtype=np.float64).T,
+        'filled': filled[coin_ids].to_numpy().T
+    }
+
+
+def _left_align(matrix, starts):
+    """Shift each row so its first valid bar is in column 0 (NaN padding at the end)"""
+    shifted = np.full_like(matrix, np.nan)
+    T = matrix.shape[1]
+    for c, start in enumerate(starts):
+        shifted[c, :T - start] = matrix[c, start:]
+    return shifted
+
+
+def _right_align(matrix, starts):
+    """Inverse of _left_align"""
+    restored = np.full_like(matrix, np.nan)
+    T = matrix.shape[1]
+    for c, start in enumerate(starts):
+        restored[c, start:] = matrix[c, :T - start]
+    return restored
+
+
+def ewm_matrix(x, span):
+    """pandas ewm(span, adjust=False).mean() along axis 1, for left-aligned rows"""
+    alpha = 2.0 / (span + 1.0)
+    zi = ((1 - alpha) * x[:, :1])
+    return lfilter([alpha], [1.0, alpha - 1.0], x, axis=1, zi=zi)[0]
+
+
+def rsi_matrix(prices, period=14):
+    """calculate_rsi_series along axis 1 (Wilder's smoothing as an IIR filter)"""
+    C, T = prices.shape
+    rsi = np.full((C, T), 50.0)
+    if T <= period:
+        return rsi
+    deltas = np.diff(prices, axis=1)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    # avg[t] = avg[t-1] * (period - 1) / period + x / period, seeded with the first-period mean
+    decay = (period - 1) / period
+    avg_gain0 = gains[:, :period].mean(axis=1, keepdims=True)
+    avg_loss0 = losses[:, :period].mean(axis=1, keepdims=True)
+    avg_gain = np.concatenate([avg_gain0, lfilter([1.0 / period], [1.0, -decay], gains[:, period:],
+                                                  axis=1, zi=decay * avg_gain0)[0]], axis=1)
+    avg_loss = np.concatenate([avg_loss0, lfilter([1.0 / period], [1.0, -decay], losses[:, period:],
+                                                  axis=1, zi=decay * avg_loss0)[0]], axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    rsi[:, period:] = values
+    # NaN padding stays NaN rather than the neutral 50
+    rsi[np.isnan(prices)] = np.nan
+    return rsi
+
+
+def macd_histogram_matrix(prices, fast=12, slow=26, signal_span=9):
+    """calculate_macd_series along axis 1"""
+    macd = ewm_matrix(prices, fast) - ewm_matrix(prices, slow)
+    return macd - ewm_matrix(macd, signal_span)
+
+
+def bollinger_position_matrix(prices, period=20):
+    """calculate_bollinger_position_series along axis 1"""
+    frame = pd.DataFrame(prices.T)
+    sma = frame.rolling(window=period).mean().to_numpy().T
+    std = frame.rolling(window=period).std().to_numpy().T
+    upper_band = sma + (std * 2)
+    lower_band = sma - (std * 2)
+    band_width = upper_band - lower_band
+    with np.errstate(divide='ignore', invalid='ignore'):
+        positions = np.where(band_width == 0, 0.5, (prices - lower_band) / band_width)
+    positions[:, :period] = 0.0
+    positions[np.isnan(prices)] = np.nan
+    return positions
+
+
+def ema_ratio_matrix(prices, period=20):
+    """calculate_ema_ratio_series along axis 1"""
+    return prices / ewm_matrix(prices, period)
+
+
+def volume_ratio_matrix(volumes, period=20):
+    """calculate_volume_ratio_series along axis 1"""
+    avg_volumes = pd.DataFrame(volumes.T).rolling(window=period).mean().to_numpy().T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = volumes / avg_volumes
+    padding = np.isnan(volumes)
+    ratios = np.nan_to_num(ratios, nan=1.0, posinf=1.0, neginf=1.0)
+    ratios[padding] = np.nan
+    return ratios
+
+
+def compute_indicator_matrix(frames, coin_ids=None, freq='1h', rsi_period=14, macd_spans=(12, 26, 9),
+                             bb_period=20, ema_period=20, volume_period=20):
+    """
+    Indicators for several coins at once
+    frames: {coin_id: DataFrame with timestamp, price, volume}
+    Returns the align_frames dict plus:
+      indicators: {name: coins x T matrix} (NaN before a coin's first bar)
+      values:     coins x T x 5 tensor in INDICATORS order
+      valid:      coins x T mask of bars where the coin has data
+    """
+    aligned = align_frames(frames, coin_ids, freq)
+    prices = aligned['prices']
+    volumes = aligned['volumes']
+
+    # Left-align so every coin's kernels start at its own first bar
+    starts = np.argmax(~np.isnan(prices), axis=1)
+    p = _left_align(prices, starts)
+    v = _left_align(volumes, starts)
+
+    indicators = {
+        'RSI': rsi_matrix(p, rsi_period),
+        'MACD': macd_histogram_matrix(p, *macd_spans),
+        'Bollinger': bollinger_position_matrix(p, bb_period),
+        'EMA': ema_ratio_matrix(p, ema_period),
+        'Volume': volume_ratio_matrix(v, volume_period)
+    }
+    indicators = {name: _right_align(matrix, starts) for name, matrix in indicators.items()}
+
+    aligned['indicators'] = indicators
+    aligned['values'] = np.stack([indicators[name] for name in INDICATORS], axis=-1)
+    aligned['valid'] = ~np.isnan(prices)
+    return aligned
+
+
+def latest_values(result):
+    """Latest indicator row per coin: {coin_id: {indicator: value}}"""
+    latest = {}
+    for c, coin_id in enumerate(result['coins']):
+        row = result['values'][c, -1]
+        latest[coin_id] = {name: float(row[i]) for i, name in enumerate(INDICATORS)}
+    return latest
@@ -0,0 +1,128 @@
+"""
+Indicator Registry
+Every indicator declares a vectorized batch kernel and its normalizer to the
+-1 to +1 signal scale.
+
+Core indicators (RSI, MACD, Bollinger, EMA, Volume; registered by correlation_analysis)
+also carry their Method 1 weight and Method 3 reference coordinates, and feed every
+composite scoring method. Extra indicators are computed only when asked for, so the
+shared pipeline does not get slower as indicators are added.
+
+CoinGecko's market_chart only provides close prices and volumes, so the extra
+indicators here use close-only variants (ATR from close-to-close moves, Stochastic
+over the closing range).
+"""
+
+import numpy as np
+import pandas as pd
+
+# name -> spec dict, in registration order
+INDICATOR_REGISTRY = {}
+
+
+def register_indicator(name, batch, normalize=None, params=None, core=False, weight=None,
+                       references=None):
+    """
+    Add an indicator to the registry
+    batch:       batch(prices, volumes, **params) -> array aligned with prices (NaN during warm-up)
+    normalize:   array -> signals in [-1, 1]; None for non-directional indicators
+    params:      default keyword parameters for batch
+    core, weight, references: core indicators only; Method 1 weight and the
+                 (neutral, bullish, bearish) coordinates used by Method 3
+    """
+    INDICATOR_REGISTRY[name] = {
+        'name': name,
+        'batch': batch,
+        'normalize': normalize,
+        'params': dict(params or {}),
+        'core': core,
+        'weight': weight,
+        'references': references
+    }
+
+
+def core_indicators():
+    """Names of the indicators used by the composite scoring methods"""
+    return [name for name, spec in INDICATOR_REGISTRY.items() if spec['core']]
+
+
+def extra_indicators():
+    """Names of the optional indicators"""
+    return [name for name, spec in INDICATOR_REGISTRY.items() if not spec['core']]
+
+
+def compute_indicators(prices, volumes, names=None, params=None, bars_per_year=None):
+    """
+    Run batch kernels over one price/volume series
+    names: indicators to compute (default: core); params: optional {name: {param: value}}
+    bars_per_year: bar frequency of the series, passed to annualized indicators
+                   (those with a bars_per_year parameter); default hourly
+    Returns {name: array}.
+    """
+    names = names or core_indicators()
+    params = params or {}
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+
+    series = {}
+    for name in names:
+        spec = INDICATOR_REGISTRY[name]
+        kwargs = {**spec['params'], **params.get(name, {})}
+        if bars_per_year is not None and 'bars_per_year' in spec['params']:
+            kwargs['bars_per_year'] = bars_per_year
+        series[name] = spec['batch'](prices, volumes, **kwargs)
+    return series
+
+
+# ---------------------------------------------------------------------------
+# Extra indicators (close-only variants; not part of the composite scores)
+# ---------------------------------------------------------------------------
+
+def atr_percent_series(prices, volumes, period=14):
+    """Average true range from close-to-close moves (Wilder smoothing), as % of price"""
+    true_range = np.abs(np.diff(prices, prepend=np.nan))
+    atr = pd.Series(true_range).ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+    return atr.to_numpy() / prices * 100
+
+
+def obv_flow_series(prices, volumes, period=20):
+    """On-balance volume change over `period` bars divided by the volume traded, in [-1, 1]"""
+    direction = np.sign(np.diff(prices, prepend=prices[:1]))
+    obv = np.cumsum(direction * volumes)
+    change = pd.Series(obv).diff(period)
+    traded = pd.Series(volumes).rolling(period).sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (change / traded).to_numpy()
+
+
+def stochastic_k_series(prices, volumes, period=14):
+    """Stochastic %K over the closing-price range of the last `period` bars (0-100)"""
+    series = pd.Series(prices)
+    low = series.rolling(period).min()
+    high = series.rolling(period).max()
+    span = (high - low).replace(0, np.nan)
+    return (100 * (series - low) / span).fillna(50.0).where(low.notna()).to_numpy()
+
+
+def realized_volatility_series(prices, volumes, period=24, bars_per_year=24 * 365):
+    """Annualized standard deviation of log returns over the last `period` bars (%)"""
+    returns = pd.Series(np.log(prices)).diff()
+    return (returns.rolling(period).std() * np.sqrt(bars_per_year) * 100).to_numpy()
+
+
+register_indicator(
+    'ATR', atr_percent_series, params={'period': 14}
+)
+register_indicator(
+    'OBV', obv_flow_series, params={'period': 20},
+    # Net buying volume -> positive, net selling -> negative
+    normalize=lambda value: np.clip(value, -1, 1)
+)
+register_indicator(
+    'Stochastic', stochastic_k_series, params={'period': 14},
+    # %K < 20 oversold (BUY), > 80 overbought (SELL)
+    normalize=lambda value: np.clip((50 - value) / 30.0, -1, 1)
+)
+register_indicator(
+    'RealizedVol', realized_volatility_series, params={'period': 24, 'bars_per_year': 24 * 365}
+)
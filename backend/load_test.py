@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Load Generator for the Crypto Analysis API
+Replays a dashboard-like request mix at a fixed concurrency and reports
+latency percentiles (p50/p95/p99) and throughput per endpoint.
+
+Usage (against the local CoinGecko stand-in):
+    python mock_coingecko.py --port 8900 &
+    COINGECKO_BASE_URL=http://localhost:8900/api/v3 python app.py &
+    python load_test.py --concurrency 16 --duration 60
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+# Endpoint templates and their share of dashboard traffic.
+# The main dashboard polls analyze + price-history for the selected coin,
+# the Advanced Analysis tab adds advanced-analysis + indicator-history.
+DEFAULT_MIX = {
+    'analyze': 0.40,
+    'price-history': 0.30,
+    'advanced': 0.15,
+    'indicator-history': 0.15
+}
+
+ENDPOINTS = {
+    'analyze': '/analyze/{coin}',
+    'advanced': '/advanced-analysis/{coin}',
+    'price-history': '/price-history/{coin}',
+    'indicator-history': '/indicator-history/{coin}'
+}
+
+# Coins in rough order of popularity; picked with Zipf-like weights
+DEFAULT_COINS = ['BTC', 'ETH', 'SOL', 'XRP', 'BNB', 'DOGE', 'ADA',
+                 'AVAX', 'LINK', 'DOT', 'LTC', 'MATIC', 'TRX', 'SHIB']
+
+
+def parse_mix(mix_str):
+    """Parse 'analyze=0.5,advanced=0.5' into a normalized weight dict"""
+    mix = {}
+    for part in mix_str.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}'. Choose from: {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight)
+    total = sum(mix.values())
+    return {k: v / total for k, v in mix.items()}
+
+
+def percentile_summary(latencies):
+    """Return count, mean and p50/p95/p99 in milliseconds"""
+    if not latencies:
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0}
+    arr = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        'count': int(len(arr)),
+        'mean_ms': float(arr.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99)
+    }
+
+
+def run_load(target, mix, coins, concurrency, duration=None, total_requests=None, timeout=30, seed=0):
+    """
+    Run the load test and return the raw samples
+    Each sample is (endpoint_name, status_code, latency_seconds); status 0 means a client error
+    """
+    samples = []
+    samples_lock = threading.Lock()
+    issued = [0]
+    issued_lock = threading.Lock()
+
+    names = list(mix.keys())
+    weights = [mix[n] for n in names]
+    coin_weights = [1.0 / (rank + 1) for rank in range(len(coins))]
+
+    deadline = time.time() + duration if duration else None
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        session = requests.Session()
+        local = []
+        while True:
+            if deadline is not None and time.time() >= deadline:
+                break
+            if total_requests is not None:
+                with issued_lock:
+                    if issued[0] >= total_requests:
+                        break
+                    issued[0] += 1
+
+            name = rng.choices(names, weights=weights)[0]
+            coin = rng.choices(coins, weights=coin_weights)[0]
+            url = target + ENDPOINTS[name].format(coin=coin)
+
+            start = time.perf_counter()
+            try:
+                response = session.get(url, timeout=timeout)
+                status = response.status_code
+            except requests.exceptions.RequestException:
+                status = 0
+            local.append((name, status, time.perf_counter() - start))
+
+        with samples_lock:
+            samples.extend(local)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(worker, i) for i in range(concurrency)]
+    # Re-raise a worker's exception instead of silently reporting fewer samples
+    for future in futures:
+        future.result()
+
+    return samples
+
+
+def build_report(samples, elapsed):
+    """Aggregate samples into an overall and per-endpoint report"""
+    report = {
+        'elapsed_s': elapsed,
+        'throughput_rps': len(samples) / elapsed if elapsed > 0 else 0.0,
+        'overall': percentile_summary([s[2] for s in samples]),
+        'errors': sum(1 for s in samples if s[1] != 200),
+        'endpoints': {}
+    }
+    for name in ENDPOINTS:
+        subset = [s for s in samples if s[0] == name]
+        if not subset:
+            continue
+        summary = percentile_summary([s[2] for s in subset])
+        summary['errors'] = sum(1 for s in subset if s[1] != 200)
+        summary['status_codes'] = {str(code): sum(1 for s in subset if s[1] == code)
+                                   for code in sorted(set(s[1] for s in subset))}
+        report['endpoints'][name] = summary
+    return report
+
+
+def print_report(report, concurrency):
+    """Print the report as a table"""
+    print("\n" + "="*78)
+    print(f"LOAD TEST RESULTS (concurrency={concurrency}, {report['elapsed_s']:.1f}s)")
+    print("="*78)
+    print(f"{'endpoint':<20}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    print("-"*78)
+    for name, s in report['endpoints'].items():
+        print(f"{name:<20}{s['count']:>8}{s['errors']:>8}{s['p50_ms']:>10.1f}"
+              f"{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['mean_ms']:>10.1f}")
+    print("-"*78)
+    o = report['overall']
+    print(f"{'ALL':<20}{o['count']:>8}{report['errors']:>8}{o['p50_ms']:>10.1f}"
+          f"{o['p95_ms']:>10.1f}{o['p99_ms']:>10.1f}{o['mean_ms']:>10.1f}")
+    print("="*78)
+    print(f"Throughput: {report['throughput_rps']:.2f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dashboard load generator for the Crypto Analysis API')
+    parser.add_argument('--target', default='http://localhost:8000/api', help='API base URL')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run (ignored with --requests)')
+    parser.add_argument('--requests', type=int, default=None, help='Stop after this many requests')
+    parser.add_argument('--mix', default=None,
+                        help='Endpoint weights, e.g. analyze=0.4,price-history=0.3,advanced=0.15,indicator-history=0.15')
+    parser.add_argument('--coins', default=','.join(DEFAULT_COINS), help='Comma-separated symbols')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', dest='json_out', default=None, help='Also write the report to this JSON file')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    coins = [c.strip().upper() for c in args.coins.split(',') if c.strip()]
+    duration = None if args.requests else args.duration
+
+    print(f"Target: {args.target}")
+    print(f"Mix: {', '.join(f'{k}={v:.2f}' for k, v in mix.items())}")
+    print(f"Coins: {', '.join(coins)}")
+
+    start = time.time()
+    samples = run_load(args.target.rstrip('/'), mix, coins, args.concurrency,
+                       duration=duration, total_requests=args.requests,
+                       timeout=args.timeout, seed=args.seed)
+    report = build_report(samples, time.time() - start)
+    print_report(report, args.concurrency)
+
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Lightweight In-Process Metrics
+Thread-safe counters and timers shared by the API modules and exposed via /api/metrics
+"""
+
+import threading
+
+_counters = {}
+_timers = {}
+_gauges = {}
+_lock = threading.Lock()
+
+
+def increment(name, value=1):
+    """Increase a named counter"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name, seconds):
+    """Record one duration sample for a named timer"""
+    with _lock:
+        timer = _timers.get(name)
+        if timer is None:
+            timer = {'count': 0, 'total_s': 0.0, 'max_s': 0.0}
+            _timers[name] = timer
+        timer['count'] += 1
+        timer['total_s'] += seconds
+        timer['max_s'] = max(timer['max_s'], seconds)
+
+
+def register_gauge(name, func):
+    """Register a callable evaluated on every snapshot (e.g. derived ratios)"""
+    with _lock:
+        _gauges[name] = func
+
+
+def get_counter(name):
+    """Current value of a counter (0 if never incremented)"""
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot():
+    """Return a JSON-serializable copy of all metrics"""
+    with _lock:
+        counters = dict(_counters)
+        timers = {
+            name: {
+                'count': t['count'],
+                'total_s': t['total_s'],
+                'mean_s': t['total_s'] / t['count'] if t['count'] else 0.0,
+                'max_s': t['max_s']
+            }
+            for name, t in _timers.items()
+        }
+        gauges = dict(_gauges)
+
+    # Gauges may read counters themselves, so evaluate them outside the lock
+    gauge_values = {}
+    for name, func in gauges.items():
+        try:
+            gauge_values[name] = func()
+        except Exception as e:
+            gauge_values[name] = f"error: {e}"
+
+    return {'counters': counters, 'timers': timers, 'gauges': gauge_values}
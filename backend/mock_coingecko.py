@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Local CoinGecko Stand-in
+Serves the CoinGecko endpoints used by app.py with deterministic synthetic data,
+so the API can be developed and load-tested offline without hitting rate limits.
+
+Endpoints (mounted under /api/v3 like the real API):
+- /coins/<id>/market_chart        (vs_currency, days)
+- /coins/<id>/market_chart/range  (vs_currency, from, to in UNIX seconds)
+- /simple/price              (ids, vs_currencies, include_24hr_change, include_last_updated_at)
+- /coins/list
+
+Usage:
+    python mock_coingecko.py --port 8900 --latency 0.05 --error-rate 0.05
+    COINGECKO_BASE_URL=http://localhost:8900/api/v3 python app.py
+"""
+
+import argparse
+import random
+import threading
+import time
+import zlib
+
+import numpy as np
+from scipy.signal import lfilter
+from flask import Flask, jsonify, request
+
+app = Flask(__name__)
+
+# Known coins (CoinGecko ID -> approximate base price in USD)
+# Prices only anchor the synthetic random walk, they are not meant to be realistic
+MOCK_COINS = {
+    'bitcoin': 60000.0,
+    'ethereum': 3000.0,
+    'ripple': 0.6,
+    'solana': 150.0,
+    'cardano': 0.45,
+    'dogecoin': 0.12,
+    'binancecoin': 550.0,
+    'matic-network': 0.7,
+    'litecoin': 80.0,
+    'polkadot': 7.0,
+    'avalanche-2': 35.0,
+    'shiba-inu': 0.00002,
+    'tron': 0.12,
+    'chainlink': 15.0
+}
+
+# Symbol and name for /coins/list (extra synthetic coins get generated ones)
+MOCK_COIN_INFO = {
+    'bitcoin': ('btc', 'Bitcoin'),
+    'ethereum': ('eth', 'Ethereum'),
+    'ripple': ('xrp', 'XRP'),
+    'solana': ('sol', 'Solana'),
+    'cardano': ('ada', 'Cardano'),
+    'dogecoin': ('doge', 'Dogecoin'),
+    'binancecoin': ('bnb', 'BNB'),
+    'matic-network': ('matic', 'Polygon'),
+    'litecoin': ('ltc', 'Litecoin'),
+    'polkadot': ('dot', 'Polkadot'),
+    'avalanche-2': ('avax', 'Avalanche'),
+    'shiba-inu': ('shib', 'Shiba Inu'),
+    'tron': ('trx', 'TRON'),
+    'chainlink': ('link', 'Chainlink')
+}
+
+# Listed without price data, so symbol collisions can be exercised offline
+MOCK_LISTED_ONLY = [
+    {'id': 'ethereum-wormhole', 'symbol': 'eth', 'name': 'Ethereum (Wormhole)'},
+    {'id': 'bitcoin-avalanche-bridged-btc-b', 'symbol': 'btc.b', 'name': 'Bitcoin Avalanche Bridged (BTC.b)'},
+    {'id': 'solana-wormhole', 'symbol': 'sol', 'name': 'Solana (Wormhole)'}
+]
+
+# Synthetic history starts here (2020-01-01 UTC) and is generated in yearly blocks
+ORIGIN_MS = 1577836800000
+HOUR_MS = 3600 * 1000
+BLOCK_HOURS = 24 * 365
+
+# Server behaviour, overridden from the command line
+_config = {
+    'latency': 0.0,        # mean added latency in seconds
+    'jitter': 0.0,         # uniform +/- jitter in seconds
+    'error_rate': 0.0,     # probability of answering 429
+    'rate_limit': 0        # max upstream calls per minute (0 = unlimited)
+}
+
+_path_cache = {}
+_path_lock = threading.Lock()
+
+_stats = {'requests': 0, 'rate_limited': 0, 'market_chart': 0, 'market_chart_range': 0, 'simple_price': 0,
+          'coins_list': 0}
+_stats_lock = threading.Lock()
+_request_times = []
+_rng = random.Random(0)
+
+
+def _coin_seed(coin_id):
+    """Stable per-coin seed so every run serves identical data"""
+    return zlib.crc32(coin_id.encode('utf-8'))
+
+
+def _generate_block(coin_id, block_idx):
+    """Generate one year of hourly log-returns and volume multipliers"""
+    rng = np.random.default_rng([_coin_seed(coin_id), block_idx])
+    returns = rng.normal(0.0, 0.008, BLOCK_HOURS)
+    volume_noise = rng.lognormal(0.0, 0.35, BLOCK_HOURS)
+    return returns, volume_noise
+
+
+def get_coin_path(coin_id, n_hours):
+    """Return (prices, volumes) for the first n_hours bars since ORIGIN_MS"""
+    with _path_lock:
+        cached = _path_cache.get(coin_id)
+        if cached is None or len(cached[0]) < n_hours:
+            n_blocks = n_hours // BLOCK_HOURS + 1
+            blocks = [_generate_block(coin_id, i) for i in range(n_blocks)]
+            returns = np.concatenate([b[0] for b in blocks])
+            volume_noise = np.concatenate([b[1] for b in blocks])
+
+            base_price = MOCK_COINS.get(coin_id, 1.0 + _coin_seed(coin_id) % 1000)
+            # Mean-reverting AR(1) log price keeps years of history near the base price,
+            # a slow sinusoidal regime on top keeps the indicators moving
+            log_dev = lfilter([1.0], [1.0, -0.999], returns)
+            t = np.arange(len(returns))
+            regime = 0.15 * np.sin(2 * np.pi * t / (24 * 45))
+            prices = base_price * np.exp(log_dev + regime)
+            volumes = prices * 2.5e4 * volume_noise
+            cached = (prices, volumes)
+            _path_cache[coin_id] = cached
+    return cached[0][:n_hours], cached[1][:n_hours]
+
+
+def _current_hour_index():
+    """Index of the most recent completed hourly bar"""
+    return int((time.time() * 1000 - ORIGIN_MS) // HOUR_MS)
+
+
+def build_market_chart(coin_id, days):
+    """Build a market_chart payload with CoinGecko's granularity rules"""
+    end_idx = _current_hour_index()
+    prices, volumes = get_coin_path(coin_id, end_idx + 1)
+
+    n_hours = int(float(days) * 24)
+    start_idx = max(0, end_idx - n_hours + 1)
+    # Free tier: hourly for 2-90 days, daily beyond that
+    step = 24 if float(days) > 90 else 1
+    idx = np.arange(start_idx, end_idx + 1, step)
+    timestamps = ORIGIN_MS + idx * HOUR_MS
+
+    return {
+        'prices': [[int(ts), float(p)] for ts, p in zip(timestamps, prices[idx])],
+        'market_caps': [[int(ts), float(p) * 1.9e7] for ts, p in zip(timestamps, prices[idx])],
+        'total_volumes': [[int(ts), float(v)] for ts, v in zip(timestamps, volumes[idx])]
+    }
+
+
+def build_market_chart_range(coin_id, from_s, to_s):
+    """Build a market_chart/range payload: hourly for spans up to 90 days, daily beyond"""
+    end_idx = _current_hour_index()
+    prices, volumes = get_coin_path(coin_id, end_idx + 1)
+
+    start_idx = max(0, int(np.ceil((from_s * 1000 - ORIGIN_MS) / HOUR_MS)))
+    stop_idx = min(end_idx, int((to_s * 1000 - ORIGIN_MS) // HOUR_MS))
+    step = 24 if (to_s - from_s) > 90 * 86400 else 1
+    idx = np.arange(start_idx, stop_idx + 1, step)
+    timestamps = ORIGIN_MS + idx * HOUR_MS
+
+    return {
+        'prices': [[int(ts), float(p)] for ts, p in zip(timestamps, prices[idx])],
+        'market_caps': [[int(ts), float(p) * 1.9e7] for ts, p in zip(timestamps, prices[idx])],
+        'total_volumes': [[int(ts), float(v)] for ts, v in zip(timestamps, volumes[idx])]
+    }
+
+
+def _should_reject():
+    """Decide whether this request gets a 429 (random injection or per-minute budget)"""
+    now = time.time()
+    with _stats_lock:
+        _stats['requests'] += 1
+        if _config['rate_limit'] > 0:
+            while _request_times and now - _request_times[0] > 60:
+                _request_times.pop(0)
+            if len(_request_times) >= _config['rate_limit']:
+                _stats['rate_limited'] += 1
+                return True
+            _request_times.append(now)
+        if _config['error_rate'] > 0 and _rng.random() < _config['error_rate']:
+            _stats['rate_limited'] += 1
+            return True
+    return False
+
+
+def _simulate_latency():
+    """Sleep for the configured latency with uniform jitter"""
+    delay = _config['latency']
+    if _config['jitter'] > 0:
+        delay += _rng.uniform(-_config['jitter'], _config['jitter'])
+    if delay > 0:
+        time.sleep(delay)
+
+
+@app.route('/api/v3/coins/<coin_id>/market_chart', methods=['GET'])
+def market_chart(coin_id):
+    """Synthetic /coins/{id}/market_chart"""
+    _simulate_latency()
+    if _should_reject():
+        return jsonify({'status': {'error_code': 429, 'error_message': 'Rate limit exceeded'}}), 429
+
+    with _stats_lock:
+        _stats['market_chart'] += 1
+
+    if coin_id not in MOCK_COINS:
+        return jsonify({'error': 'coin not found'}), 404
+
+    days = request.args.get('days', '30')
+    try:
+        days = max(float(days), 1.0)
+    except ValueError:
+        return jsonify({'error': 'invalid days'}), 400
+
+    return jsonify(build_market_chart(coin_id, days))
+
+
+@app.route('/api/v3/coins/<coin_id>/market_chart/range', methods=['GET'])
+def market_chart_range(coin_id):
+    """Synthetic /coins/{id}/market_chart/range"""
+    _simulate_latency()
+    if _should_reject():
+        return jsonify({'status': {'error_code': 429, 'error_message': 'Rate limit exceeded'}}), 429
+
+    with _stats_lock:
+        _stats['market_chart_range'] += 1
+
+    if coin_id not in MOCK_COINS:
+        return jsonify({'error': 'coin not found'}), 404
+
+    try:
+        from_s = float(request.args['from'])
+        to_s = float(request.args['to'])
+    except (KeyError, ValueError):
+        return jsonify({'error': 'from and to must be UNIX timestamps in seconds'}), 400
+
+    return jsonify(build_market_chart_range(coin_id, from_s, to_s))
+
+
+@app.route('/api/v3/simple/price', methods=['GET'])
+def simple_price():
+    """Synthetic /simple/price for one or more comma-separated ids"""
+    _simulate_latency()
+    if _should_reject():
+        return jsonify({'status': {'error_code': 429, 'error_message': 'Rate limit exceeded'}}), 429
+
+    with _stats_lock:
+        _stats['simple_price'] += 1
+
+    ids = [i.strip() for i in request.args.get('ids', '').split(',') if i.strip()]
+    include_change = request.args.get('include_24hr_change', 'false') == 'true'
+    include_updated = request.args.get('include_last_updated_at', 'false') == 'true'
+
+    end_idx = _current_hour_index()
+    result = {}
+    for coin_id in ids:
+        # Unknown ids are silently omitted, matching CoinGecko
+        if coin_id not in MOCK_COINS:
+            continue
+        prices, _ = get_coin_path(coin_id, end_idx + 1)
+        quote = {'usd': float(prices[-1])}
+        if include_change:
+            quote['usd_24h_change'] = float((prices[-1] - prices[-25]) / prices[-25] * 100)
+        if include_updated:
+            quote['last_updated_at'] = int((ORIGIN_MS + end_idx * HOUR_MS) // 1000)
+        result[coin_id] = quote
+
+    return jsonify(result)
+
+
+@app.route('/api/v3/coins/list', methods=['GET'])
+def coins_list():
+    """Synthetic /coins/list: every mock coin plus a few listed-only tokens"""
+    _simulate_latency()
+    if _should_reject():
+        return jsonify({'status': {'error_code': 429, 'error_message': 'Rate limit exceeded'}}), 429
+
+    with _stats_lock:
+        _stats['coins_list'] += 1
+
+    coins = []
+    for coin_id in MOCK_COINS:
+        symbol, name = MOCK_COIN_INFO.get(
+            coin_id, (coin_id.replace('mock-coin-', 'mc'), coin_id.replace('-', ' ').title()))
+        coins.append({'id': coin_id, 'symbol': symbol, 'name': name})
+    return jsonify(coins + MOCK_LISTED_ONLY)
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Request counters, useful to check how many upstream calls the app made"""
+    with _stats_lock:
+        return jsonify(dict(_stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local CoinGecko stand-in for offline testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.0, help='Mean added latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Uniform latency jitter in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of answering 429')
+    parser.add_argument('--rate-limit', type=int, default=0, help='Max calls per minute before 429 (0 = unlimited)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency jitter and 429 injection')
+    parser.add_argument('--extra-coins', type=int, default=0,
+                        help='Register N additional synthetic coins (mock-coin-001, ...)')
+    args = parser.parse_args()
+
+    _config['latency'] = args.latency
+    _config['jitter'] = args.jitter
+    _config['error_rate'] = args.error_rate
+    _config['rate_limit'] = args.rate_limit
+    _rng.seed(args.seed)
+    for i in range(1, args.extra_coins + 1):
+        MOCK_COINS[f'mock-coin-{i:03d}'] = 1.0 + i
+
+    print("Starting CoinGecko stand-in...")
+    print(f"Point the app at it with: COINGECKO_BASE_URL=http://{args.host}:{args.port}/api/v3")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Fitted Model Cache
+Scoring contexts per coin: the indicator series plus whatever prerequisites the
+scoring methods have resolved so far (correlation matrix, covariance Cholesky
+factor, standardization, PCA), reused until the coin's data version advances.
+"""
+
+import threading
+import time
+
+import metrics
+from correlation_analysis import compute_indicator_time_series
+
+
+def build_context(df):
+    """Scoring context for a price DataFrame; models are fitted lazily on first use"""
+    return {'indicator_df': compute_indicator_time_series(df)}
+
+
+class ModelCache:
+    """Thread-safe cache of scoring contexts keyed by coin, checked against a data version"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version, df):
+        """
+        Scoring context for df, rebuilt only when `version` differs from the cached one
+        key identifies the series (e.g. coin and lookback), version its data version.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                metrics.increment('models.cache_hits')
+                return entry[1]
+
+        metrics.increment('models.cache_misses')
+        start = time.time()
+        context = build_context(df)
+        metrics.observe('models.build', time.time() - start)
+
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (version, context)
+        return context
+
+    def invalidate(self, key=None):
+        """Drop one entry, or everything"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
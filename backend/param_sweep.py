@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Parallel Parameter Sweep for Indicator Periods, Weights and Signal Thresholds
+Grid or random search over the settings that are otherwise fixed in correlation_analysis.py:
+RSI period, MACD spans, Bollinger period, EMA period, volume window, the
+method1_simple_weighted weights and the get_signal_description cutoffs.
+
+Every combination is scored with the walk-forward backtester across all coins.
+Intermediates are computed once per coin in the parent process and shared with the
+workers: each EWM span (used by MACD and the EMA ratio alike), RSI period, Bollinger
+period and volume window is computed exactly once, and workers only stack them.
+Weights and thresholds reuse one walk-forward pass per indicator combination.
+
+Results are ranked by a backtest metric and written to a gzip-compressed CSV.
+
+Usage:
+    python param_sweep.py --coins bitcoin,ethereum,solana --workers 4
+    python param_sweep.py --random 200 --random-weights 8 --rank-by total_return
+"""
+
+import argparse
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from correlation_analysis import (
+    calculate_rsi_series,
+    calculate_bollinger_position_series,
+    calculate_volume_ratio_series,
+    normalize_indicators,
+    SIGNAL_THRESHOLD,
+    STRONG_SIGNAL_THRESHOLD
+)
+from walk_forward import INDICATORS, MIN_HISTORY, SIMPLE_WEIGHTS, walk_forward_signals
+from backtest import signals_to_positions, compute_performance, infer_bars_per_year
+
+INDICATOR_PARAMS = ['rsi_period', 'macd_fast', 'macd_slow', 'macd_signal',
+                    'bb_period', 'ema_period', 'volume_period']
+
+DEFAULT_GRID = {
+    'rsi_period': [7, 14, 21],
+    'macd_fast': [8, 12],
+    'macd_slow': [21, 26],
+    'macd_signal': [7, 9],
+    'bb_period': [14, 20, 30],
+    'ema_period': [12, 20, 26],
+    'volume_period': [10, 20]
+}
+
+DEFAULT_THRESHOLDS = [
+    (SIGNAL_THRESHOLD, STRONG_SIGNAL_THRESHOLD),
+    (0.1, 0.5),
+    (0.15, 0.45),
+    (0.3, 0.7)
+]
+
+RANK_METRICS = ['sharpe', 'total_return', 'max_drawdown']
+COMPOSITE_METHODS = ['correlation_adjusted', 'mahalanobis', 'pca_composite']
+
+
+class IntermediateCache:
+    """Memoized indicator building blocks for one coin"""
+
+    def __init__(self, prices, volumes):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.volumes = np.asarray(volumes, dtype=np.float64)
+        self._store = {}
+        self.computed = 0
+
+    def _get(self, key, func):
+        if key not in self._store:
+            self._store[key] = func()
+            self.computed += 1
+        return self._store[key]
+
+    def ewm(self, span):
+        return self._get(('ewm', span), lambda: pd.Series(self.prices).ewm(span=span, adjust=False).mean().values)
+
+    def rsi(self, period):
+        return self._get(('rsi', period), lambda: calculate_rsi_series(self.prices, period=period))
+
+    def macd(self, fast, slow, signal_span):
+        def build():
+            line = pd.Series(self.ewm(fast) - self.ewm(slow))
+            return (line - line.ewm(span=signal_span, adjust=False).mean()).values
+        return self._get(('macd', fast, slow, signal_span), build)
+
+    def bollinger(self, period):
+        return self._get(('bollinger', period), lambda: calculate_bollinger_position_series(self.prices, period=period))
+
+    def ema_ratio(self, period):
+        return self._get(('ema_ratio', period), lambda: self.prices / self.ewm(period))
+
+    def volume_ratio(self, period):
+        return self._get(('volume', period), lambda: calculate_volume_ratio_series(self.volumes, period=period))
+
+    def matrix(self, params):
+        """(T, 5) indicator matrix in INDICATORS order, as compute_indicator_time_series builds it"""
+        return np.column_stack([
+            self.rsi(params['rsi_period']),
+            self.macd(params['macd_fast'], params['macd_slow'], params['macd_signal']),
+            self.bollinger(params['bb_period']),
+            self.ema_ratio(params['ema_period']),
+            self.volume_ratio(params['volume_period'])
+        ])
+
+
+def build_indicator_combos(grid, n_random=None, seed=0):
+    """All valid indicator combinations (fast < slow MACD), optionally a random subset"""
+    combos = [dict(zip(INDICATOR_PARAMS, values))
+              for values in itertools.product(*[grid[p] for p in INDICATOR_PARAMS])]
+    combos = [c for c in combos if c['macd_fast'] < c['macd_slow']]
+    if n_random is not None and n_random < len(combos):
+        rng = np.random.default_rng(seed)
+        picked = rng.choice(len(combos), size=n_random, replace=False)
+        combos = [combos[i] for i in sorted(picked)]
+    return combos
+
+
+def build_weight_sets(n_random=0, seed=0):
+    """Default and equal weights plus Dirichlet-sampled weight vectors"""
+    weight_sets = [SIMPLE_WEIGHTS, np.full(len(INDICATORS), 1.0 / len(INDICATORS))]
+    if n_random:
+        rng = np.random.default_rng(seed + 1)
+        weight_sets.extend(rng.dirichlet(np.ones(len(INDICATORS)), size=n_random))
+    return np.array(weight_sets)
+
+
+def precompute(caches, combos):
+    """Warm every intermediate the combos need, once per coin"""
+    for cache in caches:
+        for params in combos:
+            cache.matrix(params)
+
+
+# Worker state, installed once per process by _init_worker
+_worker = {}
+
+
+def _init_worker(caches, prices, bars_per_year, weight_sets, thresholds, settings):
+    _worker.update({
+        'caches': caches,
+        'prices': prices,
+        'bars_per_year': bars_per_year,
+        'weight_sets': weight_sets,
+        'thresholds': thresholds,
+        'settings': settings
+    })
+
+
+def _evaluate(params):
+    """Backtest one indicator combination under every weight set and threshold pair"""
+    caches = _worker['caches']
+    prices = _worker['prices']
+    weight_sets = _worker['weight_sets']
+    thresholds = _worker['thresholds']
+    settings = _worker['settings']
+    min_history = settings['min_history']
+
+    n_coins, T = prices.shape
+    # Scores per coin: 3 composite methods + one simple_weighted series per weight set
+    scores = np.full((len(COMPOSITE_METHODS) + len(weight_sets), n_coins, T), np.nan)
+    for c, cache in enumerate(caches):
+        values = cache.matrix(params)
+        length = len(values)
+        signals = walk_forward_signals(pd.DataFrame(values, columns=INDICATORS), min_history=min_history)
+        for m, method in enumerate(COMPOSITE_METHODS):
+            scores[m, c, :length] = signals[method]
+        if length > min_history:
+            simple = normalize_indicators(values[min_history:]) @ weight_sets.T
+            scores[len(COMPOSITE_METHODS):, c, min_history:length] = simple.T
+
+    # One performance pass over (thresholds x score rows, coins, T)
+    positions = np.concatenate([
+        signals_to_positions(scores, long_only=settings['long_only'], thresholds=t) for t in thresholds
+    ])
+    perf = compute_performance(prices, positions, fee_bps=settings['fee_bps'],
+                               bars_per_year=_worker['bars_per_year'])
+
+    rows = []
+    n_rows = scores.shape[0]
+    for t_idx, (weak, strong) in enumerate(thresholds):
+        for r in range(n_rows):
+            i = t_idx * n_rows + r
+            if r < len(COMPOSITE_METHODS):
+                method, weight_idx = COMPOSITE_METHODS[r], None
+            else:
+                method, weight_idx = 'simple_weighted', r - len(COMPOSITE_METHODS)
+            row = dict(params)
+            row.update({
+                'method': method,
+                'weights': ('' if weight_idx is None
+                            else ';'.join(f'{w:.3f}' for w in weight_sets[weight_idx])),
+                'signal_threshold': weak,
+                'strong_threshold': strong,
+                'sharpe': float(perf['sharpe'][i].mean()),
+                'total_return': float(perf['total_return'][i].mean()),
+                'max_drawdown': float(perf['max_drawdown'][i].mean()),
+                'turnover': float(perf['turnover'][i].mean()),
+                'trades': float(perf['trades'][i].mean())
+            })
+            rows.append(row)
+    return rows
+
+
+def run_sweep(frames, grid=None, n_random=None, n_random_weights=0, thresholds=None,
+              fee_bps=10.0, min_history=100, long_only=False, workers=None, seed=0, rank_by='sharpe'):
+    """
+    Evaluate all parameter combinations on {coin: DataFrame} in a process pool
+    Returns (ranked results DataFrame, stats dict)
+    """
+    grid = grid or DEFAULT_GRID
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    combos = build_indicator_combos(grid, n_random=n_random, seed=seed)
+    weight_sets = build_weight_sets(n_random_weights, seed=seed)
+
+    coins = list(frames.keys())
+    caches = [IntermediateCache(frames[c]['price'].values, frames[c]['volume'].values) for c in coins]
+
+    start = time.time()
+    precompute(caches, combos)
+    precompute_time = time.time() - start
+
+    T = max(len(cache.prices) for cache in caches)
+    prices = np.full((len(coins), T), np.nan)
+    for c, cache in enumerate(caches):
+        prices[c, :len(cache.prices)] = cache.prices
+    longest = max(coins, key=lambda c: len(frames[c]))
+    bars_per_year = infer_bars_per_year(frames[longest]['timestamp'].values)
+
+    settings = {'fee_bps': fee_bps, 'min_history': min_history, 'long_only': long_only}
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(caches, prices, bars_per_year, weight_sets, thresholds, settings)) as pool:
+        rows = [row for batch in pool.map(_evaluate, combos, chunksize=4) for row in batch]
+    sweep_time = time.time() - start
+
+    results = pd.DataFrame(rows)
+    results = results.sort_values(rank_by, ascending=False).reset_index(drop=True)
+    results.insert(0, 'rank', np.arange(1, len(results) + 1))
+
+    stats = {
+        'coins': len(coins),
+        'indicator_combos': len(combos),
+        'evaluations': len(results),
+        'intermediates_computed': sum(cache.computed for cache in caches),
+        'precompute_s': precompute_time,
+        'sweep_s': sweep_time
+    }
+    return results, stats
+
+
+def _parse_grid(specs):
+    """Parse ['rsi_period=7,14,21', ...] overrides on top of DEFAULT_GRID"""
+    grid = {k: list(v) for k, v in DEFAULT_GRID.items()}
+    for spec in specs or []:
+        name, _, values = spec.partition('=')
+        if name not in grid:
+            raise ValueError(f"Unknown parameter '{name}'. Choose from: {', '.join(INDICATOR_PARAMS)}")
+        grid[name] = [int(v) for v in values.split(',') if v.strip()]
+    return grid
+
+
+def _parse_thresholds(spec):
+    """Parse '0.2:0.6,0.1:0.5' into [(0.2, 0.6), (0.1, 0.5)]"""
+    pairs = []
+    for part in spec.split(','):
+        weak, _, strong = part.partition(':')
+        pairs.append((float(weak), float(strong)))
+    return pairs
+
+
+def main():
+    # Imported here so the sweep can be used as a library without the CLI's chart dependencies
+    from crypto_correlation_analysis import get_historical_data
+
+    parser = argparse.ArgumentParser(description='Parallel parameter sweep over indicator and signal settings')
+    parser.add_argument('--coins', default='bitcoin,ethereum,solana', help='Comma-separated CoinGecko ids')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--grid', nargs='*', help='Overrides such as rsi_period=7,14,21 macd_fast=8,12')
+    parser.add_argument('--random', type=int, default=None, help='Sample this many indicator combinations')
+    parser.add_argument('--random-weights', type=int, default=0, help='Extra Dirichlet-sampled weight vectors')
+    parser.add_argument('--thresholds', default=None, help="Signal:strong cutoff pairs, e.g. '0.2:0.6,0.1:0.5'")
+    parser.add_argument('--rank-by', choices=RANK_METRICS, default='sharpe')
+    parser.add_argument('--fee-bps', type=float, default=10.0)
+    parser.add_argument('--min-history', type=int, default=100)
+    parser.add_argument('--long-only', action='store_true')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='sweep_results.csv.gz')
+    parser.add_argument('--top', type=int, default=10, help='Rows to print')
+    args = parser.parse_args()
+    if args.min_history < MIN_HISTORY:
+        parser.error(f"--min-history must be at least {MIN_HISTORY}")
+
+    frames = {}
+    for coin_id in [c.strip() for c in args.coins.split(',') if c.strip()]:
+        df = get_historical_data(coin_id, days=args.days)
+        if df is not None:
+            frames[coin_id] = df
+    if not frames:
+        print("❌ No data fetched. Exiting.")
+        return
+
+    results, stats = run_sweep(
+        frames,
+        grid=_parse_grid(args.grid),
+        n_random=args.random,
+        n_random_weights=args.random_weights,
+        thresholds=_parse_thresholds(args.thresholds) if args.thresholds else None,
+        fee_bps=args.fee_bps,
+        min_history=args.min_history,
+        long_only=args.long_only,
+        workers=args.workers,
+        seed=args.seed,
+        rank_by=args.rank_by
+    )
+
+    results.to_csv(args.output, index=False, float_format='%.6g', compression='gzip')
+
+    print(f"\n⏱️  Precompute: {stats['precompute_s']:.2f}s ({stats['intermediates_computed']} intermediates)")
+    print(f"⏱️  Sweep: {stats['sweep_s']:.2f}s for {stats['indicator_combos']} indicator combos, "
+          f"{stats['evaluations']} evaluations over {stats['coins']} coins")
+    print(f"\nTop {args.top} by {args.rank_by}:")
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(results.head(args.top).to_string(index=False))
+    print(f"\n✅ Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
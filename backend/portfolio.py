@@ -0,0 +1,98 @@
+"""
+Portfolio Valuation
+Vectorized valuation of a set of holdings: market value, P&L and allocation in one
+NumPy pass over aligned arrays, plus historical value curves from aligned price matrices.
+"""
+
+import numpy as np
+
+
+def parse_holdings(payload):
+    """
+    Validate holdings from a request body
+    Accepts [{'symbol': 'BTC', 'quantity': 0.5, 'cost_basis': 20000}, ...]
+    where cost_basis is the total amount paid in USD (optional).
+    Returns (symbols, quantities, cost_basis) with NaN for a missing cost basis.
+    """
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("'holdings' must be a non-empty list")
+
+    symbols = []
+    quantities = []
+    costs = []
+    for item in payload:
+        if not isinstance(item, dict) or 'symbol' not in item:
+            raise ValueError("Each holding needs a 'symbol'")
+        try:
+            quantity = float(item.get('quantity', 0))
+            cost = item.get('cost_basis')
+            cost = float(cost) if cost is not None else np.nan
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid quantity or cost_basis for {item.get('symbol')}")
+        if quantity < 0:
+            raise ValueError(f"Quantity for {item['symbol']} must be non-negative")
+        symbols.append(str(item['symbol']).upper())
+        quantities.append(quantity)
+        costs.append(cost)
+
+    return symbols, np.array(quantities, dtype=np.float64), np.array(costs, dtype=np.float64)
+
+
+def value_holdings(quantities, prices, cost_basis):
+    """
+    Value all holdings at once
+    prices may contain NaN for coins without a quote; those contribute nothing to totals.
+    """
+    values = quantities * prices
+    total_value = float(np.nansum(values))
+
+    allocation = values / total_value if total_value > 0 else np.zeros_like(values)
+    pnl = values - cost_basis
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pnl_pct = np.where(cost_basis > 0, pnl / cost_basis * 100, np.nan)
+
+    has_cost = ~np.isnan(cost_basis) & ~np.isnan(values)
+    total_cost = float(np.sum(cost_basis[has_cost])) if has_cost.any() else None
+    total_pnl = float(np.sum(pnl[has_cost])) if has_cost.any() else None
+
+    return {
+        'values': values,
+        'allocation': allocation,
+        'pnl': pnl,
+        'pnl_pct': pnl_pct,
+        'total_value': total_value,
+        'total_cost': total_cost,
+        'total_pnl': total_pnl,
+        'total_pnl_pct': total_pnl / total_cost * 100 if total_cost else None
+    }
+
+
+def value_curve(quantities, price_matrix):
+    """
+    Historical portfolio value from a coins x time price matrix
+    Returns (total curve, per-coin value matrix)
+    """
+    per_coin = quantities[:, None] * price_matrix
+    return quantities @ price_matrix, per_coin
+
+
+def _finite_or_none(x):
+    return float(x) if np.isfinite(x) else None
+
+
+def build_positions(symbols, coin_ids, quantities, cost_basis, prices, valuation):
+    """Assemble the per-holding JSON rows"""
+    positions = []
+    for i, symbol in enumerate(symbols):
+        positions.append({
+            'symbol': symbol,
+            'coin_id': coin_ids[i],
+            'quantity': float(quantities[i]),
+            'price': _finite_or_none(prices[i]),
+            'value': _finite_or_none(valuation['values'][i]),
+            'cost_basis': _finite_or_none(cost_basis[i]),
+            'pnl': _finite_or_none(valuation['pnl'][i]),
+            'pnl_pct': _finite_or_none(valuation['pnl_pct'][i]),
+            'allocation': _finite_or_none(valuation['allocation'][i] * 100)
+        })
+    return positions
@@ -0,0 +1,101 @@
+"""
+Price Store
+Latest price/volume series per coin, shared by the API routes.
+
+Every coin carries a data version that advances whenever a fetch brings new or
+revised bars, so derived results can be cached per (coin, version). Series for
+several coins can be aligned onto a common timestamp grid as a coins x time matrix.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class PriceStore:
+    """Thread-safe in-memory store of per-coin DataFrames (timestamp, price, volume)"""
+
+    def __init__(self, max_bars=None):
+        self.max_bars = max_bars
+        self._series = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def put(self, coin_id, df):
+        """
+        Merge a freshly fetched series into the store
+        The new frame is authoritative over its own time span; older bars before it are kept.
+        Returns True if the stored data changed (and the version advanced).
+        """
+        if df is None or len(df) == 0:
+            return False
+
+        with self._lock:
+            existing = self._series.get(coin_id)
+            if existing is not None:
+                older = existing[existing['timestamp'] < df['timestamp'].iloc[0]]
+                merged = pd.concat([older, df], ignore_index=True) if len(older) else df.reset_index(drop=True)
+            else:
+                merged = df.reset_index(drop=True)
+
+            if self.max_bars is not None and len(merged) > self.max_bars:
+                merged = merged.iloc[-self.max_bars:].reset_index(drop=True)
+
+            changed = (
+                existing is None
+                or len(existing) != len(merged)
+                or existing['timestamp'].iloc[-1] != merged['timestamp'].iloc[-1]
+                or existing['price'].iloc[-1] != merged['price'].iloc[-1]
+            )
+            self._series[coin_id] = merged
+            if changed:
+                self._versions[coin_id] = self._versions.get(coin_id, 0) + 1
+            return changed
+
+    def get(self, coin_id):
+        """Stored DataFrame for a coin, or None"""
+        with self._lock:
+            return self._series.get(coin_id)
+
+    def version(self, coin_id):
+        """Data version of a coin (0 if never stored)"""
+        with self._lock:
+            return self._versions.get(coin_id, 0)
+
+    def coins(self):
+        """Coin ids currently held"""
+        with self._lock:
+            return list(self._series.keys())
+
+    def last_price(self, coin_id):
+        """Most recent stored price, or None"""
+        df = self.get(coin_id)
+        if df is None or len(df) == 0:
+            return None
+        return float(df['price'].iloc[-1])
+
+    def aligned(self, coin_ids, column='price', freq='1h'):
+        """
+        Align several coins onto a common timestamp grid
+        Timestamps are floored to `freq` buckets (last observation wins), the grid starts where
+        every coin has data, and missing bars are forward-filled.
+        Returns (grid DatetimeIndex, matrix of shape (len(coin_ids), len(grid))) or (None, None).
+        """
+        columns = {}
+        for coin_id in coin_ids:
+            df = self.get(coin_id)
+            if df is None or len(df) == 0:
+                return None, None
+            series = pd.Series(df[column].values, index=df['timestamp'].dt.floor(freq))
+            columns[coin_id] = series[~series.index.duplicated(keep='last')]
+
+        frame = pd.DataFrame(columns).sort_index()
+        start = max(s.index[0] for s in columns.values())
+        frame = frame[frame.index >= start].ffill()
+        frame = frame.dropna()
+        if frame.empty:
+            return None, None
+
+        matrix = frame[list(coin_ids)].to_numpy(dtype=np.float64).T
+        return frame.index, matrix
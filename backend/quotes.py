@@ -0,0 +1,165 @@
+"""
+Batched Quote Service
+Keeps current USD quotes for every tracked coin in memory. All coins are refreshed
+together with a single /simple/price?ids=a,b,c call once per refresh interval, so
+serving N quotes costs one upstream call per interval instead of one per request.
+
+Coins requested outside the initial set are tracked on demand. /simple/price silently
+omits ids it does not know, so an on-demand id that gets no quote in MAX_MISSED_REFRESHES
+successful refreshes is dropped and not re-added for DROPPED_ID_TTL seconds. When the
+batch is full, the least recently requested on-demand id makes room for a new one.
+"""
+
+import threading
+import time
+
+import metrics
+import upstream
+from circuit_breaker import NegativeCache
+from upstream import BASE_URL
+
+# Cap on tracked ids (initial plus on demand) to keep the batch URL bounded
+MAX_TRACKED = 250
+
+# Successful refreshes without a quote after which an on-demand id is dropped
+MAX_MISSED_REFRESHES = 2
+
+# Seconds a dropped id is refused before it may be tracked again
+DROPPED_ID_TTL = 600.0
+
+
+class QuoteService:
+    """In-memory quote cache refreshed in batches on a fixed cadence"""
+
+    def __init__(self, coin_ids, refresh_interval=30.0):
+        self.refresh_interval = refresh_interval
+        self._tracked = list(dict.fromkeys(coin_ids))
+        self._fixed = set(self._tracked)
+        self._on_demand = {}             # coin_id -> last requested (oldest first)
+        self._misses = {}                # coin_id -> successful refreshes without a quote
+        self._dropped = NegativeCache(ttl=DROPPED_ID_TTL)
+        self._quotes = {}
+        self._last_refresh = 0.0
+        self._last_success = 0.0
+        self._last_error = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+
+    def track(self, coin_ids):
+        """Add coin ids to the batch; returns True if any id was new"""
+        added = False
+        with self._lock:
+            for coin_id in coin_ids:
+                if coin_id in self._fixed or self._dropped.get(coin_id) is not None:
+                    continue
+                if coin_id in self._on_demand:
+                    # Mark as recently requested
+                    self._on_demand[coin_id] = self._on_demand.pop(coin_id)
+                    continue
+                if len(self._tracked) >= MAX_TRACKED:
+                    if not self._on_demand:
+                        continue
+                    self._untrack(next(iter(self._on_demand)))
+                self._tracked.append(coin_id)
+                self._on_demand[coin_id] = time.time()
+                added = True
+        return added
+
+    def _untrack(self, coin_id):
+        """Drop an on-demand id and its quote (caller holds the lock)"""
+        self._tracked.remove(coin_id)
+        self._on_demand.pop(coin_id, None)
+        self._misses.pop(coin_id, None)
+        self._quotes.pop(coin_id, None)
+
+    def refresh(self):
+        """Fetch quotes for all tracked coins in one upstream request"""
+        with self._lock:
+            ids = list(self._tracked)
+
+        url = f"{BASE_URL}/simple/price"
+        params = {
+            'ids': ','.join(ids),
+            'vs_currencies': 'usd',
+            'include_24hr_change': 'true',
+            'include_last_updated_at': 'true'
+        }
+
+        try:
+            response = upstream.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            metrics.increment('quotes.refresh_errors')
+            print(f"Quote refresh failed: {e}")
+            with self._lock:
+                self._last_error = str(e)
+                # Back off for a full interval rather than retrying on every request
+                self._last_refresh = time.time()
+            return False
+
+        metrics.increment('quotes.refreshes')
+        with self._lock:
+            self._quotes.update(data)
+            for coin_id in ids:
+                if coin_id not in self._on_demand:
+                    continue
+                if coin_id in data:
+                    self._misses.pop(coin_id, None)
+                    continue
+                self._misses[coin_id] = self._misses.get(coin_id, 0) + 1
+                if self._misses[coin_id] >= MAX_MISSED_REFRESHES:
+                    metrics.increment('quotes.dropped')
+                    self._untrack(coin_id)
+                    self._dropped.put(coin_id, 'no quote from upstream')
+            self._last_refresh = self._last_success = time.time()
+            self._last_error = None
+        return True
+
+    def _is_stale(self):
+        return time.time() - self._last_refresh >= self.refresh_interval
+
+    def _refresh_if_stale(self, force=False):
+        """Single-flight refresh: concurrent callers wait for one upstream call"""
+        if not force and not self._is_stale():
+            return
+        with self._refresh_lock:
+            if force or self._is_stale():
+                self.refresh()
+
+    def _run(self):
+        while True:
+            self._refresh_if_stale()
+            time.sleep(max(self.refresh_interval / 4, 0.5))
+
+    def start(self):
+        """Start the background refresh thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='quote-refresh', daemon=True)
+        self._thread.start()
+
+    def get_quotes(self, coin_ids):
+        """
+        Return {coin_id: quote} for the requested ids, served from memory
+        Ids not yet tracked are added to the batch and trigger one immediate refresh
+        """
+        if self.track(coin_ids):
+            self._refresh_if_stale(force=True)
+        else:
+            self._refresh_if_stale()
+
+        metrics.increment('quotes.served', len(coin_ids))
+        with self._lock:
+            return {coin_id: dict(self._quotes[coin_id]) for coin_id in coin_ids if coin_id in self._quotes}
+
+    def status(self):
+        """Age of the quote table and last refresh error, for diagnostics"""
+        with self._lock:
+            return {
+                'tracked': len(self._tracked),
+                'age_s': time.time() - self._last_success if self._last_success else None,
+                'last_error': self._last_error
+            }
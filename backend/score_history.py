@@ -0,0 +1,124 @@
+"""
+Score History Store
+Append-only SQLite table of per-bar normalized indicators and walk-forward method scores
+per coin, interval and fit. Walk-forward scores only use data up to their bar, so once a
+closed bar is scored its row never changes; new bars are appended as they are scored and
+history requests become a primary-key range read, however far back they go. The raw
+indicator values of every bar are kept too, so expanding fits can start from the first
+stored bar instead of from whatever window was fetched.
+
+Configuration: SCORE_DB_PATH (default backend/data/scores.sqlite3).
+"""
+
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from correlation_analysis import INDICATORS
+from walk_forward import METHODS
+
+SCORE_DB_PATH = os.environ.get(
+    'SCORE_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'scores.sqlite3')
+)
+
+COLUMNS = INDICATORS + METHODS
+RAW_COLUMNS = [f'{name}_raw' for name in INDICATORS]
+
+# Bumped whenever walk-forward scoring changes; stores written by an older version are
+# dropped on open so stale scores are rescored instead of served
+# (2: pca_fit sign convention, 3: raw indicator columns)
+SCORE_VERSION = 3
+
+
+class ScoreHistory:
+    """Thread-safe append-only store of scored bars keyed by (coin, interval, fit, timestamp)"""
+
+    def __init__(self, path=SCORE_DB_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if conn.execute('PRAGMA user_version').fetchone()[0] < SCORE_VERSION:
+                conn.execute('DROP TABLE IF EXISTS scores')
+                conn.execute(f'PRAGMA user_version = {SCORE_VERSION}')
+            columns = ', '.join(f'"{name}" REAL' for name in COLUMNS + RAW_COLUMNS)
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS scores ('
+                f'coin_id TEXT NOT NULL, interval TEXT NOT NULL, fit TEXT NOT NULL, ts INTEGER NOT NULL, '
+                f'{columns}, PRIMARY KEY (coin_id, interval, fit, ts)) WITHOUT ROWID'
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def last_timestamp(self, coin_id, interval, fit):
+        """Timestamp (ms) of the newest stored bar, or None"""
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT MAX(ts) FROM scores WHERE coin_id = ? AND interval = ? AND fit = ?',
+                (coin_id, interval, fit)
+            ).fetchone()
+        return row[0]
+
+    def append(self, coin_id, interval, fit, timestamps, normalized, scores, raw):
+        """
+        Store scored bars; bars already present are left untouched
+        timestamps: (n,) ms; normalized and raw: (n, len(INDICATORS)); scores: {method: (n,)}
+        Returns the number of rows written.
+        """
+        if len(timestamps) == 0:
+            return 0
+        matrix = np.column_stack([normalized] + [scores[m] for m in METHODS] + [raw])
+        # NaN (walk-forward warm-up) is stored as NULL
+        rows = [
+            (coin_id, interval, fit, int(ts), *[float(v) if np.isfinite(v) else None for v in values])
+            for ts, values in zip(timestamps, matrix)
+        ]
+        placeholders = ', '.join('?' * (4 + len(COLUMNS) + len(RAW_COLUMNS)))
+        with self._lock:
+            conn = self._connection()
+            before = conn.total_changes
+            conn.executemany(f'INSERT OR IGNORE INTO scores VALUES ({placeholders})', rows)
+            conn.commit()
+            return conn.total_changes - before
+
+    def read(self, coin_id, interval, fit, start_ms=None, end_ms=None):
+        """
+        Stored bars with start_ms <= ts <= end_ms, oldest first
+        Returns (timestamps (n,) ms, normalized (n, len(INDICATORS)), {method: (n,)}).
+        """
+        columns = ', '.join(f'"{name}"' for name in COLUMNS)
+        with self._lock:
+            rows = self._connection().execute(
+                f'SELECT ts, {columns} FROM scores WHERE coin_id = ? AND interval = ? AND fit = ? '
+                f'AND ts >= ? AND ts <= ? ORDER BY ts',
+                (coin_id, interval, fit,
+                 -2 ** 63 if start_ms is None else int(start_ms),
+                 2 ** 63 - 1 if end_ms is None else int(end_ms))
+            ).fetchall()
+
+        data = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(COLUMNS))
+        timestamps = np.array([row[0] for row in rows], dtype=np.int64)
+        normalized = data[:, :len(INDICATORS)]
+        scores = {m: data[:, len(INDICATORS) + i] for i, m in enumerate(METHODS)}
+        return timestamps, normalized, scores
+
+    def read_raw(self, coin_id, interval, fit):
+        """Raw indicator rows of every stored bar, oldest first: (timestamps (n,) ms, (n, len(INDICATORS)))"""
+        columns = ', '.join(f'"{name}"' for name in RAW_COLUMNS)
+        with self._lock:
+            rows = self._connection().execute(
+                f'SELECT ts, {columns} FROM scores WHERE coin_id = ? AND interval = ? AND fit = ? ORDER BY ts',
+                (coin_id, interval, fit)
+            ).fetchall()
+        raw = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(RAW_COLUMNS))
+        return np.array([row[0] for row in rows], dtype=np.int64), raw
@@ -0,0 +1,156 @@
+"""
+Market Screener
+A small in-memory table with one row per coin (latest indicators, method scores and
+consensus). Rows are rebuilt only when a coin's data version advances, so a screener
+request is a filter and sort over a handful of rows rather than one pipeline per coin.
+Fetching the coins is left to a background refresh, never to a screener request.
+
+Filters are strings like "RSI<30", "mahalanobis>=0.2" or "consensus.agreement==true";
+dotted names reach into nested fields.
+"""
+
+import operator
+import re
+import threading
+import time
+
+OPERATORS = {
+    '<=': operator.le,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt
+}
+
+_FILTER_PATTERN = re.compile(r'^\s*([A-Za-z_][\w.]*)\s*(<=|>=|==|!=|<|>)\s*(.+?)\s*$')
+
+
+def _parse_literal(text):
+    """Filter right-hand side: true/false, a number, or a bare string"""
+    lowered = text.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    try:
+        return float(text)
+    except ValueError:
+        return text.strip('\'"')
+
+
+def field_value(row, path):
+    """Value at a dotted path in a row, or None"""
+    value = row
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def parse_filter(expression):
+    """Split "field<op>value" into (field, op, value); raises ValueError on bad syntax"""
+    match = _FILTER_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"Invalid filter '{expression}'. Use e.g. RSI<30 or consensus.agreement==true")
+    path, op, literal = match.groups()
+    return path, op, _parse_literal(literal)
+
+
+def compile_filter(expression):
+    """
+    Compile "field<op>value" into a predicate row -> bool
+    Rows missing the field (or holding None) never match. Raises ValueError on bad syntax.
+    """
+    path, op, target = parse_filter(expression)
+    compare = OPERATORS[op]
+
+    def predicate(row):
+        value = field_value(row, path)
+        if value is None:
+            return False
+        try:
+            return bool(compare(value, target))
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def parse_filters(values):
+    """Compile a list of ?filter= values (each may hold several comma-separated filters)"""
+    expressions = [e for value in values for e in value.split(',') if e.strip()]
+    return [compile_filter(e) for e in expressions]
+
+
+class ScreenerTable:
+    """Screener rows keyed by coin, each tagged with the data version it was built from"""
+
+    def __init__(self):
+        self._rows = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def is_stale(self, coin_id, version):
+        """True if the coin has no row yet or its row predates `version`"""
+        with self._lock:
+            return self._versions.get(coin_id) != version
+
+    def update(self, coin_id, version, build_row):
+        """
+        Rebuild a coin's row with build_row() if its data version changed
+        Returns True if the row was rebuilt; rows that fail to build (None) are dropped.
+        """
+        if not self.is_stale(coin_id, version):
+            return False
+        row = build_row()
+        with self._lock:
+            if row is None:
+                self._rows.pop(coin_id, None)
+                self._versions.pop(coin_id, None)
+            else:
+                self._rows[coin_id] = row
+                self._versions[coin_id] = version
+        return True
+
+    def start_refresh(self, refresh, interval):
+        """Call refresh() now and then every `interval` seconds in the background (idempotent)"""
+        def run():
+            while True:
+                try:
+                    refresh()
+                except Exception as e:
+                    print(f"Screener refresh failed: {e}")
+                time.sleep(interval)
+
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=run, name='screener-refresh', daemon=True)
+        self._thread.start()
+
+    def get(self, coin_id):
+        """Row of one coin, or None"""
+        with self._lock:
+            return self._rows.get(coin_id)
+
+    def rows(self):
+        """Snapshot of all rows"""
+        with self._lock:
+            return list(self._rows.values())
+
+    def query(self, filters=None, sort_by='simple_weighted', descending=True, offset=0, limit=None):
+        """
+        Filter, sort and page the table
+        Rows without a numeric sort value go last. Returns (total matches, page of rows).
+        """
+        rows = [row for row in self.rows() if all(predicate(row) for predicate in filters or [])]
+
+        def sort_key(row):
+            value = field_value(row, sort_by)
+            missing = not isinstance(value, (int, float))
+            return (missing, 0.0 if missing else (-value if descending else value))
+
+        rows.sort(key=sort_key)
+        end = None if limit is None else offset + limit
+        return len(rows), rows[offset:end]
@@ -0,0 +1,155 @@
+"""
+Warm-Start Snapshots
+Writes the fetched price series to disk on a cadence and at shutdown so a restarted
+server can answer its first requests from recent data instead of stampeding CoinGecko.
+
+Layout (SNAPSHOT_DIR, default backend/data/snapshot): each save is a generation
+directory with one raw .npy file per column (timestamps as int64 ms, prices, volumes)
+for all series concatenated, plus index.json with each series' offset, length and fetch
+time; CURRENT names the latest generation and is swapped atomically. Loading opens the
+arrays with np.load(mmap_mode='r'), which takes milliseconds; a series is copied out of
+the mapping only when it is first requested.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = os.environ.get(
+    'SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'snapshot')
+)
+
+COLUMNS = ('timestamp', 'price', 'volume')
+
+
+def save_snapshot(entries, directory=SNAPSHOT_DIR):
+    """
+    Write {key: (DataFrame, fetched_at datetime)} as a new generation and make it current
+    Returns the generation directory.
+    """
+    keys = [k for k, (df, _) in entries.items() if df is not None and len(df)]
+    frames = [entries[k][0] for k in keys]
+    lengths = [len(df) for df in frames]
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(int) if keys else []
+
+    generation = f"gen-{int(time.time() * 1000)}"
+    path = os.path.join(directory, generation)
+    os.makedirs(path, exist_ok=True)
+    if keys:
+        np.save(os.path.join(path, 'timestamp.npy'), np.concatenate(
+            [df['timestamp'].to_numpy(dtype='datetime64[ms]').astype(np.int64) for df in frames]))
+        np.save(os.path.join(path, 'price.npy'), np.concatenate([df['price'].to_numpy(dtype=np.float64) for df in frames]))
+        np.save(os.path.join(path, 'volume.npy'), np.concatenate([df['volume'].to_numpy(dtype=np.float64) for df in frames]))
+    index = {
+        key: {'offset': int(offset), 'length': length, 'fetched_at': entries[key][1].timestamp()}
+        for key, offset, length in zip(keys, offsets, lengths)
+    }
+    with open(os.path.join(path, 'index.json'), 'w') as f:
+        json.dump(index, f)
+
+    # Swap the pointer atomically, then drop older generations
+    pointer_tmp = os.path.join(directory, 'CURRENT.tmp')
+    with open(pointer_tmp, 'w') as f:
+        f.write(generation)
+    os.replace(pointer_tmp, os.path.join(directory, 'CURRENT'))
+    for name in os.listdir(directory):
+        if name.startswith('gen-') and name != generation:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+    return path
+
+
+class WarmStart:
+    """Memory-mapped view of the latest snapshot; each series is handed out at most once"""
+
+    def __init__(self, directory=SNAPSHOT_DIR, max_age=900):
+        self.directory = directory
+        self.max_age = max_age
+        self._index = {}
+        self._arrays = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Open the current generation (index + mmapped arrays); returns the number of series"""
+        try:
+            with open(os.path.join(self.directory, 'CURRENT')) as f:
+                path = os.path.join(self.directory, f.read().strip())
+            with open(os.path.join(path, 'index.json')) as f:
+                index = json.load(f)
+            arrays = {
+                column: np.load(os.path.join(path, f'{column}.npy'), mmap_mode='r') for column in COLUMNS
+            } if index else {}
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Ignoring unreadable snapshot: {e}")
+            return 0
+
+        # Only series recent enough to stand in for a fresh fetch
+        now = time.time()
+        with self._lock:
+            self._index = {k: v for k, v in index.items() if now - v['fetched_at'] <= self.max_age}
+            self._arrays = arrays
+        return len(self._index)
+
+    def take(self, key):
+        """(DataFrame, fetched_at) for a key, removed from the snapshot; None if absent or too old"""
+        with self._lock:
+            entry = self._index.pop(key, None)
+            arrays = self._arrays
+        if entry is None or time.time() - entry['fetched_at'] > self.max_age:
+            return None
+        rows = slice(entry['offset'], entry['offset'] + entry['length'])
+        df = pd.DataFrame({
+            'timestamp': pd.to_datetime(np.array(arrays['timestamp'][rows]), unit='ms'),
+            'price': np.array(arrays['price'][rows]),
+            'volume': np.array(arrays['volume'][rows])
+        })
+        return df, datetime.fromtimestamp(entry['fetched_at'])
+
+
+class SnapshotWriter:
+    """Background thread saving a cache every `interval` seconds when it changed, and at exit"""
+
+    def __init__(self, get_entries, directory=SNAPSHOT_DIR, interval=120.0):
+        self.get_entries = get_entries
+        self.directory = directory
+        self.interval = interval
+        self._last_saved = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def save(self):
+        """Write a snapshot if the cache changed since the last one; returns True if written"""
+        with self._lock:
+            entries = dict(self.get_entries())
+            signature = sorted((key, fetched_at) for key, (_, fetched_at) in entries.items())
+            if not entries or signature == self._last_saved:
+                return False
+            try:
+                save_snapshot(entries, self.directory)
+            except OSError as e:
+                print(f"Snapshot save failed: {e}")
+                return False
+            self._last_saved = signature
+            return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.save()
+
+    def start(self):
+        """Start the periodic saver and register the shutdown save (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='snapshot-writer', daemon=True)
+        atexit.register(self.save)
+        if self.interval > 0:
+            self._thread.start()
@@ -0,0 +1,130 @@
+"""
+Multi-Timeframe Resampling
+4h, 1d and 1w bars built from the stored hourly series, so every indicator and score can
+be computed at a coarser timeframe without another upstream request.
+
+Bars are OHLC aggregates of the hourly prices computed with one sorted group-reduction
+(np.maximum.reduceat and friends). CoinGecko volumes are rolling 24h totals rather than
+per-bar volumes, so a bar's volume is the mean of its hourly values. Resampled frames are
+cached per coin and extended incrementally: when new hourly bars arrive only the last
+REBUILD_BARS bars (the open bar and the last closed one, whose hourly prices upstream
+may still revise) and the bars after them are recomputed.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+BASE_INTERVAL = '1h'
+
+# Bar width in hours
+INTERVAL_HOURS = {'1h': 1, '4h': 4, '1d': 24, '1w': 168}
+
+# Cached bars recomputed on every extend: the open bar plus the last closed bar
+REBUILD_BARS = 2
+
+# Weekly bars start on Monday 00:00 UTC; the Unix epoch was a Thursday
+_WEEK_OFFSET = pd.Timedelta(days=3)
+
+
+def parse_interval(value):
+    """Validate ?interval= (default 1h); raises ValueError"""
+    interval = (value or BASE_INTERVAL).lower()
+    if interval not in INTERVAL_HOURS:
+        raise ValueError(f"interval must be one of: {', '.join(INTERVAL_HOURS)}")
+    return interval
+
+
+def bucket_starts(timestamps, interval):
+    """Start of the bar each timestamp falls in"""
+    width = pd.Timedelta(hours=INTERVAL_HOURS[interval])
+    timestamps = pd.DatetimeIndex(timestamps)
+    if interval == '1w':
+        return (timestamps + _WEEK_OFFSET).floor(width) - _WEEK_OFFSET
+    return timestamps.floor(width)
+
+
+def aggregate(df, interval):
+    """
+    OHLCV bars of a (timestamp-sorted) price DataFrame at a coarser interval
+    Returns a DataFrame with timestamp (bar start), open, high, low, price (close),
+    volume (mean) and bars (hourly rows in the bar).
+    """
+    starts = bucket_starts(df['timestamp'], interval)
+    keys = starts.asi8
+    # Sorted input: each bar is a contiguous run starting where the key changes
+    first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    last = np.r_[first[1:], len(keys)] - 1
+    counts = last - first + 1
+
+    prices = df['price'].to_numpy(dtype=np.float64)
+    volumes = df['volume'].to_numpy(dtype=np.float64)
+    return pd.DataFrame({
+        'timestamp': starts[first],
+        'open': prices[first],
+        'high': np.maximum.reduceat(prices, first),
+        'low': np.minimum.reduceat(prices, first),
+        'price': prices[last],
+        'volume': np.add.reduceat(volumes, first) / counts,
+        'bars': counts
+    })
+
+
+class ResampleCache:
+    """Resampled frames per (coin, interval), extended as the base series grows"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, coin_id, version, df, interval):
+        """
+        Bars of df at `interval`, reusing the cached bars for the same coin
+        version is the base series' data version; only a changed version does any work.
+        """
+        if df is None or interval == BASE_INTERVAL:
+            return df
+        key = (coin_id, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry['version'] == version:
+            metrics.increment('resample.cache_hits')
+            return entry['bars']
+
+        bars = None
+        if entry is not None:
+            bars = self._extend(entry, df, interval)
+        if bars is None:
+            metrics.increment('resample.full_builds')
+            bars = aggregate(df, interval)
+        else:
+            metrics.increment('resample.extends')
+
+        # Base rows before the bars a later update rebuilds; it can extend from there
+        with self._lock:
+            self._entries[key] = {
+                'version': version,
+                'bars': bars,
+                'kept_rows': self._kept_rows(bars, df),
+                'first_timestamp': df['timestamp'].iloc[0]
+            }
+        return bars
+
+    @staticmethod
+    def _kept_rows(bars, df):
+        """Base rows in the bars that are kept on extend (all but the last REBUILD_BARS)"""
+        rebuild_start = bars['timestamp'].iloc[-min(REBUILD_BARS, len(bars))]
+        return int(np.searchsorted(df['timestamp'].to_numpy(), rebuild_start.to_datetime64()))
+
+    @classmethod
+    def _extend(cls, entry, df, interval):
+        """Recompute only the last REBUILD_BARS bars and anything after them; None if history changed"""
+        bars = entry['bars']
+        kept_rows = cls._kept_rows(bars, df)
+        if df['timestamp'].iloc[0] != entry['first_timestamp'] or kept_rows != entry['kept_rows']:
+            return None
+        tail = aggregate(df.iloc[kept_rows:], interval)
+        return pd.concat([bars.iloc[:-min(REBUILD_BARS, len(bars))], tail], ignore_index=True)
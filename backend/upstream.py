@@ -0,0 +1,178 @@
+"""
+Shared Upstream HTTP Client
+A single pooled requests.Session with keep-alive used for every CoinGecko call,
+so repeated fetches reuse TCP+TLS connections instead of handshaking each time.
+
+Configuration (environment variables):
+- COINGECKO_BASE_URL:         API root (point at mock_coingecko.py for offline runs)
+- UPSTREAM_POOL_CONNECTIONS:  number of per-host pools kept alive (default 4)
+- UPSTREAM_POOL_MAXSIZE:      connections kept per host (default 10)
+- UPSTREAM_CONNECT_TIMEOUT:   connect timeout in seconds (default 3.05)
+- UPSTREAM_BREAKER_THRESHOLD: consecutive failures that open an endpoint's breaker (default 3)
+- UPSTREAM_BREAKER_RESET:     seconds an open breaker waits before a half-open probe (default 30)
+
+Every endpoint (URL path with the coin id folded out) has its own circuit breaker, so a
+rate-limited market_chart does not block /simple/price; calls to an open endpoint raise
+CircuitOpenError without touching the network.
+"""
+
+import os
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+import metrics
+from circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN
+
+# CoinGecko API (free, no API key required)
+BASE_URL = os.environ.get('COINGECKO_BASE_URL', "https://api.coingecko.com/api/v3")
+
+POOL_CONNECTIONS = int(os.environ.get('UPSTREAM_POOL_CONNECTIONS', 4))
+POOL_MAXSIZE = int(os.environ.get('UPSTREAM_POOL_MAXSIZE', 10))
+CONNECT_TIMEOUT = float(os.environ.get('UPSTREAM_CONNECT_TIMEOUT', 3.05))
+BREAKER_THRESHOLD = int(os.environ.get('UPSTREAM_BREAKER_THRESHOLD', 3))
+BREAKER_RESET = float(os.environ.get('UPSTREAM_BREAKER_RESET', 30))
+
+# /coins/<id>/... share one breaker per endpoint
+_COIN_SEGMENT = re.compile(r'/coins/[^/]+/')
+
+_session = None
+_session_lock = threading.Lock()
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP pool that records every newly opened connection"""
+
+    def _new_conn(self):
+        metrics.increment('upstream.connections_opened')
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS pool that records every newly opened connection (each one is a TLS handshake)"""
+
+    def _new_conn(self):
+        metrics.increment('upstream.connections_opened')
+        return super()._new_conn()
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools report connection creation to metrics"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool
+        }
+
+
+def _connections_reused():
+    """Requests served over an already-open connection"""
+    return max(0, metrics.get_counter('upstream.requests') - metrics.get_counter('upstream.connections_opened'))
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Pool size is per host; pool_block=False lets bursts open extra
+                # short-lived connections instead of queueing request threads
+                adapter = PooledAdapter(pool_connections=POOL_CONNECTIONS,
+                                        pool_maxsize=POOL_MAXSIZE,
+                                        pool_block=False)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({'Accept': 'application/json'})
+                metrics.register_gauge('upstream.connections_reused', _connections_reused)
+                _session = session
+    return _session
+
+
+def endpoint_name(url):
+    """Breaker key for a URL: its path below BASE_URL with the coin id replaced"""
+    path = url[len(BASE_URL):] if url.startswith(BASE_URL) else url
+    return _COIN_SEGMENT.sub('/coins/{id}/', path.split('?')[0])
+
+
+def get_breaker(endpoint):
+    """The circuit breaker for an endpoint, created on first use"""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(endpoint, BREAKER_THRESHOLD, BREAKER_RESET)
+            _breakers[endpoint] = breaker
+            if len(_breakers) == 1:
+                metrics.register_gauge('upstream.circuits_open', _circuits_open)
+        return breaker
+
+
+def _circuits_open():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return sum(1 for b in breakers if b.status()['state'] == OPEN)
+
+
+def circuit_open(url):
+    """True while the URL's endpoint is failing fast (open and not yet due for a probe)"""
+    return get_breaker(endpoint_name(url)).status()['state'] == OPEN
+
+
+def breaker_status():
+    """{endpoint: breaker status} for diagnostics"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {endpoint: breaker.status() for endpoint, breaker in breakers.items()}
+
+
+def _retry_after(response):
+    """Seconds from a Retry-After header, or None"""
+    value = response.headers.get('Retry-After', '')
+    return float(value) if value.isdigit() else None
+
+
+def get(url, params=None, timeout=15):
+    """
+    GET an upstream URL through the pooled session and the endpoint's circuit breaker
+    timeout is the read timeout in seconds (or a (connect, read) tuple).
+    Raises CircuitOpenError while the endpoint's breaker is open.
+    """
+    if not isinstance(timeout, tuple):
+        timeout = (CONNECT_TIMEOUT, timeout)
+
+    breaker = get_breaker(endpoint_name(url))
+    try:
+        breaker.before_call()
+    except CircuitOpenError:
+        metrics.increment('upstream.short_circuited')
+        raise
+
+    start = time.perf_counter()
+    try:
+        response = get_session().get(url, params=params, timeout=timeout)
+    except Exception:
+        metrics.increment('upstream.errors')
+        if breaker.record_failure():
+            metrics.increment('upstream.circuit_opened')
+        raise
+    finally:
+        metrics.increment('upstream.requests')
+        metrics.observe('upstream.latency', time.perf_counter() - start)
+
+    metrics.increment(f'upstream.status.{response.status_code}')
+    if response.status_code == 429 or response.status_code >= 500:
+        # A 429 is an explicit "back off": open straight away
+        if breaker.record_failure(_retry_after(response), trip=response.status_code == 429):
+            metrics.increment('upstream.circuit_opened')
+    else:
+        breaker.record_success()
+    return response
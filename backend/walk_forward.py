@@ -0,0 +1,247 @@
+"""
+Walk-Forward Model Fits for the Composite Scoring Methods
+Scores every bar with simple_weighted, correlation_adjusted, mahalanobis and
+pca_composite using only data up to that bar, without refitting per bar.
+
+Two fitting modes share the same stacked scoring kernels:
+- expanding: models fitted on rows 0..t, moments from cumulative sums
+- rolling:   models fitted on the last `window` rows; mean and covariance are
+             updated incrementally (Welford add / rank-one remove) as the window
+             slides, so each step costs O(d^2) regardless of window length
+
+The per-bar 5x5 solves and eigendecompositions then run as single stacked NumPy calls.
+PCA components get pca_fit's sign convention over each bar's fit window, so every bar
+scores exactly as compute_all_methods refitted on that window (see check_against_live).
+"""
+
+from collections import deque
+
+import numpy as np
+
+from correlation_analysis import (
+    INDICATORS,
+    SIMPLE_WEIGHTS as SIMPLE_WEIGHT_MAP,
+    compute_all_methods,
+    compute_correlation_matrix,
+    normalize_indicators,
+    mahalanobis_scores
+)
+from fast_linalg import robust_cholesky
+
+METHODS = ['simple_weighted', 'correlation_adjusted', 'mahalanobis', 'pca_composite']
+
+# Fewest rows a walk-forward fit may use (min_history); far more than the 5 + 1 rows a
+# full-rank covariance needs, so early fits are not dominated by noise
+MIN_HISTORY = 30
+
+# method1_simple_weighted weights as a vector in INDICATORS order
+SIMPLE_WEIGHTS = np.array([SIMPLE_WEIGHT_MAP[name] for name in INDICATORS])
+
+
+def expanding_moments(values):
+    """
+    Mean and sample covariance (ddof=1) of rows 0..t for every t, from cumulative sums
+    Returns (n, mean (T, d), cov (T, d, d)); cov[0] is undefined (NaN).
+    """
+    n = np.arange(1, len(values) + 1, dtype=np.float64)
+    # Shift by the first row so the cumulative sums do not lose precision
+    centered = values - values[0]
+    s1 = np.cumsum(centered, axis=0)
+    s2 = np.cumsum(centered[:, :, None] * centered[:, None, :], axis=0)
+
+    mean_c = s1 / n[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = (s2 - n[:, None, None] * mean_c[:, :, None] * mean_c[:, None, :]) / (n - 1)[:, None, None]
+    return n, mean_c + values[0], cov
+
+
+class RollingMoments:
+    """
+    Mean and sample covariance of a sliding window of rows
+    Rows are added with Welford's update and dropped with the matching rank-one downdate,
+    so the window can slide over a long history at O(d^2) per step.
+    """
+
+    def __init__(self, dim, window=None):
+        self.window = window
+        self.n = 0
+        self.mean = np.zeros(dim)
+        self.m2 = np.zeros((dim, dim))
+        self._buffer = deque()
+
+    def add(self, x):
+        """Include one row"""
+        self.n += 1
+        delta = x - self.mean
+        self.mean = self.mean + delta / self.n
+        self.m2 += np.outer(delta, x - self.mean)
+
+    def remove(self, x):
+        """Exclude a row that was previously added"""
+        if self.n <= 1:
+            self.n = 0
+            self.mean = np.zeros_like(self.mean)
+            self.m2 = np.zeros_like(self.m2)
+            return
+        delta = x - self.mean
+        self.mean = self.mean - delta / (self.n - 1)
+        self.m2 -= np.outer(delta, x - self.mean)
+        self.n -= 1
+
+    def push(self, x):
+        """Add a row and drop the oldest one once the window is full"""
+        self.add(x)
+        if self.window is not None:
+            self._buffer.append(x)
+            if len(self._buffer) > self.window:
+                self.remove(self._buffer.popleft())
+
+    @property
+    def cov(self):
+        """Sample covariance (ddof=1)"""
+        if self.n < 2:
+            return np.full_like(self.m2, np.nan)
+        return self.m2 / (self.n - 1)
+
+
+def rolling_moments(values, window):
+    """
+    Mean and sample covariance (ddof=1) of the last `window` rows ending at every t
+    Same output layout as expanding_moments: (n, mean (T, d), cov (T, d, d)).
+    """
+    T, d = values.shape
+    # Shift by the first row, as in expanding_moments, to keep the updates well conditioned
+    shift = values[0]
+    moments = RollingMoments(d, window=window)
+    n = np.empty(T)
+    mean = np.empty((T, d))
+    cov = np.empty((T, d, d))
+    for t in range(T):
+        moments.push(values[t] - shift)
+        n[t] = moments.n
+        mean[t] = moments.mean + shift
+        cov[t] = moments.cov
+    return n, mean, cov
+
+
+def _orient_by_window_scores(values, start, stop, mean, scale, components, block=64):
+    """
+    Flip each bar's components like fast_linalg.pca_fit: over that bar's fit window
+    (rows start..stop-1), the row with the largest |score| gets a positive score
+    values (T, d); start, stop, mean, scale (B, ...) and components (B, d, k) per bar.
+
+    The largest |score| is either the largest or the smallest projection, so a block of
+    bars only needs the max and min of one matrix product over the rows they share, plus
+    a masked product over the few rows at the block's edges.
+    """
+    B, d, k = components.shape
+    signs = np.empty((B, k))
+    # score of row x for bar b: (x - mean_b) / scale_b @ components_b = x @ w_b - c_b
+    w = components / scale[:, :, None]
+    c = np.einsum('bd,bdk->bk', mean, w)
+    for b0 in range(0, B, block):
+        b1 = min(b0 + block, B)
+        s, e = start[b0:b1], stop[b0:b1]
+        w_block = np.moveaxis(w[b0:b1], 1, 0).reshape(d, -1)
+        lo, hi = s.max(), e.min()
+        if lo >= hi:
+            lo = hi = s.min()
+        highest = np.full((b1 - b0) * k, -np.inf)
+        lowest = np.full((b1 - b0) * k, np.inf)
+        if hi > lo:
+            projected = values[lo:hi] @ w_block
+            highest, lowest = projected.max(axis=0), projected.min(axis=0)
+        for r0, r1 in ((s.min(), lo), (hi, e.max())):
+            if r1 <= r0:
+                continue
+            rows = np.arange(r0, r1)[:, None]
+            inside = np.repeat((rows >= s) & (rows < e), k, axis=1)
+            projected = values[r0:r1] @ w_block
+            highest = np.maximum(highest, np.where(inside, projected, -np.inf).max(axis=0))
+            lowest = np.minimum(lowest, np.where(inside, projected, np.inf).min(axis=0))
+        centre = c[b0:b1].reshape(-1)
+        signs[b0:b1] = np.where(highest - centre >= centre - lowest, 1.0, -1.0).reshape(-1, k)
+    return components * signs[:, None, :]
+
+
+def walk_forward_signals(indicator_df, min_history=100, weights=None, window=None):
+    """
+    Score every bar with all four composite methods using only data up to that bar
+    weights: optional simple_weighted weight vector in INDICATORS order
+    window:  fit on the last `window` rows (rolling) instead of all rows so far (expanding)
+    Returns {method: array (T,)} with NaN during the first min_history bars.
+    """
+    values = indicator_df[INDICATORS].to_numpy(dtype=np.float64)
+    T, d = values.shape
+    signals = {method: np.full(T, np.nan) for method in METHODS}
+    if T <= min_history:
+        return signals
+
+    normalized = normalize_indicators(values)
+    if window is None:
+        n, mean, cov = expanding_moments(values)
+    else:
+        n, mean, cov = rolling_moments(values, window)
+    live = slice(min_history, T)
+
+    x = values[live]
+    norm = normalized[live]
+    cov = cov[live]
+    mean = mean[live]
+    n = n[live]
+
+    # Method 1: fixed weights
+    signals['simple_weighted'][live] = norm @ (SIMPLE_WEIGHTS if weights is None else weights)
+
+    # Method 2: weights from the expanding correlation matrix
+    std = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / (std[:, :, None] * std[:, None, :])
+    corr = np.nan_to_num(corr, nan=0.0)
+    off_diagonal = np.abs(corr).sum(axis=2) - np.abs(np.diagonal(corr, axis1=1, axis2=2))
+    corr_weights = 1.0 / (1.0 + off_diagonal)
+    corr_weights = corr_weights / corr_weights.sum(axis=1, keepdims=True)
+    signals['correlation_adjusted'][live] = np.sum(norm * corr_weights, axis=1)
+
+    # Method 3: Mahalanobis distances to the three reference points, one Cholesky per bar
+    chol, _ = robust_cholesky(cov, jitter=1e-6)
+    mahalanobis_signal, _ = mahalanobis_scores(x[:, None, :], chol)
+    signals['mahalanobis'][live] = mahalanobis_signal[:, 0]
+
+    # Method 4: PCA on standardized data (population std like StandardScaler)
+    scale = np.sqrt(np.diagonal(cov, axis1=1, axis2=2) * ((n - 1) / n)[:, None])
+    scale = np.where(scale > 0, scale, 1.0)
+    std_cov = cov / (scale[:, :, None] * scale[:, None, :])
+    eigvals, eigvecs = np.linalg.eigh(std_cov)
+    eigvals = eigvals[:, ::-1][:, :3]
+    stop = np.arange(min_history, T) + 1
+    start = np.zeros_like(stop) if window is None else np.maximum(stop - window, 0)
+    components = _orient_by_window_scores(values, start, stop, mean, scale, eigvecs[:, :, ::-1][:, :, :3])
+    explained = eigvals / np.trace(std_cov, axis1=1, axis2=2)[:, None]
+
+    z = (x - mean) / scale
+    pcs = np.einsum('td,tdk->tk', z, components)
+    weighted_pc = np.sum(pcs * explained, axis=1)
+    # Population std of the historical weighted scores: PCs are uncorrelated with variance eigvals
+    std_weighted = np.sqrt(np.sum(explained ** 2 * eigvals, axis=1) * (n - 1) / n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pca_score = np.where(std_weighted > 1e-6, np.tanh(weighted_pc / (std_weighted * 2.0)), 0.0)
+    signals['pca_composite'][live] = pca_score
+
+    return signals
+
+
+def check_against_live(indicator_df, bars, min_history=100, window=None):
+    """
+    Compare walk-forward scores with compute_all_methods refitted on each bar's fit window
+    bars: bar positions to check (each >= min_history)
+    Returns {method: largest absolute difference over the checked bars}.
+    """
+    signals = walk_forward_signals(indicator_df, min_history=min_history, window=window)
+    worst = {method: 0.0 for method in METHODS}
+    for t in bars:
+        history = indicator_df.iloc[0 if window is None else max(t + 1 - window, 0):t + 1]
+        live = compute_all_methods(history, indicator_df.iloc[t].to_dict(), compute_correlation_matrix(history))
+        for method in METHODS:
+            worst[method] = max(worst[method], abs(float(live[method]['score']) - signals[method][t]))
+    return worst
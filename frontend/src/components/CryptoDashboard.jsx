@@ -151,7 +151,14 @@ const CryptoDashboard = () => {
     'MACD': 'MACD (Moving Average Convergence Divergence, 12/26/9 periods): Shows trend momentum by comparing 12-period and 26-period exponential moving averages with a 9-period signal line. Positive histogram with MACD above signal line indicates bullish trend (BUY).',
     'Bollinger Bands': 'Bollinger Bands (20-period): Measures volatility using a 20-period simple moving average ± 2 standard deviations. Price near lower band suggests oversold (BUY), near upper band suggests overbought (SELL).',
     'EMA (20)': 'EMA (Exponential Moving Average, 20-period): Gives more weight to recent prices. When price is above EMA, trend is bullish (BUY); below EMA suggests bearish trend (SELL).',
-    'Volume Analysis': 'Volume Analysis (5-period recent vs 20-period average): Compares recent 5-period volume to 20-period average volume. High volume with upward price movement confirms bullish trend (BUY); high volume with downward movement confirms bearish trend (SELL).'
+    'Volume Analysis': 'Volume Analysis (current vs 20-period average): Compares the latest volume to the 20-period average volume. Volume above average reads bullish (BUY); volume below average reads bearish (SELL).'
+  };
+
+  // Display names for the indicator keys returned by /api/analyze
+  const indicatorNames = {
+    'Bollinger': 'Bollinger Bands',
+    'EMA': 'EMA (20)',
+    'Volume': 'Volume Analysis'
   };
 
   const IndicatorCard = ({ name, data }) => {
@@ -175,7 +182,7 @@ const CryptoDashboard = () => {
         
         <div className="space-y-2">
           <div className="text-sm text-gray-600">
-            {typeof data.value === 'object' ? (
+            {data.value !== null && typeof data.value === 'object' ? (
               <div className="space-y-1">
                 {Object.entries(data.value).map(([key, val]) => (
                   <div key={key} className="flex justify-between">
@@ -187,7 +194,7 @@ const CryptoDashboard = () => {
             ) : (
               <div className="flex justify-between">
                 <span>Value:</span>
-                <span className="font-mono font-semibold">{data.value.toFixed(2)}</span>
+                <span className="font-mono font-semibold">{data.value === null ? 'N/A' : data.value.toFixed(2)}</span>
               </div>
             )}
           </div>
@@ -410,11 +417,9 @@ const CryptoDashboard = () => {
               </h2>
               
               <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-4 mb-6">
-                <IndicatorCard name="RSI" data={analysisData.indicators.RSI} />
-                <IndicatorCard name="MACD" data={analysisData.indicators.MACD} />
-                <IndicatorCard name="Bollinger Bands" data={analysisData.indicators.Bollinger} />
-                <IndicatorCard name="EMA (20)" data={analysisData.indicators.EMA} />
-                <IndicatorCard name="Volume Analysis" data={analysisData.indicators.Volume} />
+                {Object.entries(analysisData.indicators).map(([key, data]) => (
+                  <IndicatorCard key={key} name={indicatorNames[key] || key} data={data} />
+                ))}
             </div>
 
               {/* Signal Legend - Moved inside Technical Indicators box */}
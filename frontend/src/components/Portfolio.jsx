@@ -50,16 +50,26 @@ const Portfolio = ({ isOpen, onClose }) => {
     setLoading(true);
     const priceMap = {};
     
-    for (const coin of Object.keys(holdings)) {
-      try {
-        const response = await fetch(`${API_BASE}/analyze/${coin}`);
-        if (response.ok) {
-          const data = await response.json();
-          priceMap[coin] = data.current_price;
+    // One server-side valuation call instead of a full analysis per holding
+    try {
+      const response = await fetch(`${API_BASE}/portfolio/value`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          holdings: Object.entries(holdings).map(([symbol, quantity]) => ({ symbol, quantity })),
+          history: false
+        })
+      });
+      if (response.ok) {
+        const data = await response.json();
+        for (const position of data.positions) {
+          if (position.price !== null) {
+            priceMap[position.symbol] = position.price;
+          }
         }
-      } catch (err) {
-        console.error(`Error fetching price for ${coin}:`, err);
       }
+    } catch (err) {
+      console.error('Error fetching portfolio value:', err);
     }
     
     setPrices(priceMap);
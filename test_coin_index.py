@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Coin index lookups that must not depend on a running server
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from coin_index import CoinIndex
+
+# Shape of the real /coins/list: a token uses another coin's id as its symbol
+COINS = [
+    {'id': 'bitcoin', 'symbol': 'btc', 'name': 'Bitcoin'},
+    {'id': 'harrypotterobamasonic10inu', 'symbol': 'bitcoin', 'name': 'HarryPotterObamaSonic10Inu (ETH)'},
+    {'id': 'ethereum', 'symbol': 'eth', 'name': 'Ethereum'},
+    {'id': 'ethereum-wormhole', 'symbol': 'eth', 'name': 'Ethereum (Wormhole)'},
+    {'id': 'eth-token', 'symbol': 'ethereum', 'name': 'Eth Token'}
+]
+
+
+def test_id_wins_over_colliding_symbol():
+    """An exact id resolves to that coin even if another token uses it as its symbol"""
+    index = CoinIndex(COINS, pinned={'BTC': 'bitcoin', 'ETH': 'ethereum'})
+    assert index.resolve('bitcoin') == 'bitcoin'
+    assert index.resolve('BITCOIN') == 'bitcoin'
+    assert index.resolve('ethereum') == 'ethereum'
+    # The colliding tokens stay reachable by their own ids
+    assert index.resolve('harrypotterobamasonic10inu') == 'harrypotterobamasonic10inu'
+    assert index.resolve('eth-token') == 'eth-token'
+
+
+def test_pinned_symbols_and_fallbacks():
+    """Pinned symbols first, then ids, then other symbols and names"""
+    index = CoinIndex(COINS, pinned={'BTC': 'bitcoin', 'ETH': 'ethereum'})
+    assert index.resolve('btc') == 'bitcoin'
+    assert index.resolve('eth') == 'ethereum'
+    assert index.resolve('Ethereum (Wormhole)') == 'ethereum-wormhole'
+    assert index.resolve('unknown-coin') is None